@@ -0,0 +1,246 @@
+# ==================================================
+# Équilibrage des difficultés par simulation (Monte-Carlo)
+# ==================================================
+# Des tireurs automatiques (temps de réaction, erreur de visée) jouent des manches
+# complètes sur GameSession, donc avec les vraies règles de Magpie, sans affichage.
+# Les manches sont réparties par lots sur un pool de processus.
+# Usage : python balance.py [--manches 2000] [--presets Facile,Moyen]
+#         [--reaction 0.25,0.4] [--erreur 8,16] [--regle speed=4,6,8] [--regle flocking=oui,non] [--processus N]
+
+# ----- Imports -----
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from session import GameSession, PHASE_PLAYING
+from settings import DIFFICULTY_SETTINGS, DOG_POS, DOG_SIZE, SIM_HZ
+
+# Nombre de manches simulées par tâche envoyée au pool
+TAILLE_LOT = 250
+
+# ==============================
+# Tireur automatique
+# ==============================
+@dataclass(frozen=True)
+class Tireur:
+    """
+    Paramètres d'un tireur automatique :
+    reaction : secondes entre l'observation d'une pie et le tir ; le tireur vise là où la pie
+    sera à l'instant du tir si elle garde sa vitesse apparente ;
+    erreur : écart type (pixels) de la visée autour de ce point, sur chaque axe.
+    """
+    reaction: float = 0.3
+    erreur: float = 10.0
+
+def jouer_manche_auto(
+    difficulty: str,
+    settings: dict,
+    tireur: Tireur,
+    seed: int,
+    max_ticks: int = 10 ** 6
+) -> Tuple[bool, int, Optional[int]]:
+    """
+    Joue une manche complète avec un tireur automatique.
+    Retourne (victoire, tirs effectués, pas entre le lâcher des pies et la fin de partie).
+    """
+    session = GameSession(difficulty, seed, DOG_POS, DOG_SIZE, settings=settings)
+    visee = random.Random(seed ^ 0x5EED)
+    delai = max(1, int(round(tireur.reaction * session.sim_hz)))
+    ammo_depart = session.ammo
+    # --- Le tireur lance la manche en cliquant sur le chien ---
+    session.click(DOG_POS[0] + DOG_SIZE[0] // 2, DOG_POS[1] + DOG_SIZE[1] // 2)
+    while session.phase != PHASE_PLAYING and session.sim_ticks < max_ticks:
+        session.step()
+    aim_x, aim_y = session.width // 2, session.height // 2
+    while not session.game_over and session.sim_ticks < max_ticks:
+        # --- Observation : la pie visible la plus proche du viseur et sa vitesse apparente ---
+        cibles = list(zip(session.magpies.visible(), session.magpies.visible(0.0)))
+        if not cibles:
+            session.run(delai)
+            continue
+        (x, y, _), (px, py, _) = min(cibles, key=lambda c: (c[0][0] - aim_x) ** 2 + (c[0][1] - aim_y) ** 2)
+        # --- Visée anticipée : position extrapolée à l'instant du tir, plus l'erreur de visée ---
+        aim_x = int(round(x + (x - px) * delai + visee.gauss(0.0, tireur.erreur)))
+        aim_y = int(round(y + (y - py) * delai + visee.gauss(0.0, tireur.erreur)))
+        # --- Tir après le temps de réaction (un rebond entre-temps fait manquer la cible) ---
+        session.run(delai)
+        if not session.game_over:
+            session.click(aim_x, aim_y)
+    duree = session.sim_ticks - session.timer_start if session.timer_start is not None else None
+    return session.win, ammo_depart - session.ammo, duree
+
+# ==============================
+# Lots et agrégation
+# ==============================
+
+def simuler_lot(tache: tuple) -> dict:
+    """
+    Simule un lot de manches (exécuté dans un processus du pool) et retourne ses statistiques brutes.
+    """
+    cle, difficulty, settings, tireur, premiere_graine, nombre = tache
+    victoires = 0
+    tirs_victoire: Dict[int, int] = {}
+    durees_victoire: List[int] = []
+    for graine in range(premiere_graine, premiere_graine + nombre):
+        victoire, tirs, duree = jouer_manche_auto(difficulty, settings, tireur, graine)
+        if victoire:
+            victoires += 1
+            tirs_victoire[tirs] = tirs_victoire.get(tirs, 0) + 1
+            durees_victoire.append(duree)
+    return {"cle": cle, "manches": nombre, "victoires": victoires,
+            "tirs": tirs_victoire, "durees": durees_victoire}
+
+def fusionner(resultats: List[dict]) -> Dict[tuple, dict]:
+    """
+    Regroupe les statistiques des lots par configuration.
+    """
+    fusion: Dict[tuple, dict] = {}
+    for lot in resultats:
+        total = fusion.setdefault(lot["cle"], {"manches": 0, "victoires": 0, "tirs": {}, "durees": []})
+        total["manches"] += lot["manches"]
+        total["victoires"] += lot["victoires"]
+        for tirs, nombre in lot["tirs"].items():
+            total["tirs"][tirs] = total["tirs"].get(tirs, 0) + nombre
+        total["durees"].extend(lot["durees"])
+    return fusion
+
+def centile(valeurs: List[float], p: float) -> Optional[float]:
+    """
+    Centile p (entre 0 et 100) par rang le plus proche ; None pour une liste vide.
+    """
+    if not valeurs:
+        return None
+    ordonnees = sorted(valeurs)
+    rang = max(0, math.ceil(p / 100 * len(ordonnees)) - 1)
+    return ordonnees[rang]
+
+def resumer(total: dict, sim_hz: int = SIM_HZ) -> dict:
+    """
+    Taux de victoire, distribution des tirs jusqu'à l'objectif et temps de victoire (secondes).
+    """
+    durees = [d / sim_hz for d in total["durees"]]
+    return {
+        "manches": total["manches"],
+        "taux_victoire": total["victoires"] / total["manches"] if total["manches"] else 0.0,
+        "tirs_jusqu_objectif": dict(sorted(total["tirs"].items())),
+        "temps_victoire_moyen": sum(durees) / len(durees) if durees else None,
+        "temps_victoire_p50": centile(durees, 50),
+        "temps_victoire_p90": centile(durees, 90),
+    }
+
+# ==============================
+# Configurations et exécution
+# ==============================
+
+def configurations(presets: List[str], reactions: List[float], erreurs: List[float], regles: Dict[str, list]):
+    """
+    Produit (clé, difficulté, réglages, tireur) pour chaque préréglage et chaque combinaison balayée.
+    """
+    noms_regles = sorted(regles)
+    for preset in presets:
+        for valeurs in itertools.product(*(regles[nom] for nom in noms_regles)):
+            settings = dict(DIFFICULTY_SETTINGS[preset])
+            settings.update(zip(noms_regles, valeurs))
+            for reaction, erreur in itertools.product(reactions, erreurs):
+                cle = (preset, tuple(zip(noms_regles, valeurs)), reaction, erreur)
+                yield cle, preset, settings, Tireur(reaction, erreur)
+
+def equilibrer(
+    presets: List[str],
+    reactions: List[float],
+    erreurs: List[float],
+    regles: Dict[str, list],
+    manches: int,
+    processus: Optional[int] = None,
+    graine: int = 0
+) -> Dict[tuple, dict]:
+    """
+    Simule manches manches par configuration, réparties par lots sur un pool de processus.
+    Une même graine donne les mêmes résultats quel que soit le nombre de processus.
+    """
+    taches = []
+    for cle, preset, settings, tireur in configurations(presets, reactions, erreurs, regles):
+        for debut in range(0, manches, TAILLE_LOT):
+            taches.append((cle, preset, settings, tireur, graine + debut, min(TAILLE_LOT, manches - debut)))
+    if processus == 1:
+        resultats = [simuler_lot(tache) for tache in taches]
+    else:
+        with ProcessPoolExecutor(max_workers=processus) as pool:
+            resultats = list(pool.map(simuler_lot, taches))
+    return {cle: resumer(total) for cle, total in fusionner(resultats).items()}
+
+def _liste(texte: str, conversion=float) -> list:
+    return [conversion(valeur) for valeur in texte.split(",") if valeur]
+
+# Écritures acceptées pour les réglages booléens (flocking)
+BOOLEENS = {"true": True, "oui": True, "on": True, "false": False, "non": False, "off": False}
+
+def _valeur(texte: str):
+    """Booléen, entier ou réel, selon l'écriture de la valeur."""
+    if texte.lower() in BOOLEENS:
+        return BOOLEENS[texte.lower()]
+    for conversion in (int, float):
+        try:
+            return conversion(texte)
+        except ValueError:
+            pass
+    raise argparse.ArgumentTypeError(f"Valeur de réglage invalide : {texte}")
+
+def _regle(texte: str) -> Tuple[str, list]:
+    nom, _, valeurs = texte.partition("=")
+    if not valeurs:
+        raise argparse.ArgumentTypeError(f"Règle attendue sous la forme nom=v1,v2 : {texte}")
+    return nom, _liste(valeurs, _valeur)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Équilibrage des difficultés par simulation.")
+    parser.add_argument("--manches", type=int, default=2000, help="manches simulées par configuration")
+    parser.add_argument("--presets", default=",".join(DIFFICULTY_SETTINGS), help="préréglages à simuler")
+    parser.add_argument("--reaction", default="0.3", help="temps de réaction des tireurs (s), séparés par des virgules")
+    parser.add_argument("--erreur", default="10", help="erreurs de visée (px), séparées par des virgules")
+    parser.add_argument("--regle", type=_regle, action="append", default=[],
+                        help="balaye un réglage du préréglage, par exemple speed=4,5.5,8 ou flocking=oui,non (répétable)")
+    parser.add_argument("--processus", type=int, default=None, help="taille du pool (par défaut : nombre de cœurs)")
+    parser.add_argument("--graine", type=int, default=0)
+    parser.add_argument("--json", help="écrit aussi les résultats dans ce fichier")
+    args = parser.parse_args(argv)
+
+    presets = _liste(args.presets, str)
+    for preset in presets:
+        if preset not in DIFFICULTY_SETTINGS:
+            parser.error(f"Préréglage inconnu : {preset}")
+    debut = time.perf_counter()
+    resultats = equilibrer(
+        presets, _liste(args.reaction), _liste(args.erreur), dict(args.regle),
+        args.manches, args.processus, args.graine
+    )
+    duree = time.perf_counter() - debut
+
+    print(f"{'préréglage':12}{'réglages':22}{'réaction':>9}{'erreur':>8}{'victoires':>11}"
+          f"{'tirs p50':>10}{'t. moyen':>10}{'t. p90':>8}")
+    for (preset, regles, reaction, erreur), resume in resultats.items():
+        tirs = [t for t, n in resume["tirs_jusqu_objectif"].items() for _ in range(n)]
+        reglages = " ".join(f"{nom}={valeur}" for nom, valeur in regles) or "-"
+        moyen = resume["temps_victoire_moyen"]
+        p90 = resume["temps_victoire_p90"]
+        print(f"{preset:12}{reglages:22}{reaction:>9.2f}{erreur:>8.1f}{resume['taux_victoire']:>10.1%}"
+              f"{centile(tirs, 50) or '-':>10}{'-' if moyen is None else f'{moyen:.1f}s':>10}"
+              f"{'-' if p90 is None else f'{p90:.1f}s':>8}")
+    total = sum(resume["manches"] for resume in resultats.values())
+    print(f"{total} manches simulées en {duree:.1f} s ({args.processus or os.cpu_count()} processus)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([
+                {"preset": preset, "regles": dict(regles), "reaction": reaction, "erreur": erreur, **resume}
+                for (preset, regles, reaction, erreur), resume in resultats.items()
+            ], f, ensure_ascii=False, indent=2)
+
+if __name__ == '__main__':
+    main()
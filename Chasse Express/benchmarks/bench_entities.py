@@ -0,0 +1,155 @@
+# ==================================================
+# Micro-benchmark des entités : mémoire et coût de mise à jour
+# ==================================================
+# Compare la représentation compacte (dataclass à __slots__, champs scalaires)
+# à l'ancienne (dataclass avec __dict__ et listes pos/vel).
+# Usage : python benchmarks/bench_entities.py [nombre_de_pies]
+
+# ----- Imports -----
+import os
+import random
+import sys
+import timeit
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from entities import Magpie, Dog
+
+# ==================================================
+# Ancienne représentation (référence « avant »)
+# ==================================================
+@dataclass
+class LegacyMagpie:
+    pos: List[float] = field(default_factory=lambda: [0.0, 0.0])
+    vel: List[float] = field(default_factory=lambda: [0.0, 0.0])
+    flying_away: bool = False
+    fly_away_timer: int = 0
+
+    # Méthodes reprises telles quelles de Magpie avant la représentation compacte
+    def update(self, speed: float, width: int, height: int, body_radius: int) -> None:
+        if self.flying_away:
+            self.pos[1] -= 12
+            self.fly_away_timer -= 1
+            if self.pos[1] < -body_radius or self.fly_away_timer <= 0:
+                self._respawn(speed, width, height)
+        else:
+            self._move_and_bounce(speed, width, height, body_radius)
+
+    def _respawn(self, speed: float, width: int, height: int) -> None:
+        self.pos[0] = random.randint(100, width - 100)
+        self.pos[1] = random.randint(200, height - 200)
+        direction_x = 1 if random.random() < 0.5 else -1
+        direction_y = 1 if random.random() < 0.5 else -1
+        self.vel[0] = speed * direction_x
+        self.vel[1] = speed * direction_y
+        self.flying_away = False
+
+    def _move_and_bounce(self, speed: float, width: int, height: int, body_radius: int) -> None:
+        self.pos[0] += self.vel[0]
+        self.pos[1] += self.vel[1]
+        bounced = False
+        if self.pos[0] < body_radius or self.pos[0] > width - body_radius:
+            self.vel[0] *= -1
+            bounced = True
+        if self.pos[1] < body_radius or self.pos[1] > height - 150 - body_radius:
+            self.vel[1] *= -1
+            bounced = True
+        if bounced and self.vel[0] == 0:
+            self.vel[0] = speed * (1 if random.random() < 0.5 else -1)
+        if bounced and self.vel[1] == 0:
+            self.vel[1] = speed * (1 if random.random() < 0.5 else -1)
+
+@dataclass
+class LegacyDog:
+    x: int
+    y: int
+    jump_phase: float = 0.0
+    jumping: bool = False
+    jump_total: float = 3.141592653589793
+    jump_started: bool = False
+
+# ==================================================
+# Mesures
+# ==================================================
+
+def octets_par_entite(fabrique, nombre: int) -> float:
+    """
+    Mémoire allouée par entité (objet, __dict__ ou slots, listes et flottants compris).
+    """
+    tracemalloc.start()
+    avant = tracemalloc.take_snapshot()
+    entites = [fabrique(i) for i in range(nombre)]
+    apres = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in apres.compare_to(avant, "filename"))
+    total -= sys.getsizeof(entites)
+    return total / nombre
+
+def cout_mise_a_jour(pies: list, repetitions: int = 20) -> float:
+    """
+    Temps moyen (µs) d'un appel à update() par pie, meilleur de 5 séries.
+    """
+    def etape():
+        for m in pies:
+            m.update(8, 1920, 1080, 32)
+    meilleur = min(timeit.repeat(etape, number=repetitions, repeat=5))
+    return meilleur / (repetitions * len(pies)) * 1e6
+
+def cout_acces(pies: list, repetitions: int = 20) -> float:
+    """
+    Temps moyen (ns) de lecture des coordonnées d'une pie.
+    """
+    if hasattr(pies[0], "x"):
+        def lecture():
+            for m in pies:
+                m.x + m.y + m.vx + m.vy
+    else:
+        def lecture():
+            for m in pies:
+                m.pos[0] + m.pos[1] + m.vel[0] + m.vel[1]
+    meilleur = min(timeit.repeat(lecture, number=repetitions, repeat=5))
+    return meilleur / (repetitions * len(pies)) * 1e9
+
+def mesurer(nombre: int = 10000) -> dict:
+    """
+    Mesure les deux représentations et retourne les résultats.
+    """
+    def pie_compacte(i):
+        return Magpie(pos=(float(i % 1800 + 60), float(i % 800 + 60)), vel=(8.5, -1.5))
+
+    def pie_ancienne(i):
+        return LegacyMagpie(pos=[float(i % 1800 + 60), float(i % 800 + 60)], vel=[8.5, -1.5])
+
+    random.seed(0)
+    anciennes = [pie_ancienne(i) for i in range(nombre)]
+    compactes = [pie_compacte(i) for i in range(nombre)]
+    return {
+        "magpie_bytes_before": octets_par_entite(pie_ancienne, nombre),
+        "magpie_bytes_after": octets_par_entite(pie_compacte, nombre),
+        "dog_bytes_before": octets_par_entite(lambda i: LegacyDog(x=i, y=i), nombre),
+        "dog_bytes_after": octets_par_entite(lambda i: Dog(x=i, y=i), nombre),
+        "update_us_before": cout_mise_a_jour(anciennes),
+        "update_us_after": cout_mise_a_jour(compactes),
+        "access_ns_before": cout_acces(anciennes),
+        "access_ns_after": cout_acces(compactes),
+    }
+
+def main() -> None:
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    resultats = mesurer(nombre)
+    print(f"Entités : {nombre}")
+    print(f"{'':24}{'avant':>10}{'après':>10}")
+    for titre, cle, unite in (
+        ("Octets par pie", "magpie_bytes", "o"),
+        ("Octets par chien", "dog_bytes", "o"),
+        ("update() par pie", "update_us", "µs"),
+        ("Lecture pos/vel", "access_ns", "ns"),
+    ):
+        avant, apres = resultats[f"{cle}_before"], resultats[f"{cle}_after"]
+        print(f"{titre + ' (' + unite + ')':24}{avant:>10.2f}{apres:>10.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+# ==================================================
+# Micro-benchmark du vol en nuée : coût d'un pas selon la taille de la nuée
+# ==================================================
+# Compare un pas de MagpieSwarm en ligne droite et en vol en nuée (voisines par grille),
+# ainsi que la recherche des voisines par grille et par comparaison de tous les couples.
+# Usage : python benchmarks/bench_flocking.py [taille1,taille2,...]
+
+# ----- Imports -----
+import os
+import random
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from entities import MagpieFlock, MagpieSwarm
+from flocking import FlockingRules
+from spatial import neighbor_pairs
+from settings import WIDTH, HEIGHT, MAGPIE_BODY_RADIUS
+
+TAILLES = (10, 100, 1000)
+VITESSE = 6
+
+# ==================================================
+# Mesures
+# ==================================================
+
+def cout_pas(nuee, repetitions: int = 20) -> float:
+    """
+    Temps moyen (µs) d'un pas de la nuée, meilleur de 5 séries.
+    """
+    rng = random.Random(0)
+
+    def pas():
+        nuee.update(VITESSE, WIDTH, HEIGHT, MAGPIE_BODY_RADIUS, rng)
+
+    return min(timeit.repeat(pas, number=repetitions, repeat=5)) / repetitions * 1e6
+
+def voisines_tous_couples(positions: "np.ndarray", actives: "np.ndarray", rayon: float) -> tuple:
+    """
+    Référence O(n²) : compare toutes les pies deux à deux.
+    """
+    delta = positions[:, None, :] - positions[None, :, :]
+    proches = (delta * delta).sum(axis=2) <= rayon * rayon
+    np.fill_diagonal(proches, False)
+    proches &= actives[:, None] & actives[None, :]
+    return np.nonzero(proches)
+
+def mesurer(tailles=TAILLES) -> dict:
+    """
+    Mesure chaque taille de nuée et retourne les résultats.
+    """
+    regles = FlockingRules()
+    resultats = {}
+    for taille in tailles:
+        def nuee(flocking, classe=MagpieSwarm):
+            pies = classe.create_random(taille, VITESSE, HEIGHT, MAGPIE_BODY_RADIUS, random.Random(taille))
+            pies.flocking = flocking
+            # Quelques secondes de vol pour partir d'une nuée formée
+            rng = random.Random(1)
+            for _ in range(120):
+                pies.update(VITESSE, WIDTH, HEIGHT, MAGPIE_BODY_RADIUS, rng)
+            return pies
+        formee = nuee(regles)
+        resultats[f"straight_us_{taille}"] = cout_pas(nuee(None))
+        resultats[f"flocking_us_{taille}"] = cout_pas(formee)
+        if taille < 100:
+            resultats[f"flocking_list_us_{taille}"] = cout_pas(nuee(regles, MagpieFlock))
+        actives = ~formee.flying_away
+        resultats[f"grid_neighbors_us_{taille}"] = min(timeit.repeat(
+            lambda: neighbor_pairs(formee.pos, actives, regles.radius), number=10, repeat=5)) / 10 * 1e6
+        resultats[f"all_pairs_neighbors_us_{taille}"] = min(timeit.repeat(
+            lambda: voisines_tous_couples(formee.pos, actives, regles.radius), number=3, repeat=3)) / 3 * 1e6
+    return resultats
+
+def main() -> None:
+    tailles = tuple(int(t) for t in sys.argv[1].split(",")) if len(sys.argv) > 1 else TAILLES
+    resultats = mesurer(tailles)
+    print(f"{'pies':>6}{'ligne droite':>14}{'nuée':>10}{'nuée (liste)':>14}{'voisines grille':>17}{'tous couples':>14}   (µs par pas)")
+    for taille in tailles:
+        liste = resultats.get(f"flocking_list_us_{taille}")
+        print(f"{taille:>6}{resultats[f'straight_us_{taille}']:>14.1f}{resultats[f'flocking_us_{taille}']:>10.1f}"
+              f"{'-' if liste is None else f'{liste:.1f}':>14}{resultats[f'grid_neighbors_us_{taille}']:>17.1f}"
+              f"{resultats[f'all_pairs_neighbors_us_{taille}']:>14.1f}")
+
+if __name__ == '__main__':
+    main()
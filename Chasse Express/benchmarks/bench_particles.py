@@ -0,0 +1,71 @@
+# ==================================================
+# Micro-benchmark du système de particules
+# ==================================================
+# Mesure le coût d'une gerbe (émission), d'une mise à jour et d'un dessin
+# avec plusieurs milliers de particules vivantes, sans fenêtre visible.
+# Usage : python benchmarks/bench_particles.py [nombre_de_particules]
+
+# ----- Imports -----
+import os
+import sys
+import timeit
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pygame
+
+from particles import ParticleSystem, KIND_COUNT, FADE_LEVELS
+from rendering import AtlasTextures, SpritesParticules
+from ui import rendre_sprites_particules
+from settings import WIDTH, HEIGHT
+
+# ==================================================
+# Mesures
+# ==================================================
+
+def preparer_sprites() -> tuple:
+    """
+    Fenêtre factice et atlas des sprites de particules.
+    """
+    pygame.init()
+    ecran = pygame.display.set_mode((WIDTH, HEIGHT))
+    atlas = AtlasTextures()
+    for code, (sprite, ancre) in rendre_sprites_particules(pygame.font.Font(None, 28)).items():
+        atlas.ajouter(("particule", code), sprite, ancre)
+    atlas.construire()
+    return ecran, SpritesParticules(atlas, KIND_COUNT * FADE_LEVELS)
+
+def mesurer(nombre: int = 4000) -> dict:
+    """
+    Temps (ms, meilleur de plusieurs séries) d'une gerbe de nombre plumes,
+    puis d'une mise à jour et d'un dessin avec nombre particules vivantes.
+    """
+    ecran, sprites = preparer_sprites()
+    systeme = ParticleSystem(capacity=max(nombre, 1), seed=0)
+
+    def gerbe():
+        systeme.clear()
+        systeme.feather_burst(WIDTH / 2, HEIGHT / 2, nombre)
+
+    emission = min(timeit.repeat(gerbe, number=1, repeat=20))
+    gerbe()
+    mise_a_jour = min(timeit.repeat(lambda: systeme.update(1e-4), number=10, repeat=5)) / 10
+    dessin = min(timeit.repeat(lambda: sprites.dessiner(ecran, systeme, retour_rect=True), number=5, repeat=5)) / 5
+    pygame.quit()
+    return {
+        "burst_ms": emission * 1e3,
+        "update_ms": mise_a_jour * 1e3,
+        "draw_ms": dessin * 1e3,
+        "alive": len(systeme),
+    }
+
+def main() -> None:
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+    resultats = mesurer(nombre)
+    print(f"Particules vivantes : {resultats['alive']}")
+    for titre, cle in (("Gerbe", "burst_ms"), ("Mise à jour", "update_ms"), ("Dessin", "draw_ms")):
+        print(f"{titre:16}{resultats[cle]:>8.3f} ms")
+
+if __name__ == '__main__':
+    main()
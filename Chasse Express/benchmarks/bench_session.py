@@ -0,0 +1,47 @@
+# ==================================================
+# Micro-benchmark de GameSession : pas de simulation par seconde
+# ==================================================
+# Mesure la vitesse de la manche sans affichage, pour chaque préréglage de difficulté.
+# Usage : python benchmarks/bench_session.py [nombre_de_pas]
+
+# ----- Imports -----
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from session import GameSession
+from settings import DIFFICULTY_SETTINGS, DOG_POS, DOG_SIZE
+
+# ==================================================
+# Mesures
+# ==================================================
+
+def pas_par_seconde(difficulty: str, pas: int = 100000, series: int = 5) -> float:
+    """
+    Pas de simulation par seconde, pies lâchées et minuterie ignorée (meilleure de plusieurs séries).
+    """
+    meilleur = 0.0
+    for _ in range(series):
+        session = GameSession(difficulty, 1, DOG_POS, DOG_SIZE, timed=False)
+        session.click(DOG_POS[0] + 1, DOG_POS[1] + 1)
+        session.run(60)
+        debut = time.perf_counter()
+        session.run(pas)
+        meilleur = max(meilleur, pas / (time.perf_counter() - debut))
+    return meilleur
+
+def mesurer(pas: int = 100000) -> dict:
+    """
+    Mesure chaque préréglage et retourne les résultats.
+    """
+    return {f"ticks_per_s_{nom}": pas_par_seconde(nom, pas) for nom in DIFFICULTY_SETTINGS}
+
+def main() -> None:
+    pas = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    for cle, valeur in mesurer(pas).items():
+        print(f"{cle:28}{valeur / 1e6:>8.2f} M pas/s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,343 @@
+# ==================================================
+# Suite de micro-benchmarks : dessin, entités et chargement des ressources
+# ==================================================
+# Mesure sans fenêtre visible (pilote vidéo SDL « dummy ») les chemins chauds du rendu,
+# des pies et des ressources, puis compare les résultats à une référence enregistrée.
+# Chaque cas est calibré pour que l'échantillon dure au moins DUREE_ECHANTILLON ; les centiles
+# portent sur le temps moyen par appel de chaque échantillon, le ramasse-miettes est suspendu
+# pendant les mesures et les échantillons sont pris en plusieurs tours sur tous les cas.
+# Un cas régresse si sa latence médiane dépasse celle de la référence de plus du seuil,
+# y compris après une seconde mesure.
+# La référence est propre à chaque machine et n'est pas versionnée (benchmarks/reference.json
+# est ignoré par git) : enregistrez-la une fois sur la machine de mesure, à partir d'un état
+# connu, avec --enregistrer-reference. Sans référence, les résultats sont affichés sans comparaison.
+# Usage : python benchmarks/suite.py [--filtre ui.] [--json resultats.json]
+#         [--reference benchmarks/reference.json] [--seuil 0.25] [--enregistrer-reference]
+
+# ----- Imports -----
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+from unittest import mock
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pygame
+
+import resources
+from entities import MagpieFlock, MagpieSwarm
+from resources import load_image, load_icon, load_sound, load_font, get_font, init_fonts, CACHE
+from ui import (
+    dessiner_pie, dessiner_texte_avec_contour, dessiner_panneau_etat, PanneauEtat, obtenir_surface_panneau,
+    dessiner_viseur, dessiner_bouton, BoutonPrerendu, CACHE_TEXTE_CONTOUR
+)
+from settings import (
+    WIDTH, HEIGHT, MAGPIE_BODY_RADIUS, BACKGROUND_IMG_PATH, SHELTIE_IMG_PATH, DOG_SIZE,
+    BIRD_IMG_PATH, AMMO_IMG_PATH, TIMER_IMG_PATH, BARKING_SOUND_PATH, FONT_SPECS
+)
+
+REFERENCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reference.json")
+TAILLES_NUEE = (1, 10, 100, 1000, 10000)
+VITESSE = 6
+# Durée minimale d'un échantillon (s) : les appels très courts sont groupés
+DUREE_ECHANTILLON = 1e-3
+
+# ==================================================
+# Mesure d'un cas
+# ==================================================
+@dataclass
+class Cas:
+    """
+    Un appel mesuré. preparation() est appelée avant chaque appel sans être chronométrée
+    (vidage d'un cache pour mesurer le chemin à froid) ; les échantillons comptent alors un seul appel.
+    """
+    nom: str
+    appel: Callable[[], object]
+    preparation: Optional[Callable[[], object]] = None
+
+def calibrer(cas: Cas) -> int:
+    """
+    Préchauffe le cas et retourne le nombre d'appels par échantillon.
+    """
+    if cas.preparation is not None:
+        cas.preparation()
+        cas.appel()
+        return 1
+    appels = 1
+    while True:
+        debut = time.perf_counter()
+        for _ in range(appels):
+            cas.appel()
+        if time.perf_counter() - debut >= DUREE_ECHANTILLON or appels >= 1 << 20:
+            return appels
+        appels *= 2
+
+def echantillonner(cas: Cas, appels: int, echantillons: int) -> List[float]:
+    """
+    Temps moyen par appel (µs) de chaque échantillon, ramasse-miettes suspendu.
+    """
+    appel, preparation = cas.appel, cas.preparation
+    chrono = time.perf_counter
+    temps = []
+    gc_actif = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(echantillons):
+            if preparation is not None:
+                preparation()
+            debut = chrono()
+            for _ in range(appels):
+                appel()
+            temps.append((chrono() - debut) / appels * 1e6)
+    finally:
+        if gc_actif:
+            gc.enable()
+    return temps
+
+def resumer(temps: List[float], appels: int) -> dict:
+    """
+    Latence par appel (µs : médiane, 95e et 99e centiles, minimum) et opérations par seconde (médiane).
+    """
+    temps = np.asarray(temps)
+    mediane = float(np.median(temps))
+    return {
+        "ops_s": 1e6 / mediane if mediane > 0 else float("inf"),
+        "p50_us": mediane,
+        "p95_us": float(np.percentile(temps, 95)),
+        "p99_us": float(np.percentile(temps, 99)),
+        "min_us": float(temps.min()),
+        "appels_par_echantillon": appels,
+        "echantillons": len(temps),
+    }
+
+# ==================================================
+# Cas mesurés
+# ==================================================
+
+def cas_dessin(ecran: "pygame.Surface") -> List[Cas]:
+    """
+    Fonctions de dessin de ui, telles qu'appelées par le menu et les manches.
+    """
+    police_stat, police_niveau = get_font("stat"), get_font("label")
+    oiseau, munition, minuterie = (load_icon(chemin) for chemin in (BIRD_IMG_PATH, AMMO_IMG_PATH, TIMER_IMG_PATH))
+    panneau = PanneauEtat(oiseau, munition, minuterie, police_stat, police_niveau, obtenir_surface_panneau)
+    rect_bouton = pygame.Rect(WIDTH // 2 - 120, 200, 240, 60)
+    bouton = BoutonPrerendu(rect_bouton, "Facile", get_font("button"), (120, 220, 120))
+    temps = iter(range(10 ** 9))
+    texte = ("Bravo !", get_font("over"), (WIDTH // 2, HEIGHT // 2), (255, 140, 0))
+    return [
+        Cas("ui.dessiner_pie", lambda: dessiner_pie(ecran, (400, 300))),
+        Cas("ui.dessiner_pie[gauche]", lambda: dessiner_pie(ecran, (400, 300), vers_gauche=True)),
+        Cas("ui.dessiner_texte_avec_contour[cache]", lambda: dessiner_texte_avec_contour(ecran, *texte)),
+        Cas("ui.dessiner_texte_avec_contour[froid]", lambda: dessiner_texte_avec_contour(ecran, *texte),
+            CACHE_TEXTE_CONTOUR.vider),
+        Cas("ui.dessiner_panneau_etat", lambda: dessiner_panneau_etat(
+            ecran, 10, 10, "Moyen", 3, 10, 12, 25, oiseau, munition, minuterie,
+            police_stat, police_niveau, obtenir_surface_panneau)),
+        Cas("ui.PanneauEtat.dessiner[inchange]", lambda: panneau.dessiner(ecran, 10, 10, "Moyen", 3, 10, 12, 25)),
+        Cas("ui.PanneauEtat.dessiner[temps]", lambda: panneau.dessiner(ecran, 10, 10, "Moyen", 3, 10, 12, next(temps) % 30)),
+        Cas("ui.dessiner_viseur", lambda: dessiner_viseur(ecran, (400, 300))),
+        Cas("ui.dessiner_bouton", lambda: dessiner_bouton(ecran, rect_bouton, "Facile", get_font("button"), (120, 220, 120))),
+        Cas("ui.BoutonPrerendu.dessiner", lambda: bouton.dessiner(ecran, True)),
+    ]
+
+def cas_entites(tailles=TAILLES_NUEE) -> List[Cas]:
+    """
+    Pas de simulation et test de tir d'une nuée, en liste de Magpie et en tableaux NumPy.
+    Le clic est manqué : le test parcourt toutes les pies sans changer la nuée.
+    """
+    liste = []
+    for taille in tailles:
+        for classe in (MagpieFlock, MagpieSwarm):
+            rng = random.Random(taille)
+            nuee = classe.create_random(taille, VITESSE, HEIGHT, MAGPIE_BODY_RADIUS, rng)
+            liste.append(Cas(f"entities.{classe.__name__}.update[{taille}]",
+                             lambda n=nuee, r=rng: n.update(VITESSE, WIDTH, HEIGHT, MAGPIE_BODY_RADIUS, r)))
+            liste.append(Cas(f"entities.{classe.__name__}.check_hit[{taille}]",
+                             lambda n=nuee: n.check_hit(-1000, -1000, MAGPIE_BODY_RADIUS)))
+    return liste
+
+def cas_ressources() -> List[Cas]:
+    """
+    Chargements à froid (fichier décodé), depuis le cache disque des images et à chaud (cache mémoire).
+    """
+    def oublier(cle, disque=None):
+        def preparation():
+            CACHE.discard(cle)
+            if disque is not None:
+                for nom in os.listdir(disque):
+                    os.remove(os.path.join(disque, nom))
+        return preparation
+
+    fond = ("image", resources._asset_path(BACKGROUND_IMG_PATH), (WIDTH, HEIGHT))
+    chien = ("image", resources._asset_path(SHELTIE_IMG_PATH), DOG_SIZE)
+    icone = ("image", resources._asset_path(BIRD_IMG_PATH), None)
+    son = ("sound", resources._asset_path(BARKING_SOUND_PATH))
+    famille, taille, gras = FONT_SPECS["button"]
+    police = ("font", famille, taille, gras)
+    dossier = resources.IMAGE_CACHE_DIR
+    return [
+        Cas("resources.load_image[froid]", lambda: load_image(BACKGROUND_IMG_PATH, (WIDTH, HEIGHT)), oublier(fond, dossier)),
+        Cas("resources.load_image[disque]", lambda: load_image(BACKGROUND_IMG_PATH, (WIDTH, HEIGHT)), oublier(fond)),
+        Cas("resources.load_image[chaud]", lambda: load_image(BACKGROUND_IMG_PATH, (WIDTH, HEIGHT))),
+        Cas("resources.load_image[redimension,froid]", lambda: load_image(SHELTIE_IMG_PATH, DOG_SIZE), oublier(chien, dossier)),
+        Cas("resources.load_icon[froid]", lambda: load_icon(BIRD_IMG_PATH), oublier(icone, dossier)),
+        Cas("resources.load_icon[chaud]", lambda: load_icon(BIRD_IMG_PATH)),
+        Cas("resources.load_sound[froid]", lambda: load_sound(BARKING_SOUND_PATH), oublier(son)),
+        Cas("resources.load_sound[chaud]", lambda: load_sound(BARKING_SOUND_PATH)),
+        Cas("resources.load_font[froid]", lambda: load_font(famille, taille, gras), oublier(police)),
+        Cas("resources.load_font[chaud]", lambda: load_font(famille, taille, gras)),
+    ]
+
+# ==================================================
+# Exécution et comparaison
+# ==================================================
+
+def executer(
+    filtre: str = "",
+    echantillons: int = 100,
+    echantillons_froid: int = 20,
+    tours: int = 5,
+    noms: Optional[set] = None
+) -> dict:
+    """
+    Mesure les cas dont le nom contient filtre (ou figure dans noms) ;
+    retourne les métadonnées et les résultats par cas.
+    Les échantillons sont pris en plusieurs tours qui passent sur tous les cas : une baisse passagère
+    de la vitesse de la machine touche alors tous les cas au lieu de fausser quelques-uns.
+    Le cache disque des images est redirigé vers un dossier temporaire ;
+    pygame reste initialisé (les polices et surfaces en cache resservent à une seconde mesure).
+    """
+    pygame.init()
+    ecran = pygame.display.set_mode((WIDTH, HEIGHT))
+    init_fonts()
+    with tempfile.TemporaryDirectory() as dossier, mock.patch("resources.IMAGE_CACHE_DIR", dossier):
+        selection = [
+            cas for cas in cas_dessin(ecran) + cas_entites() + cas_ressources()
+            if (cas.nom in noms if noms is not None else filtre in cas.nom)
+        ]
+        appels = {cas.nom: calibrer(cas) for cas in selection}
+        temps = {cas.nom: [] for cas in selection}
+        for _ in range(tours):
+            for cas in selection:
+                nombre = echantillons_froid if cas.preparation else echantillons
+                temps[cas.nom] += echantillonner(cas, appels[cas.nom], max(1, nombre // tours))
+    resultats = {nom: resumer(valeurs, appels[nom]) for nom, valeurs in temps.items()}
+    return {
+        "meta": {
+            "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": np.__version__,
+            "machine": platform.platform(),
+            "processeur": platform.processor() or platform.machine(),
+        },
+        "resultats": resultats,
+    }
+
+def comparer(resultats: Dict[str, dict], reference: Dict[str, dict], seuil: float) -> Dict[str, dict]:
+    """
+    Rapport (latence médiane / médiane de référence) des cas présents des deux côtés ;
+    un cas régresse si ce rapport dépasse 1 + seuil.
+    """
+    comparaison = {}
+    for nom, mesure in resultats.items():
+        if nom in reference and reference[nom]["p50_us"] > 0:
+            rapport = mesure["p50_us"] / reference[nom]["p50_us"]
+            comparaison[nom] = {"rapport": rapport, "regression": rapport > 1.0 + seuil}
+    return comparaison
+
+def remesurer(
+    resultats: Dict[str, dict],
+    reference: Dict[str, dict],
+    seuil: float,
+    mesurer: Callable[[set], Dict[str, dict]]
+) -> Dict[str, dict]:
+    """
+    Compare resultats à la référence ; les cas en régression sont mesurés une seconde fois
+    par mesurer(noms) et la meilleure des deux mesures est gardée dans resultats.
+    Retourne la comparaison finale.
+    """
+    comparaison = comparer(resultats, reference, seuil)
+    suspects = {nom for nom, ecart in comparaison.items() if ecart["regression"]}
+    if not suspects:
+        return comparaison
+    for nom, mesure in mesurer(suspects).items():
+        if mesure["p50_us"] < resultats[nom]["p50_us"]:
+            resultats[nom] = mesure
+    return comparer(resultats, reference, seuil)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks du rendu, des entités et des ressources.")
+    parser.add_argument("--filtre", default="", help="ne mesure que les cas dont le nom contient ce texte")
+    parser.add_argument("--echantillons", type=int, default=100, help="échantillons par cas")
+    parser.add_argument("--json", help="écrit les résultats dans ce fichier")
+    parser.add_argument("--reference", default=REFERENCE,
+                        help="résultats de référence de cette machine (non versionnés)")
+    parser.add_argument("--seuil", type=float, default=0.25,
+                        help="ralentissement toléré de la latence médiane (0.25 = 25 %%)")
+    parser.add_argument("--enregistrer-reference", action="store_true",
+                        help="remplace les cas mesurés dans le fichier de référence")
+    args = parser.parse_args(argv)
+
+    echantillons_froid = max(5, args.echantillons // 5)
+    mesures = executer(args.filtre, args.echantillons, echantillons_froid)
+    resultats = mesures["resultats"]
+    reference = {}
+    if os.path.isfile(args.reference):
+        with open(args.reference, encoding="utf-8") as f:
+            enregistree = json.load(f)
+        reference = enregistree["resultats"]
+        machine = enregistree.get("meta", {}).get("machine")
+        if machine != mesures["meta"]["machine"]:
+            print(f"Attention : référence enregistrée sur une autre machine ({machine}).")
+    elif not args.enregistrer_reference:
+        print(f"Aucune référence pour cette machine ({args.reference}) : résultats non comparés. "
+              "Enregistrez-la avec --enregistrer-reference.")
+    if args.enregistrer_reference:
+        comparaison = comparer(resultats, reference, args.seuil)
+    else:
+        # --- Les cas en régression sont remesurés une fois : la meilleure des deux mesures est gardée ---
+        comparaison = remesurer(
+            resultats, reference, args.seuil,
+            lambda noms: executer(echantillons=args.echantillons, echantillons_froid=echantillons_froid,
+                                  noms=noms)["resultats"]
+        )
+    pygame.quit()
+    mesures["comparaison"] = {"reference": args.reference, "seuil": args.seuil, "cas": comparaison}
+
+    print(f"{'cas':46}{'ops/s':>12}{'p50 µs':>11}{'p95 µs':>11}{'p99 µs':>11}{'vs réf.':>9}")
+    for nom, mesure in resultats.items():
+        ecart = comparaison.get(nom)
+        colonne = "-" if ecart is None else f"{ecart['rapport']:.2f}x" + (" !" if ecart["regression"] else "")
+        print(f"{nom:46}{mesure['ops_s']:>12.0f}{mesure['p50_us']:>11.2f}{mesure['p95_us']:>11.2f}"
+              f"{mesure['p99_us']:>11.2f}{colonne:>9}")
+    regressions = [nom for nom, ecart in comparaison.items() if ecart["regression"]]
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(mesures, f, ensure_ascii=False, indent=2)
+    if args.enregistrer_reference:
+        reference.update(resultats)
+        with open(args.reference, "w", encoding="utf-8") as f:
+            json.dump({"meta": mesures["meta"], "resultats": reference}, f, ensure_ascii=False, indent=2)
+        print(f"Référence enregistrée : {args.reference}")
+        return 0
+    if regressions:
+        print(f"{len(regressions)} régression(s) au-delà de {args.seuil:.0%} : " + ", ".join(regressions))
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
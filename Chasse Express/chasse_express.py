@@ -2,339 +2,567 @@
 # Module principal du jeu Chasse Express
 # ========================================
 # Ce module gère l'initialisation, le menu principal, la boucle de jeu, le score et la gestion des ressources.
-# Toutes les fonctions et classes externes sont importées au début pour une structure claire et modulaire.
+# Les modules des écrans sont importés au début ; ceux de la manche (session) et des relectures (replay)
+# ne le sont qu'une fois le menu affiché, à leur premier usage.
 
 
 # ========================================
 # Imports et constantes
 # ========================================
 
+# --- Chronologie du démarrage, avant tout import coûteux ---
+from startup import DEMARRAGE
+
 # --- Imports standards et bibliothèques externes ---
+import os
+import random
+import sys
 try:
     import pygame
 except ImportError:
     print("Pygame est requis. Installez-le avec : pip install pygame")
-    import sys
     sys.exit(1)
-import sys
+DEMARRAGE.marquer("import de pygame")
+import time
+from dataclasses import dataclass
 
 # --- Imports des modules du projet ---
-from entities import Magpie, Dog
-from resources import ErreurRessourceJeu, load_image, load_sound, load_font, load_icon
+# Les modules de la manche (session, entités, vol en nuée) et des relectures ne sont importés
+# qu'une fois le menu affiché : ils ne servent pas au premier écran.
+from resources import (
+    ErreurRessourceJeu, load_image, load_sound, load_font, load_icon,
+    init_fonts, get_font, AssetLoader
+)
 from ui import (
-    dessiner_texte_avec_contour, dessiner_icone_texte, obtenir_surface_panneau, dessiner_panneau_etat,
-    dessiner_fond, dessiner_chien, dessiner_pie, dessiner_viseur, dessiner_bouton
+    dessiner_texte_avec_contour, rendre_titre_degrade, dessiner_icone_texte, obtenir_surface_panneau, dessiner_panneau_etat, PanneauEtat,
+    dessiner_fond, dessiner_chien, dessiner_pie, dessiner_viseur, dessiner_bouton, BoutonPrerendu,
+    installer_curseur_viseur, retablir_curseur_systeme, dessiner_barre_progression,
+    obtenir_sprite_pie, redimensionner_icone, rendre_sprites_particules, obtenir_surface_viseur
 )
+from rendering import composer_calque_statique, ZonesSales, AtlasTextures, SpritesParticules, EchelleRendu
+from particles import ParticleSystem, KIND_COUNT, FADE_LEVELS
+from profiler import PROFILEUR, SUPERPOSITION, traiter_touche, exporter_profil
 from settings import (
-    WIDTH, HEIGHT, OUTLINE_W, MAGPIE_BLACK, MAGPIE_WHITE, MAGPIE_BLUE, MAGPIE_BEAK,
-    MAGPIE_HIGHLIGHT, RED, MAGPIE_BODY_RADIUS, DIFFICULTY_SETTINGS,
-    SHELTIE_IMG_PATH, BARKING_SOUND_PATH, AMBIANCE_MUSIC_PATH, TREE_IMG_PATH,
-    BACKGROUND_IMG_PATH, BIRD_IMG_PATH, AMMO_IMG_PATH, TIMER_IMG_PATH
+    IDLE_POLL_MS, WIDTH, HEIGHT, OUTLINE_W, MAGPIE_BLACK, MAGPIE_WHITE, MAGPIE_BLUE, MAGPIE_BEAK,
+    MAGPIE_HIGHLIGHT, RED, MAGPIE_BODY_RADIUS, DIFFICULTY_SETTINGS, USE_SYSTEM_CURSOR, DIRTY_RECTS,
+    RENDER_FPS, DOG_POS, DOG_SIZE, RECORD_REPLAYS, LAST_REPLAY_PATH, FEATHERS_PER_HIT,
+    SHELTIE_IMG_PATH, BARKING_SOUND_PATH, AMBIANCE_MUSIC_PATH, TREE_IMG_PATH, TREE_SIZE, TREE_POSITIONS,
+    BACKGROUND_IMG_PATH, BIRD_IMG_PATH, AMMO_IMG_PATH, TIMER_IMG_PATH, MIXER_SETTINGS, RENDER_SCALE
 )
 from utils import (
     calcule_score, consomme_munition, verifie_victoire, verifie_defaite,
     temps_ecoule, pourcentage_objectif
 )
+from events import attendre_evenements, EtatFenetre
+DEMARRAGE.marquer("import des modules du projet")
+
+
+# ========================================
+# Éléments préparés une seule fois
+# ========================================
+@dataclass
+class Scene:
+    """
+    Ressources et calques prêts à l'affichage, partagés par le menu et les manches.
+    Calques, sprites et boutons sont à la résolution interne du rendu (echelle).
+    """
+    loader: AssetLoader
+    menu_layer: "pygame.Surface"
+    round_backdrop: "pygame.Surface"
+    atlas: AtlasTextures
+    buttons: list
+    ambiance_music_exists: bool
+    particle_sprites: SpritesParticules
+    echelle: EchelleRendu
+
+def charger_ressources(screen, echelle):
+    """
+    Lance le décodage des ressources en arrière-plan et affiche l'écran de chargement.
+    Retourne le chargeur, la surface du titre et sa position (en coordonnées du jeu).
+    """
+    # --- Titre avec dégradé (polices seulement) ---
+    title_font = get_font("title")
+    gradient_colors = (
+        (255, 140, 0), (34, 139, 34), (72, 61, 139), (30, 144, 255)
+    )
+    title_surf, (title_dx, title_dy), title_width = rendre_titre_degrade("Chasse Express", title_font, gradient_colors)
+    title_pos = (WIDTH//2 - title_width//2 + title_dx, 60 + title_dy)
+
+    # --- Décodage en arrière-plan (les sons attendent le démarrage du mixer) ---
+    loader = AssetLoader()
+    loader.load_image("background", BACKGROUND_IMG_PATH, (WIDTH, HEIGHT))
+    loader.load_image("sheltie", SHELTIE_IMG_PATH, DOG_SIZE)
+    loader.load_image("tree", TREE_IMG_PATH, TREE_SIZE)
+    loader.load_icon("bird", BIRD_IMG_PATH)
+    loader.load_icon("ammo", AMMO_IMG_PATH)
+    loader.load_icon("timer", TIMER_IMG_PATH)
+
+    # --- Écran de chargement affiché pendant le décodage ---
+    loading_title = echelle.reduire(title_surf)
+    loading_title_pos = echelle.point(*title_pos)
+    progress_rect = echelle.rect((WIDTH//2 - 160, HEIGHT//2, 320, 18))
+    while not loader.ready():
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                loader.shutdown()
+                pygame.quit()
+                sys.exit()
+        loader.poll()
+        dessiner_fond(screen, None)
+        screen.blit(loading_title, loading_title_pos)
+        dessiner_barre_progression(screen, progress_rect, loader.progress())
+        echelle.afficher()
+        # Jusqu'à une image d'attente, écourtée dès qu'un décodage se termine
+        loader.wait(1 / RENDER_FPS if RENDER_FPS else None)
+    return loader, title_surf, title_pos
+
+def preparer_scene(loader, title_surf, title_pos, echelle):
+    """
+    Compose les calques statiques, l'atlas des sprites et les boutons du menu.
+    Tout est composé en coordonnées du jeu puis réduit une seule fois à la résolution interne.
+    """
+    try:
+        sheltie_img = loader.get("sheltie")
+        if not sheltie_img:
+            raise ErreurRessourceJeu(f"Image non trouvée : {SHELTIE_IMG_PATH}")
+
+        tree_img = loader.get("tree")
+        if not tree_img:
+            raise ErreurRessourceJeu(f"Image non trouvée : {TREE_IMG_PATH}")
+
+        background_img = loader.get("background")
+
+        bird_icon = loader.get("bird")
+        ammo_icon = loader.get("ammo")
+        timer_icon = loader.get("timer")
+
+    except ErreurRessourceJeu as e:
+        print(f"Erreur critique de ressource : {e}")
+        sys.exit(1)
+
+    # --- Calques statiques pré-composés ---
+    trees = tuple((tree_img, tree_pos) for tree_pos in TREE_POSITIONS)
+    # Fond de la manche : fond + arbres
+    round_backdrop = echelle.reduire(composer_calque_statique((WIDTH, HEIGHT), background_img, trees))
+    # Fond du menu : fond + arbres + chien + titre avec dégradé
+    menu_layer = echelle.reduire(composer_calque_statique(
+        (WIDTH, HEIGHT), background_img,
+        trees + ((sheltie_img, DOG_POS), (title_surf, title_pos))
+    ))
+    # --- Atlas des sprites : chien, pies (deux orientations), viseur et icônes du panneau à leur taille d'affichage ---
+    atlas = AtlasTextures()
+    atlas.ajouter("sheltie", echelle.reduire(sheltie_img))
+    for facing_left in (False, True):
+        magpie_sprite, magpie_anchor = obtenir_sprite_pie(miroir=facing_left)
+        atlas.ajouter(("pie", facing_left), echelle.reduire(magpie_sprite), echelle.point(*magpie_anchor))
+    atlas.ajouter("viseur", echelle.reduire(obtenir_surface_viseur()), echelle.point(22, 22))
+    # Les icônes restent en coordonnées du jeu : le panneau d'état est réduit une fois composé
+    icon_size = get_font("stat").get_height()
+    for icon_name, icon in (("bird", bird_icon), ("ammo", ammo_icon), ("timer", timer_icon)):
+        atlas.ajouter(icon_name, redimensionner_icone(icon, icon_size))
+    # Particules : chaque sorte à chaque niveau d'estompage
+    for code, (sprite, anchor) in rendre_sprites_particules(get_font("label")).items():
+        atlas.ajouter(("particule", code), echelle.reduire(sprite), echelle.point(*anchor))
+    atlas.construire()
+    particle_sprites = SpritesParticules(atlas, KIND_COUNT * FADE_LEVELS, echelle.echelle)
+    # --- Boutons de sélection de difficulté, pré-rendus dans leurs deux états ---
+    btn_font = get_font("button")
+    btns = [
+        BoutonPrerendu(pygame.Rect(WIDTH//2-120, 200, 240, 60), "Facile", btn_font, (120, 220, 120), echelle.echelle),
+        BoutonPrerendu(pygame.Rect(WIDTH//2-120, 280, 240, 60), "Moyen", btn_font, (220, 200, 80), echelle.echelle),
+        BoutonPrerendu(pygame.Rect(WIDTH//2-120, 360, 240, 60), "Difficile", btn_font, (220, 80, 80), echelle.echelle),
+    ]
+    # La musique est lue en flux au moment voulu : seule son existence est vérifiée ici
+    return Scene(
+        loader, menu_layer, round_backdrop, atlas, btns, os.path.isfile(AMBIANCE_MUSIC_PATH), particle_sprites, echelle
+    )
+
+# ========================================
+# Démarrage différé
+# ========================================
+def demarrer_audio(scene):
+    """
+    Démarre le mixer (réglé par pygame.mixer.pre_init) et lance le décodage des sons en arrière-plan.
+    Sans périphérique audio, le jeu continue sans son.
+    """
+    if not pygame.mixer.get_init():
+        try:
+            pygame.mixer.init()
+        except pygame.error as e:
+            print(f"Son désactivé : {e}")
+            return
+    scene.loader.load_sound("barking", BARKING_SOUND_PATH, critical=False)
+
+def terminer_demarrage(scene):
+    """
+    Après le premier écran du menu : affiche la durée du démarrage (et son détail avec --startup-profile),
+    puis démarre le son et importe les modules des manches pendant que le joueur choisit.
+    """
+    total = DEMARRAGE.terminer("premier écran du menu")
+    print(f"Menu interactif en {total:.0f} ms")
+    if "--startup-profile" in sys.argv[1:]:
+        print(DEMARRAGE.rapport())
+    demarrer_audio(scene)
+    import session  # noqa: F401
+    import replay  # noqa: F401
+
+# ========================================
+# Menu principal
+# ========================================
+def afficher_menu(screen, clock, scene):
+    """
+    Affiche le menu jusqu'au choix d'une difficulté ; retourne None si le joueur quitte.
+    Le menu est figé : il attend les événements sans consommer de processeur
+    et n'est redessiné que si le bouton survolé change ou si la fenêtre doit être repeinte.
+    """
+    pygame.mouse.set_visible(True)
+    window = EtatFenetre()
+    hovered = None
+    redraw = True
+    while True:
+        try:
+            scene.loader.poll()
+            # --- Boutons de sélection de difficulté ---
+            mx, my = pygame.mouse.get_pos()
+            now_hovered = next((btn for btn in scene.buttons if btn.rect.collidepoint(mx, my)), None)
+            if redraw or now_hovered is not hovered:
+                PROFILEUR.debut_image()
+                hovered = now_hovered
+                screen.blit(scene.menu_layer, (0, 0))
+                PROFILEUR.marquer("fond")
+                for btn in scene.buttons:
+                    btn.dessiner(screen, btn is hovered)
+                PROFILEUR.marquer("boutons")
+                SUPERPOSITION.dessiner(screen)
+                PROFILEUR.marquer("superposition")
+                scene.echelle.afficher()
+                PROFILEUR.marquer("affichage")
+                PROFILEUR.fin_image("menu")
+                redraw = False
+                if not DEMARRAGE.termine:
+                    terminer_demarrage(scene)
+                # Limite la cadence des redessins quand la souris balaie les boutons
+                clock.tick(RENDER_FPS)
+            # --- Attente des événements du menu (bornée tant que des ressources se chargent) ---
+            for event in attendre_evenements(0 if scene.loader.ready(critical_only=False) else IDLE_POLL_MS):
+                if event.type == pygame.QUIT:
+                    return None
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    mx, my = pygame.mouse.get_pos()
+                    for btn in scene.buttons:
+                        if btn.rect.collidepoint(mx, my) and btn.texte in DIFFICULTY_SETTINGS:
+                            return btn.texte
+                elif event.type == pygame.KEYDOWN:
+                    redraw = traiter_touche(event.key) or redraw
+                elif window.traiter(event):
+                    redraw = True
+        except Exception as e:
+            print(f"Erreur dans le menu : {e}")
+
+# ========================================
+# Rendu d'une manche
+# ========================================
+def dessiner_texte_centre(screen, scene, role, message, y):
+    """
+    Texte blanc centré horizontalement, à l'ordonnée y du jeu ; rendu (et réduit) une seule fois par message.
+    """
+    text = scene.echelle.surface_fixe(
+        (role, message), lambda: get_font(role).render(message, True, (255, 255, 255))
+    )
+    return screen.blit(text, (screen.get_width()//2 - text.get_width()//2, scene.echelle.point(0, y)[1]))
+
+def dessiner_manche(screen, scene, session, status_panel, dirty, aim_pos, dog_moving, particles=None):
+    """
+    Dessine l'état de la session (positions interpolées), les particules, et enregistre les zones modifiées.
+    Les positions, en coordonnées du jeu, sont converties à la résolution interne du rendu.
+    aim_pos vaut None lorsque le viseur est le curseur système ; dog_moving indique si le chien a bougé.
+    """
+    dog = session.dog
+    alpha = session.alpha
+    point = scene.echelle.point
+    # --- Affichage groupé du chien et des pies depuis l'atlas ---
+    sprites = [("sheltie", point(dog.x, dog.get_jump_y(alpha)))]
+    if session.magpies is not None:
+        for x, y, facing_left in session.magpies.visible(alpha):
+            sprites.append((("pie", facing_left), point(x, y)))
+    sprite_rects = scene.atlas.dessiner(screen, sprites, retour_rects=dirty.actif)
+    if sprite_rects:
+        dirty.ajouter(sprite_rects[0], modifie=dog_moving)
+        for rect in sprite_rects[1:]:
+            dirty.ajouter(rect)
+    PROFILEUR.marquer("sprites")
+    # --- Plumes, éclairs et points gagnés : une seule zone englobante ---
+    if particles is not None and len(particles):
+        dirty.ajouter(scene.particle_sprites.dessiner(screen, particles, retour_rect=dirty.actif))
+    PROFILEUR.marquer("particules")
+    # Phase d'attente : le chien n'a pas encore été cliqué
+    if not dog.jump_started and not session.paused:
+        instruct = dessiner_texte_centre(screen, scene, "instruct", "Cliquez sur le chien pour commencer !", HEIGHT//2)
+        dirty.ajouter(instruct, modifie=False)
+        PROFILEUR.marquer("textes")
+    # --- Affichage du viseur ---
+    if aim_pos is not None:
+        dirty.ajouter(scene.atlas.dessiner(screen, [("viseur", scene.echelle.point(*aim_pos))], retour_rects=True)[0])
+        PROFILEUR.marquer("viseur")
+    # --- Affichage du panneau d'état ---
+    if session.magpies_released:
+        hud_redrawn = status_panel.dessiner(
+            screen, 10, 10, session.label, session.score, session.goal, session.ammo, session.time_left
+        )
+        dirty.ajouter(status_panel.rect, modifie=hud_redrawn)
+        PROFILEUR.marquer("panneau")
+    # --- Affichage du message de fin de partie ---
+    if session.game_over:
+        msg = "Bravo ! Vous avez gagné !" if session.win else "Partie terminée !"
+        dirty.ajouter(dessiner_texte_centre(screen, scene, "over", msg, HEIGHT//2 - 40), modifie=False)
+        sub_text = dessiner_texte_centre(screen, scene, "sub", "Cliquez pour revenir au menu principal", HEIGHT//2 + 30)
+        dirty.ajouter(sub_text, modifie=False)
+        PROFILEUR.marquer("textes")
+
+def dessiner_pause(screen, scene, dirty):
+    """
+    Voile et message de la manche en pause ; l'écran entier est à renvoyer.
+    """
+    veil = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+    veil.fill((0, 0, 0, 120))
+    screen.blit(veil, (0, 0))
+    dessiner_texte_centre(screen, scene, "over", "Pause", HEIGHT//2 - 40)
+    dessiner_texte_centre(screen, scene, "sub", "Revenez sur la fenêtre pour reprendre", HEIGHT//2 + 30)
+    dirty.ajouter(screen.get_rect())
+
+def jouer_son_depart(scene):
+    """
+    Aboiement du chien et musique d'ambiance au départ du saut.
+    """
+    barking_sound = scene.loader.get("barking")
+    if barking_sound:
+        barking_sound.play()
+    if scene.ambiance_music_exists and pygame.mixer.get_init():
+        pygame.mixer.music.load(AMBIANCE_MUSIC_PATH)
+        pygame.mixer.music.play(-1)
 
+# ========================================
+# Boucle d'une manche
+# ========================================
+def jouer_manche(screen, clock, scene, session, replayer=None):
+    """
+    Pilote une GameSession : temps réel, clics de la souris (ou de la relecture), rendu et sons.
+    La manche se met en pause quand la fenêtre perd le focus ou est réduite ; en pause et sur
+    l'écran de fin de partie, la boucle attend les événements au lieu de redessiner en continu.
+    Retourne False si le joueur ferme la fenêtre, True sinon.
+    """
+    if replayer is not None:
+        session = replayer.session
+    system_cursor = replayer is None and USE_SYSTEM_CURSOR and installer_curseur_viseur()
+    pygame.mouse.set_visible(system_cursor)
+    aim_pos = (WIDTH // 2, HEIGHT // 2)
+    status_panel = PanneauEtat(
+        scene.atlas.sous_surface("bird"), scene.atlas.sous_surface("ammo"), scene.atlas.sous_surface("timer"),
+        get_font("stat"), get_font("label"), obtenir_surface_panneau, echelle=scene.echelle.echelle
+    )
+    # --- Suivi des zones modifiées sur le fond statique de la manche ---
+    dirty = ZonesSales(scene.round_backdrop, actif=DIRTY_RECTS, echelle=scene.echelle)
+    # Effets décoratifs, hors de la simulation (les relectures restent exactes)
+    particles = ParticleSystem()
+    window = EtatFenetre()
+    last_frame = time.perf_counter()
+    keep_running = True
+    running_round = True
+    # Vrai tant que l'image affichée ne reflète pas l'état courant (entrée, fenêtre repeinte, pause)
+    stale = True
+
+    while running_round:
+        try:
+            PROFILEUR.debut_image()
+            scene.loader.poll()
+            # --- Écran figé (pause, fin de partie sans effet en cours) : attente bloquante ---
+            frozen = session.paused or (replayer is None and session.game_over and not len(particles))
+            if frozen and not stale:
+                events = attendre_evenements(0 if scene.loader.ready(critical_only=False) else IDLE_POLL_MS)
+                last_frame = time.perf_counter()
+                # L'attente ne compte pas dans la durée de l'image
+                PROFILEUR.debut_image()
+            else:
+                events = pygame.event.get()
+            # --- Gestion des événements de la partie ---
+            pressed = []
+            for event in events:
+                if event.type == pygame.QUIT:
+                    keep_running = False
+                    running_round = False
+                elif event.type == pygame.MOUSEBUTTONDOWN and replayer is None:
+                    pressed.append(pygame.mouse.get_pos())
+                elif event.type == pygame.MOUSEMOTION:
+                    # Le viseur dessiné par le jeu suit la souris
+                    stale = stale or not system_cursor
+                elif event.type == pygame.KEYDOWN:
+                    if traiter_touche(event.key):
+                        dirty.invalider()
+                        stale = True
+                elif window.traiter(event):
+                    dirty.invalider()
+                    stale = True
+            # --- Pause automatique quand la fenêtre est inactive ---
+            if window.active == session.paused:
+                session.set_paused(not window.active)
+                if pygame.mixer.get_init():
+                    if session.paused:
+                        pygame.mixer.music.pause()
+                    else:
+                        pygame.mixer.music.unpause()
+                dirty.invalider()
+                stale = True
+            PROFILEUR.marquer("evenements")
+            dirty.commencer(screen)
+            PROFILEUR.marquer("fond")
+            # --- Simulation à pas fixe, indépendante de la cadence d'affichage ---
+            dog_moving = session.dog.jumping
+            now = time.perf_counter()
+            if replayer is not None:
+                # Relecture : les clics enregistrés sont appliqués à leur pas
+                clicks = replayer.tick(now - last_frame)
+                if clicks:
+                    aim_pos = clicks[-1][:2]
+            else:
+                session.tick(now - last_frame)
+                clicks = []
+                for mx, my in pressed:
+                    result = session.click(mx, my)
+                    clicks.append((mx, my, result, session.last_hit if result == "hit" else None))
+                aim_pos = pygame.mouse.get_pos()
+            PROFILEUR.marquer("simulation")
+            if not session.paused:
+                particles.update(now - last_frame)
+            last_frame = now
+            PROFILEUR.marquer("particules")
+            dessiner_manche(
+                screen, scene, session, status_panel, dirty, None if system_cursor else aim_pos, dog_moving, particles
+            )
+            if session.paused:
+                dessiner_pause(screen, scene, dirty)
+                PROFILEUR.marquer("textes")
+            # --- Effets des clics : son du chien, musique, particules, retour au menu ---
+            for x, y, result, hit_pos in clicks:
+                if result in ("hit", "miss"):
+                    particles.muzzle_flash(x, y)
+                if result == "hit":
+                    # Plumes et « +1 » partent de la pie touchée, pas du point visé
+                    particles.feather_burst(hit_pos[0], hit_pos[1], FEATHERS_PER_HIT)
+                    particles.score_popup(hit_pos[0], hit_pos[1] - 30)
+                elif result == "dog":
+                    jouer_son_depart(scene)
+                elif result == "menu":
+                    running_round = False
+            if replayer is not None and replayer.termine:
+                keep_running = False
+                running_round = False
+            PROFILEUR.marquer("particules")
+            overlay_rect, overlay_changed = SUPERPOSITION.dessiner(screen)
+            dirty.ajouter(overlay_rect, modifie=overlay_changed)
+            PROFILEUR.marquer("superposition")
+            dirty.presenter()
+            PROFILEUR.marquer("affichage")
+            PROFILEUR.fin_image("manche")
+            stale = False
+            clock.tick(RENDER_FPS)
+        except Exception as e:
+            print(f"Erreur dans la boucle de manche : {e}")
+            running_round = False
+
+    if pygame.mixer.get_init():
+        pygame.mixer.music.stop()
+    if system_cursor:
+        retablir_curseur_systeme()
+    pygame.mouse.set_visible(True)
+    # --- Enregistrement de la manche pour pouvoir la rejouer ---
+    if replayer is None and RECORD_REPLAYS and session.inputs:
+        from replay import Replay
+        try:
+            Replay.from_session(session).save(LAST_REPLAY_PATH)
+        except OSError as e:
+            print(f"Erreur lors de l'enregistrement de la relecture : {e}")
+    return keep_running
 
 # ========================================
 # Fonction principale du jeu
 # ========================================
-def main():
+def main(replay_path=None):
     """
     Point d'entrée principal du jeu Chasse Express.
-    - Initialise Pygame et les ressources audio/visuelles.
-    - Affiche le menu principal et gère la sélection de la difficulté.
-    - Lance la boucle de jeu principale pour chaque partie.
-    - Gère le score, les munitions, le temps et la victoire/défaite.
+    - replay_path : fichier de relecture à rejouer en temps réel à la place d'une partie
+      (les manches ne sont enregistrées qu'avec RECORD_REPLAYS, voir settings).
+    - Initialise l'affichage, les polices et les ressources ; le son démarre après le premier écran du menu.
+    - Alterne le menu principal et les manches ; les règles d'une manche sont dans session.GameSession.
+    - --startup-profile sur la ligne de commande détaille la durée de chaque étape du démarrage.
+    - Avec RENDER_SCALE inférieur à 1, les images sont dessinées à la résolution interne et agrandies dans la fenêtre.
     """
     # ========================================
-    # Initialisation de Pygame
+    # Initialisation de Pygame (seulement les modules utilisés)
     # ========================================
     try:
-        pygame.init()
-        pygame.mixer.init()
+        pygame.display.init()
+        pygame.font.init()
+        pygame.mixer.pre_init(**MIXER_SETTINGS)
     except Exception as e:
         print(f"Erreur lors de l'initialisation de Pygame : {e}")
         sys.exit(1)
+    DEMARRAGE.marquer("initialisation de l'affichage et des polices")
 
     # ========================================
     # Création de la fenêtre principale
     # ========================================
+    echelle = EchelleRendu((WIDTH, HEIGHT), RENDER_SCALE)
     try:
-        screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        # Fenêtre à la taille du jeu ; avec une échelle, les images sont dessinées hors écran à la
+        # résolution interne et agrandies une fois par image dans la fenêtre
+        screen = echelle.preparer(pygame.display.set_mode((WIDTH, HEIGHT)))
         pygame.display.set_caption('Chasse Express')
     except pygame.error as e:
         print(f"Erreur lors de la création de la fenêtre : {e}")
         sys.exit(1)
-
-    # ==============================================
-    # Chargement des ressources graphiques et audio
-    # ==============================================
-    try:
-        sheltie_img = load_image(SHELTIE_IMG_PATH)
-        if sheltie_img:
-            sheltie_img = pygame.transform.smoothscale(sheltie_img, (200, 170))
-        else:
-            raise ErreurRessourceJeu(f"Image non trouvée : {SHELTIE_IMG_PATH}")
-
-        tree_img = load_image(TREE_IMG_PATH)
-        if tree_img:
-            tree_img = pygame.transform.smoothscale(tree_img, (150, 240))
-        else:
-            raise ErreurRessourceJeu(f"Image non trouvée : {TREE_IMG_PATH}")
-
-        background_img = load_image(BACKGROUND_IMG_PATH)
-        if background_img:
-            background_img = pygame.transform.smoothscale(background_img, (WIDTH, HEIGHT))
-
-        bird_icon = load_icon(BIRD_IMG_PATH)
-        ammo_icon = load_icon(AMMO_IMG_PATH)
-        timer_icon = load_icon(TIMER_IMG_PATH)
-
-        barking_sound = load_sound(BARKING_SOUND_PATH)
-        ambiance_music_exists = load_sound(AMBIANCE_MUSIC_PATH) is not None
-
-    except ErreurRessourceJeu as e:
-        print(f"Erreur critique de ressource : {e}")
-        sys.exit(1)
+    DEMARRAGE.marquer("création de la fenêtre")
 
     # ========================================
-    # Fonctions utilitaires internes
+    # Polices, ressources et scène
     # ========================================
-    def dessiner_arbre(surface, x, y):
-        """
-        Dessine un arbre sur la surface donnée.
-        :param surface: Surface pygame
-        :param x: Position x
-        :param y: Position y
-        """
-        if surface and tree_img:
-            surface.blit(tree_img, (x, y))
-
-    # ========================================
-    # Variables de contrôle du jeu
-    # ========================================
-    pygame.mouse.set_visible(True)
+    init_fonts()
+    DEMARRAGE.marquer("chargement des polices")
     clock = pygame.time.Clock()
-    title_font = pygame.font.SysFont("Montserrat", 96)
-    menu = True
-    difficulty = None
-    running = True
+    loader, title_surf, title_pos = charger_ressources(screen, echelle)
+    DEMARRAGE.marquer("décodage des images critiques")
+    scene = preparer_scene(loader, title_surf, title_pos, echelle)
+    DEMARRAGE.marquer("calques, atlas et boutons")
 
     # ========================================
-    # Boucle principale du jeu
+    # Relecture ou alternance menu / manches
     # ========================================
-    while running:
-        # ----------------------------------------
-        # Affichage du menu principal
-        # ----------------------------------------
-        if menu:
+    if replay_path:
+        from replay import Replay, Relecteur
+        demarrer_audio(scene)
+        try:
+            replay = Replay.load(replay_path)
+            jouer_manche(screen, clock, scene, None, Relecteur(replay, DOG_POS, DOG_SIZE))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Erreur lors du chargement de la relecture : {e}")
+    else:
+        running = True
+        while running:
+            difficulty = afficher_menu(screen, clock, scene)
+            if difficulty is None:
+                break
+            from session import GameSession
             try:
-                dessiner_fond(screen, background_img)
-                tree_x = 55
-                tree_y = HEIGHT - 110 - 240//2 - 10
-                dessiner_arbre(screen, tree_x, tree_y)
-                tree2_x = WIDTH - 55 - 150
-                tree2_y = tree_y
-                dessiner_arbre(screen, tree2_x, tree2_y)
-                dog_x = tree_x + 150 + 18
-                dog_y = HEIGHT - 170
-                screen.blit(sheltie_img, (dog_x, dog_y))
-                title_text = "Chasse Express"
-                # --- Génération du titre avec dégradé ---
-                gradient_colors = [
-                    (255, 140, 0), (34, 139, 34), (72, 61, 139), (30, 144, 255)
-                ]
-                n = len(title_text)
-                color_steps = []
-                for i in range(n):
-                    grad_pos = i / max(n-1, 1)
-                    grad_idx = grad_pos * (len(gradient_colors)-1)
-                    idx0 = int(grad_idx)
-                    idx1 = min(idx0+1, len(gradient_colors)-1)
-                    t = grad_idx - idx0
-                    c1, c2 = gradient_colors[idx0], gradient_colors[idx1]
-                    color = tuple(int(c1[j] + (c2[j] - c1[j]) * t) for j in range(3))
-                    color_steps.append(color)
-                total_width = sum(title_font.size(ch)[0] for ch in title_text)
-                title_x = WIDTH//2 - total_width//2
-                title_y = 60
-                x = title_x
-                for i, ch in enumerate(title_text):
-                    dessiner_texte_avec_contour(screen, ch, title_font, (x, title_y), color_steps[i])
-                    x += title_font.size(ch)[0]
-                # --- Boutons de sélection de difficulté ---
-                btn_font = pygame.font.SysFont("Montserrat", 44)
-                btns = [
-                    (pygame.Rect(WIDTH//2-120, 200, 240, 60), "Facile", (120, 220, 120)),
-                    (pygame.Rect(WIDTH//2-120, 280, 240, 60), "Moyen", (220, 200, 80)),
-                    (pygame.Rect(WIDTH//2-120, 360, 240, 60), "Difficile", (220, 80, 80)),
-                ]
-                mx, my = pygame.mouse.get_pos()
-                hover_idx = -1
-                for i, (rect, text, color) in enumerate(btns):
-                    hover = rect.collidepoint(mx, my)
-                    dessiner_bouton(screen, rect, text, btn_font, color, hover)
-                    if hover:
-                        hover_idx = i
-                # --- Gestion des événements du menu ---
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        running = False
-                    elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                        for i, (rect, text, color) in enumerate(btns):
-                            if rect and rect.collidepoint(mx, my):
-                                difficulty = text
-                                menu = False
-                pygame.display.flip()
-                clock.tick(60)
-            except Exception as e:
-                print(f"Erreur dans le menu : {e}")
+                session = GameSession(difficulty, random.getrandbits(32), DOG_POS, DOG_SIZE)
+            except (KeyError, ValueError, TypeError) as e:
+                print(f"Erreur de configuration de difficulté : {e}")
                 continue
+            running = jouer_manche(screen, clock, scene, session)
 
-        # ----------------------------------------
-        # Vérification de la difficulté sélectionnée
-        # ----------------------------------------
-        if not menu and (not difficulty or difficulty not in DIFFICULTY_SETTINGS):
-            menu = True
-            difficulty = None
-            continue
-
-        if menu:
-            continue
-
-        # ----------------------------------------
-        # Boucle de la partie (manche)
-        # ----------------------------------------
-        try:
-            settings = DIFFICULTY_SETTINGS[difficulty]
-            pygame.mouse.set_visible(False)
-            score = 0
-            ammo = settings.get("ammo", 10)
-            goal = settings.get("goal", 5)
-            magpie_count = max(1, settings.get("magpie_count", 1))
-            speed = max(1, settings.get("speed", 1))
-            round_time = max(5, settings.get("time", 30))
-            label = settings.get("label", "Facile")
-            tree_x = 55
-            tree_y = HEIGHT - 110 - 240//2 - 10
-            dog = Dog(x=tree_x + 150 + 18, y=HEIGHT - 170)
-            magpies = []
-            magpies_released = False
-            timer_start = None
-            running_round = True
-            game_over = False
-            win = False
-            timer_frozen = False
-            frozen_time_left = None
-
-            while running_round:
-                try:
-                    # --- Affichage des éléments graphiques principaux ---
-                    dessiner_fond(screen, background_img)
-                    dessiner_arbre(screen, tree_x, tree_y)
-                    dessiner_arbre(screen, WIDTH - 55 - 150, tree_y)
-                    # --- Affichage du chien et gestion du saut ---
-                    if not dog.jump_started:
-                        screen.blit(sheltie_img, (dog.x, dog.y))
-                        instruct_font = pygame.font.SysFont(None, 36)
-                        instruct = instruct_font.render("Cliquez sur le chien pour commencer !", True, (255,255,255))
-                        screen.blit(instruct, (WIDTH//2 - instruct.get_width()//2, HEIGHT//2))
-                    elif dog.jumping:
-                        jump_finished = dog.update_jump()
-                        screen.blit(sheltie_img, (dog.x, dog.get_jump_y()))
-                        if jump_finished:
-                            magpies_released = True
-                            timer_start = pygame.time.get_ticks()
-                    else:
-                        screen.blit(sheltie_img, (dog.x, dog.y))
-                    # --- Gestion des pies ---
-                    if magpies_released:
-                        if not magpies:
-                            magpies = [Magpie.create_random(speed, HEIGHT, MAGPIE_BODY_RADIUS) for _ in range(magpie_count)]
-                        for m in magpies:
-                            m.update(speed, WIDTH, HEIGHT, MAGPIE_BODY_RADIUS)
-                            if not m.flying_away:
-                                dessiner_pie(screen, m.get_position())
-                    # --- Affichage du viseur ---
-                    mx, my = pygame.mouse.get_pos()
-                    dessiner_viseur(screen, (mx, my))
-                    # --- Affichage du panneau d'état ---
-                    if magpies_released:
-                        if timer_frozen and frozen_time_left is not None:
-                            time_left = frozen_time_left
-                        else:
-                            elapsed = (pygame.time.get_ticks() - timer_start) // 1000 if timer_start else 0
-                            time_left = max(0, round_time - elapsed)
-                        stat_font = pygame.font.SysFont("Consolas", 28)
-                        label_font = pygame.font.SysFont("Montserrat", 28)
-                        dessiner_panneau_etat(
-                            screen, 10, 10, label, score, goal, ammo, time_left,
-                            bird_icon, ammo_icon, timer_icon,
-                            stat_font, label_font, obtenir_surface_panneau
-                        )
-                    # --- Gestion de la victoire/défaite ---
-                    if magpies_released:
-                        if verifie_victoire(score, goal):
-                            win = True
-                            game_over = True
-                            if not timer_frozen:
-                                frozen_time_left = time_left if time_left is not None else 0
-                                timer_frozen = True
-                        elif verifie_defaite(ammo, time_left):
-                            win = False
-                            game_over = True
-                            if not timer_frozen:
-                                frozen_time_left = time_left if time_left is not None else 0
-                                timer_frozen = True
-                    # --- Affichage du message de fin de partie ---
-                    if game_over:
-                        over_font = pygame.font.SysFont(None, 64, bold=True)
-                        msg = "Bravo ! Vous avez gagné !" if win else "Partie terminée !"
-                        over_text = over_font.render(msg, True, (255, 255, 255))
-                        screen.blit(over_text, (WIDTH//2 - over_text.get_width()//2, HEIGHT//2 - 40))
-                        sub_font = pygame.font.SysFont(None, 36)
-                        sub_text = sub_font.render("Cliquez pour revenir au menu principal", True, (255, 255, 255))
-                        screen.blit(sub_text, (WIDTH//2 - sub_text.get_width()//2, HEIGHT//2 + 30))
-                    # --- Gestion des événements de la partie ---
-                    for event in pygame.event.get():
-                        if event.type == pygame.QUIT:
-                            running = False
-                            running_round = False
-                        elif event.type == pygame.MOUSEBUTTONDOWN:
-                            mx, my = pygame.mouse.get_pos()
-                            if not dog.jump_started:
-                                if dog.is_clicked(mx, my, sheltie_img.get_width(), sheltie_img.get_height()):
-                                    if barking_sound:
-                                        barking_sound.play()
-                                    if ambiance_music_exists:
-                                        pygame.mixer.music.load(AMBIANCE_MUSIC_PATH)
-                                        pygame.mixer.music.play(-1)
-                                    dog.start_jump()
-                            if game_over:
-                                pygame.mixer.music.stop()
-                                running_round = False
-                                menu = True
-                                pygame.mouse.set_visible(True)
-                            elif magpies_released:
-                                if ammo > 0:
-                                    for m in magpies:
-                                        if m.check_hit(mx, my, MAGPIE_BODY_RADIUS):
-                                            score = calcule_score(score)
-                                            break
-                                    ammo = consomme_munition(ammo)
-                    pygame.display.flip()
-                    clock.tick(60)
-                except Exception as e:
-                    print(f"Erreur dans la boucle de manche : {e}")
-                    running_round = False
-        except (KeyError, ValueError, TypeError) as e:
-            print(f"Erreur de configuration de difficulté : {e}")
-            menu = True
-            continue
     # ========================================
     # Fin du jeu
     # ========================================
+    # Les images profilées pendant la session sont exportées pour être analysées hors du jeu
+    exporter_profil()
+    loader.shutdown()
     pygame.quit()
     sys.exit()
@@ -3,84 +3,127 @@
 # ========================================
 
 # ----- Imports -----
-from dataclasses import dataclass, field
-from typing import List, Tuple
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
 import math
 import random
 
+import numpy as np
+
+from flocking import FlockingRules
+from spatial import SpatialGrid
+
 # ==============================
 # Classe Magpie (entité oiseau)
 # ==============================
-@dataclass
+@dataclass(slots=True, init=False)
 class Magpie:
     """
     Représente une pie (oiseau) dans le jeu.
+    Les coordonnées sont des champs scalaires d'une classe à __slots__ (pas de __dict__ ni de listes par pie) ;
+    pos et vel restent disponibles sous forme de couples (x, y).
+    px, py gardent la position du pas précédent pour interpoler le rendu.
     """
-    pos: List[float] = field(default_factory=lambda: [0.0, 0.0])
-    vel: List[float] = field(default_factory=lambda: [0.0, 0.0])
-    flying_away: bool = False
-    fly_away_timer: int = 0
+    x: float
+    y: float
+    vx: float
+    vy: float
+    flying_away: bool
+    fly_away_timer: int
+    px: float
+    py: float
+
+    def __init__(
+        self,
+        pos: Tuple[float, float] = (0.0, 0.0),
+        vel: Tuple[float, float] = (0.0, 0.0),
+        flying_away: bool = False,
+        fly_away_timer: int = 0
+    ) -> None:
+        self.x, self.y = pos
+        self.px, self.py = pos
+        self.vx, self.vy = vel
+        self.flying_away = flying_away
+        self.fly_away_timer = fly_away_timer
+
+    @property
+    def pos(self) -> Tuple[float, float]:
+        return (self.x, self.y)
+
+    @pos.setter
+    def pos(self, value: Tuple[float, float]) -> None:
+        self.x, self.y = value
+
+    @property
+    def vel(self) -> Tuple[float, float]:
+        return (self.vx, self.vy)
+
+    @vel.setter
+    def vel(self, value: Tuple[float, float]) -> None:
+        self.vx, self.vy = value
 
     @classmethod
-    def create_random(cls, speed: float, screen_height: int, body_radius: int) -> "Magpie":
+    def create_random(cls, speed: float, screen_height: int, body_radius: int, rng=random) -> "Magpie":
         """
         Crée une pie avec une position et une vitesse aléatoires.
+        rng est le générateur utilisé (module random par défaut, random.Random(graine) pour une manche rejouable).
         """
         start_x = body_radius
-        start_y = random.randint(body_radius, screen_height - 150 - body_radius)
-        vx = speed * random.uniform(0.9, 1.2)
-        vy = random.uniform(-2, 2)
-        return cls(pos=[start_x, start_y], vel=[vx, vy])
+        start_y = rng.randint(body_radius, screen_height - 150 - body_radius)
+        vx = speed * rng.uniform(0.9, 1.2)
+        vy = rng.uniform(-2, 2)
+        return cls(pos=(start_x, start_y), vel=(vx, vy))
 
-    def update(self, speed: float, width: int, height: int, body_radius: int) -> None:
+    def update(self, speed: float, width: int, height: int, body_radius: int, rng=random) -> None:
         """
         Met à jour la position et l'état de la pie.
         """
         if self.flying_away:
-            self.pos[1] -= 12
+            self.y -= 12
             self.fly_away_timer -= 1
-            if self.pos[1] < -body_radius or self.fly_away_timer <= 0:
-                self._respawn(speed, width, height)
+            if self.y < -body_radius or self.fly_away_timer <= 0:
+                self._respawn(speed, width, height, rng)
         else:
-            self._move_and_bounce(speed, width, height, body_radius)
+            self._move_and_bounce(speed, width, height, body_radius, rng)
 
-    def _respawn(self, speed: float, width: int, height: int) -> None:
+    def _respawn(self, speed: float, width: int, height: int, rng=random) -> None:
         """
         Replace la pie à une nouvelle position aléatoire.
         """
-        self.pos[0] = random.randint(100, width - 100)
-        self.pos[1] = random.randint(200, height - 200)
-        direction_x = 1 if random.random() < 0.5 else -1
-        direction_y = 1 if random.random() < 0.5 else -1
-        self.vel[0] = speed * direction_x
-        self.vel[1] = speed * direction_y
+        self.x = self.px = rng.randint(100, width - 100)
+        self.y = self.py = rng.randint(200, height - 200)
+        direction_x = 1 if rng.random() < 0.5 else -1
+        direction_y = 1 if rng.random() < 0.5 else -1
+        self.vx = speed * direction_x
+        self.vy = speed * direction_y
         self.flying_away = False
 
-    def _move_and_bounce(self, speed: float, width: int, height: int, body_radius: int) -> None:
+    def _move_and_bounce(self, speed: float, width: int, height: int, body_radius: int, rng=random) -> None:
         """
         Déplace la pie et gère les rebonds sur les bords.
         """
-        self.pos[0] += self.vel[0]
-        self.pos[1] += self.vel[1]
+        self.px, self.py = self.x, self.y
+        x = self.x = self.x + self.vx
+        y = self.y = self.y + self.vy
         bounced = False
-        if self.pos[0] < body_radius or self.pos[0] > width - body_radius:
-            self.vel[0] *= -1
+        if x < body_radius or x > width - body_radius:
+            self.vx *= -1
             bounced = True
-        if self.pos[1] < body_radius or self.pos[1] > height - 150 - body_radius:
-            self.vel[1] *= -1
+        if y < body_radius or y > height - 150 - body_radius:
+            self.vy *= -1
             bounced = True
-        if bounced and self.vel[0] == 0:
-            self.vel[0] = speed * (1 if random.random() < 0.5 else -1)
-        if bounced and self.vel[1] == 0:
-            self.vel[1] = speed * (1 if random.random() < 0.5 else -1)
+        if bounced and self.vx == 0:
+            self.vx = speed * (1 if rng.random() < 0.5 else -1)
+        if bounced and self.vy == 0:
+            self.vy = speed * (1 if rng.random() < 0.5 else -1)
 
     def check_hit(self, mx: int, my: int, body_radius: int) -> bool:
         """
         Vérifie si la pie a été touchée par un clic.
         """
         if not self.flying_away:
-            dx = mx - self.pos[0]
-            dy = my - self.pos[1]
+            dx = mx - self.x
+            dy = my - self.y
             if dx * dx + dy * dy <= body_radius * body_radius:
                 self.flying_away = True
                 self.fly_away_timer = 30
@@ -91,12 +134,289 @@ class Magpie:
         """
         Retourne la position entière de la pie.
         """
-        return (int(self.pos[0]), int(self.pos[1]))
+        return (int(self.x), int(self.y))
+
+# ==================================================
+# Classe MagpieFlock (petite nuée, liste de Magpie)
+# ==================================================
+class MagpieFlock:
+    """
+    Petite nuée de pies gardée sous forme de liste de Magpie, avec la même interface que MagpieSwarm.
+    Pour quelques pies, le parcours scalaire coûte bien moins cher par pas que les opérations NumPy ;
+    les deux représentations donnent exactement les mêmes résultats avec le même générateur
+    (aux arrondis près en vol en nuée).
+    """
+
+    def __init__(self, magpies: List[Magpie] = None) -> None:
+        self.magpies = list(magpies) if magpies else []
+        self.flocking: Optional[FlockingRules] = None
+
+    def __len__(self) -> int:
+        return len(self.magpies)
+
+    @classmethod
+    def create_random(cls, count: int, speed: float, screen_height: int, body_radius: int, rng=random) -> "MagpieFlock":
+        """
+        Crée une nuée de pies aux positions et vitesses aléatoires.
+        """
+        return cls([Magpie.create_random(speed, screen_height, body_radius, rng) for _ in range(count)])
+
+    def to_magpies(self) -> List[Magpie]:
+        return self.magpies
+
+    def position(self, i: int) -> Tuple[int, int]:
+        """
+        Position entière de la pie d'indice i.
+        """
+        return self.magpies[i].get_position()
+
+    def update(self, speed: float, width: int, height: int, body_radius: int, rng=random) -> None:
+        """
+        Met à jour toutes les pies (un pas de simulation).
+        """
+        if self.flocking is not None:
+            self.flocking.steer_magpies(self.magpies, speed)
+        for m in self.magpies:
+            m.update(speed, width, height, body_radius, rng)
+
+    def hits_at(self, mx: float, my: float, body_radius: int) -> List[int]:
+        """
+        Indices des pies qui contiennent le point (mx, my), de la plus proche à la plus éloignée.
+        """
+        return self.within(mx, my, 0, body_radius)
+
+    def within(self, x: float, y: float, radius: float, body_radius: int) -> List[int]:
+        """
+        Indices des pies touchées par un disque de rayon radius, de la plus proche à la plus éloignée.
+        """
+        reach = radius + body_radius
+        reach2 = reach * reach
+        found = []
+        for i, m in enumerate(self.magpies):
+            if not m.flying_away:
+                dx = x - m.x
+                dy = y - m.y
+                dist2 = dx * dx + dy * dy
+                if dist2 <= reach2:
+                    found.append((dist2, i))
+        found.sort()
+        return [i for _, i in found]
+
+    def fly_away(self, indices: List[int]) -> None:
+        """
+        Fait s'envoler les pies indiquées.
+        """
+        for i in indices:
+            self.magpies[i].flying_away = True
+            self.magpies[i].fly_away_timer = 30
+
+    def check_hit(self, mx: int, my: int, body_radius: int) -> bool:
+        """
+        Vérifie si un clic touche une pie ; seule la pie dont le centre est le plus proche du clic s'envole.
+        """
+        hits = self.hits_at(mx, my, body_radius)
+        if not hits:
+            return False
+        self.fly_away(hits[:1])
+        return True
+
+    def visible(self, alpha: float = 1.0) -> List[Tuple[int, int, bool]]:
+        """
+        Retourne (x, y, vers_gauche) en entiers pour chaque pie qui n'est pas en train de s'envoler.
+        alpha < 1 interpole entre la position du pas précédent et la position actuelle.
+        """
+        shown = []
+        for m in self.magpies:
+            if not m.flying_away:
+                if alpha >= 1.0:
+                    x, y = m.x, m.y
+                else:
+                    x, y = m.px + (m.x - m.px) * alpha, m.py + (m.y - m.py) * alpha
+                shown.append((int(x), int(y), m.vx < 0))
+        return shown
+
+# ==================================================
+# Classe MagpieSwarm (nuée de pies, tableaux NumPy)
+# ==================================================
+class MagpieSwarm:
+    """
+    Nuée de pies stockée en structure de tableaux NumPy contigus
+    (positions, vitesses, états d'envol et minuteries).
+    Chaque étape (déplacement, rebonds, envol, réapparition) est appliquée
+    à toute la nuée d'un coup ; les tirages aléatoires sont faits pie par pie
+    dans l'ordre des indices, ce qui donne exactement les mêmes résultats
+    qu'une liste de Magpie mise à jour une par une avec le même générateur.
+    Les tirs interrogent une grille spatiale (SpatialGrid) resynchronisée au besoin
+    après chaque déplacement.
+    Si flocking (FlockingRules) est défini, les pies volent en nuée : les vitesses sont
+    ajustées selon les voisines et les arbres avant chaque déplacement.
+    """
+
+    def __init__(self, count: int = 0) -> None:
+        self.pos = np.zeros((count, 2), dtype=np.float64)
+        self.vel = np.zeros((count, 2), dtype=np.float64)
+        self.flying_away = np.zeros(count, dtype=bool)
+        self.fly_away_timer = np.zeros(count, dtype=np.int64)
+        self.prev_pos = np.zeros((count, 2), dtype=np.float64)
+        self.flocking: Optional[FlockingRules] = None
+        self._grid = None
+        self._grid_stale = True
+
+    def __len__(self) -> int:
+        return len(self.flying_away)
+
+    @classmethod
+    def create_random(cls, count: int, speed: float, screen_height: int, body_radius: int, rng=random) -> "MagpieSwarm":
+        """
+        Crée une nuée de pies aux positions et vitesses aléatoires (mêmes tirages que Magpie.create_random).
+        """
+        return cls.from_magpies([Magpie.create_random(speed, screen_height, body_radius, rng) for _ in range(count)])
+
+    @classmethod
+    def from_magpies(cls, magpies: List[Magpie]) -> "MagpieSwarm":
+        """
+        Construit une nuée à partir d'une liste de Magpie.
+        """
+        swarm = cls(len(magpies))
+        for i, m in enumerate(magpies):
+            swarm.pos[i] = m.pos
+            swarm.vel[i] = m.vel
+            swarm.flying_away[i] = m.flying_away
+            swarm.fly_away_timer[i] = m.fly_away_timer
+        swarm.prev_pos[:] = swarm.pos
+        return swarm
+
+    def to_magpies(self) -> List[Magpie]:
+        """
+        Retourne la nuée sous forme de liste de Magpie.
+        """
+        return [
+            Magpie(pos=p, vel=v, flying_away=f, fly_away_timer=t)
+            for p, v, f, t in zip(self.pos.tolist(), self.vel.tolist(),
+                                  self.flying_away.tolist(), self.fly_away_timer.tolist())
+        ]
+
+    def update(self, speed: float, width: int, height: int, body_radius: int, rng=random) -> None:
+        """
+        Met à jour la position et l'état de toutes les pies (un pas de simulation).
+        """
+        self.prev_pos[:] = self.pos
+        flying = self.flying_away.copy()
+        moving = ~flying
+        # --- Envol des pies touchées ---
+        self.pos[flying, 1] -= 12
+        self.fly_away_timer[flying] -= 1
+        respawn = flying & ((self.pos[:, 1] < -body_radius) | (self.fly_away_timer <= 0))
+        # --- Vol en nuée, puis déplacement et rebonds sur les bords ---
+        if self.flocking is not None:
+            self.flocking.steer(self.pos, self.vel, moving, speed)
+        self.pos[moving] += self.vel[moving]
+        x, y = self.pos[:, 0], self.pos[:, 1]
+        bounce_x = moving & ((x < body_radius) | (x > width - body_radius))
+        bounce_y = moving & ((y < body_radius) | (y > height - 150 - body_radius))
+        self.vel[bounce_x, 0] *= -1
+        self.vel[bounce_y, 1] *= -1
+        stalled = (bounce_x | bounce_y) & ((self.vel[:, 0] == 0) | (self.vel[:, 1] == 0))
+        # --- Tirages aléatoires, dans l'ordre des indices comme le parcours scalaire ---
+        drawn = np.flatnonzero(respawn | stalled)
+        if drawn.size:
+            self._draw_random(drawn.tolist(), respawn, speed, width, height, rng)
+        self._grid_stale = True
+
+    def _draw_random(self, indices: List[int], respawn: "np.ndarray", speed: float, width: int, height: int, rng=random) -> None:
+        """
+        Effectue les tirages des réapparitions et des relances de vitesse nulle,
+        puis applique les réapparitions en une seule affectation.
+        """
+        respawned, new_pos, new_vel = [], [], []
+        for i in indices:
+            if respawn[i]:
+                new_x = rng.randint(100, width - 100)
+                new_y = rng.randint(200, height - 200)
+                direction_x = 1 if rng.random() < 0.5 else -1
+                direction_y = 1 if rng.random() < 0.5 else -1
+                respawned.append(i)
+                new_pos.append((new_x, new_y))
+                new_vel.append((speed * direction_x, speed * direction_y))
+            else:
+                if self.vel[i, 0] == 0:
+                    self.vel[i, 0] = speed * (1 if rng.random() < 0.5 else -1)
+                if self.vel[i, 1] == 0:
+                    self.vel[i, 1] = speed * (1 if rng.random() < 0.5 else -1)
+        if respawned:
+            self.pos[respawned] = new_pos
+            # Une réapparition est une téléportation : pas d'interpolation depuis l'ancienne position
+            self.prev_pos[respawned] = new_pos
+            self.vel[respawned] = new_vel
+            self.flying_away[respawned] = False
+
+    def spatial_grid(self, body_radius: int) -> SpatialGrid:
+        """
+        Retourne la grille des pies qui ne s'envolent pas, synchronisée avec les positions actuelles.
+        """
+        if self._grid is None or self._grid.body_radius != body_radius:
+            self._grid = SpatialGrid(body_radius)
+            self._grid_stale = True
+        if self._grid_stale:
+            self._grid.sync(self.pos, ~self.flying_away)
+            self._grid_stale = False
+        return self._grid
+
+    def position(self, i: int) -> Tuple[int, int]:
+        """
+        Position entière de la pie d'indice i.
+        """
+        return int(self.pos[i, 0]), int(self.pos[i, 1])
+
+    def hits_at(self, mx: float, my: float, body_radius: int) -> List[int]:
+        """
+        Indices des pies qui contiennent le point (mx, my), de la plus proche à la plus éloignée.
+        """
+        return self.spatial_grid(body_radius).query_point(mx, my)
+
+    def within(self, x: float, y: float, radius: float, body_radius: int) -> List[int]:
+        """
+        Indices des pies touchées par un disque de rayon radius (tir de zone), de la plus proche à la plus éloignée.
+        """
+        return self.spatial_grid(body_radius).query_radius(x, y, radius)
+
+    def fly_away(self, indices: List[int]) -> None:
+        """
+        Fait s'envoler les pies indiquées.
+        """
+        self.flying_away[indices] = True
+        self.fly_away_timer[indices] = 30
+        self._grid_stale = True
+
+    def check_hit(self, mx: int, my: int, body_radius: int) -> bool:
+        """
+        Vérifie si un clic touche une pie ; seule la pie dont le centre est le plus proche du clic s'envole.
+        """
+        hits = self.hits_at(mx, my, body_radius)
+        if not hits:
+            return False
+        self.fly_away(hits[:1])
+        return True
+
+    def visible(self, alpha: float = 1.0) -> List[Tuple[int, int, bool]]:
+        """
+        Retourne (x, y, vers_gauche) en entiers pour chaque pie qui n'est pas en train de s'envoler.
+        alpha < 1 interpole entre la position du pas précédent et la position actuelle.
+        """
+        shown = ~self.flying_away
+        if alpha >= 1.0:
+            positions = self.pos[shown]
+        else:
+            previous = self.prev_pos[shown]
+            positions = previous + (self.pos[shown] - previous) * alpha
+        positions = positions.astype(np.int64)
+        facing_left = self.vel[shown, 0] < 0
+        return list(zip(positions[:, 0].tolist(), positions[:, 1].tolist(), facing_left.tolist()))
 
 # ===========================
 # Classe Dog (entité chien)
 # ===========================
-@dataclass
+@dataclass(slots=True)
 class Dog:
     """
     Représente le chien dans le jeu.
@@ -105,8 +425,9 @@ class Dog:
     y: int
     jump_phase: float = 0.0
     jumping: bool = False
-    jump_total: float = field(default_factory=lambda: math.pi)
+    jump_total: float = math.pi
     jump_started: bool = False
+    prev_jump_phase: float = 0.0
 
     def start_jump(self) -> None:
         """
@@ -115,24 +436,30 @@ class Dog:
         self.jump_started = True
         self.jumping = True
         self.jump_phase = 0.0
+        self.prev_jump_phase = 0.0
 
     def update_jump(self) -> bool:
         """
         Met à jour le saut du chien.
         """
         if self.jumping:
+            self.prev_jump_phase = self.jump_phase
             self.jump_phase += 0.07
             if self.jump_phase >= self.jump_total:
                 self.jumping = False
                 return True
         return False
 
-    def get_jump_y(self) -> int:
+    def get_jump_y(self, alpha: float = 1.0) -> int:
         """
         Retourne la position Y du chien pendant le saut.
+        alpha < 1 interpole la phase entre le pas précédent et le pas actuel.
         """
         if self.jumping:
-            return self.y - int(30 * abs(math.sin(self.jump_phase)))
+            phase = self.jump_phase
+            if alpha < 1.0:
+                phase = self.prev_jump_phase + (self.jump_phase - self.prev_jump_phase) * alpha
+            return self.y - int(30 * abs(math.sin(phase)))
         return self.y
 
     def is_clicked(self, mx: int, my: int, img_width: int, img_height: int) -> bool:
@@ -0,0 +1,47 @@
+# ==================================================
+# Événements de la fenêtre : attente passive et suivi du focus
+# ==================================================
+# Séparé de utils pour que la simulation (session, relectures, équilibrage) n'importe pas pygame.
+
+# ----- Imports -----
+import pygame
+
+
+def attendre_evenements(delai_ms=0):
+    """
+    Bloque jusqu'au prochain événement (au plus delai_ms millisecondes si delai_ms > 0)
+    et retourne tous les événements en attente. Le processus dort pendant l'attente.
+    """
+    premier = pygame.event.wait(delai_ms)
+    evenements = [] if premier.type == pygame.NOEVENT else [premier]
+    evenements.extend(pygame.event.get())
+    return evenements
+
+class EtatFenetre:
+    """
+    Suit le focus et la réduction de la fenêtre à partir des événements SDL.
+    active est faux quand la fenêtre n'a plus le focus ou qu'elle est réduite.
+    """
+
+    # Événements après lesquels l'image affichée doit être entièrement redessinée
+    _A_REDESSINER = (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.WINDOWSHOWN, pygame.WINDOWFOCUSGAINED)
+
+    def __init__(self):
+        self.focus = True
+        self.reduite = False
+
+    @property
+    def active(self):
+        return self.focus and not self.reduite
+
+    def traiter(self, evenement):
+        """Met l'état à jour ; retourne True si l'écran doit être redessiné."""
+        if evenement.type == pygame.WINDOWFOCUSLOST:
+            self.focus = False
+        elif evenement.type == pygame.WINDOWFOCUSGAINED:
+            self.focus = True
+        elif evenement.type in (pygame.WINDOWMINIMIZED, pygame.WINDOWHIDDEN):
+            self.reduite = True
+        elif evenement.type in (pygame.WINDOWRESTORED, pygame.WINDOWSHOWN, pygame.WINDOWMAXIMIZED):
+            self.reduite = False
+        return evenement.type in self._A_REDESSINER
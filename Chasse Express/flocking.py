@@ -0,0 +1,157 @@
+# ==================================================
+# Vol en nuée (boids) : séparation, alignement, cohésion, évitement des arbres
+# ==================================================
+
+# ----- Imports -----
+import math
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+from spatial import neighbor_pairs
+from settings import TREE_OBSTACLES
+
+# ==============================
+# Classe FlockingRules
+# ==============================
+@dataclass(frozen=True)
+class FlockingRules:
+    """
+    Règles de vol en nuée appliquées aux vitesses avant chaque déplacement.
+    steer() sert aux grandes nuées en tableaux : les voisines (à moins de radius) sont trouvées
+    par grille uniforme (spatial.neighbor_pairs) et les forces sont sommées par tableaux NumPy.
+    steer_magpies() sert aux petites listes de Magpie : comparer chaque couple y coûte moins
+    que les opérations NumPy. Les deux calculs sont identiques aux arrondis près de l'ordre des sommes.
+    Aucun tirage aléatoire : les manches restent rejouables à l'identique.
+    Les poids sont exprimés en fraction de la vitesse de la difficulté par pas.
+    """
+    radius: float = 110.0                 # rayon de perception des voisines (px)
+    separation_radius: float = 70.0       # distance en dessous de laquelle deux pies s'écartent (px)
+    separation: float = 0.3
+    alignment: float = 0.05
+    cohesion: float = 0.02
+    avoidance: float = 0.25
+    avoidance_margin: float = 60.0        # distance d'anticipation autour des obstacles (px)
+    obstacles: Tuple[Tuple[float, float, float], ...] = TREE_OBSTACLES
+    min_speed: float = 0.6                # bornes de la norme de la vitesse, en multiples de speed
+    max_speed: float = 1.4
+
+    @classmethod
+    def from_setting(cls, value) -> "FlockingRules":
+        """
+        Construit les règles à partir de la clé "flocking" d'un préréglage : True ou un dict de paramètres.
+        """
+        return cls(**value) if isinstance(value, dict) else cls()
+
+    def steer(self, pos: "np.ndarray", vel: "np.ndarray", active: "np.ndarray", speed: float) -> None:
+        """
+        Modifie en place les vitesses (n, 2) des pies actives selon leurs voisines et les obstacles.
+        """
+        count = len(pos)
+        first, second = neighbor_pairs(pos, active, self.radius)
+        if first.size:
+            delta = pos[second] - pos[first]
+            dist = np.sqrt((delta * delta).sum(axis=1))
+            neighbors = np.bincount(first, minlength=count).astype(np.float64)
+            has = neighbors > 0
+            # --- Alignement : vers la vitesse moyenne des voisines ---
+            mean_vx = np.bincount(first, weights=vel[second, 0], minlength=count)
+            mean_vy = np.bincount(first, weights=vel[second, 1], minlength=count)
+            vel[has, 0] += (mean_vx[has] / neighbors[has] - vel[has, 0]) * self.alignment
+            vel[has, 1] += (mean_vy[has] / neighbors[has] - vel[has, 1]) * self.alignment
+            # --- Cohésion : vers le centre des voisines ---
+            center_x = np.bincount(first, weights=delta[:, 0], minlength=count)
+            center_y = np.bincount(first, weights=delta[:, 1], minlength=count)
+            scale = self.cohesion * speed / self.radius
+            vel[has, 0] += center_x[has] / neighbors[has] * scale
+            vel[has, 1] += center_y[has] / neighbors[has] * scale
+            # --- Séparation : s'écarter des voisines trop proches, d'autant plus qu'elles sont près ---
+            close = dist < self.separation_radius
+            if close.any():
+                weight = (1.0 - dist[close] / self.separation_radius) / np.maximum(dist[close], 1e-6)
+                push_x = np.bincount(first[close], weights=-delta[close, 0] * weight, minlength=count)
+                push_y = np.bincount(first[close], weights=-delta[close, 1] * weight, minlength=count)
+                vel[:, 0] += push_x * self.separation * speed
+                vel[:, 1] += push_y * self.separation * speed
+        # --- Évitement des obstacles (arbres) : s'éloigner, et virer de côté si l'obstacle est devant ---
+        for ox, oy, radius in self.obstacles:
+            away = pos - (ox, oy)
+            dist = np.sqrt((away * away).sum(axis=1))
+            near = np.flatnonzero(active & (dist < radius + self.avoidance_margin))
+            if near.size:
+                away, dist, v = away[near], np.maximum(dist[near], 1e-6), vel[near]
+                strength = np.minimum(1.0, 1.0 - (dist - radius) / self.avoidance_margin) * self.avoidance * speed
+                push = away / dist[:, None]
+                # Perpendiculaire à la vitesse, du côté où se trouve déjà la pie
+                side = np.stack((-v[:, 1], v[:, 0]), axis=1) / np.maximum(np.sqrt((v * v).sum(axis=1)), 1e-9)[:, None]
+                side *= np.where((side * away).sum(axis=1) >= 0, 1.0, -1.0)[:, None]
+                ahead = (v * away).sum(axis=1) < 0
+                push[ahead] += side[ahead]
+                vel[near] += push * strength[:, None]
+        # --- Norme de la vitesse gardée entre min_speed et max_speed fois speed ---
+        norm = np.sqrt((vel[active] ** 2).sum(axis=1))
+        limited = np.clip(norm, self.min_speed * speed, self.max_speed * speed)
+        vel[active] *= (limited / np.maximum(norm, 1e-9))[:, None]
+
+    def steer_magpies(self, magpies: List["Magpie"], speed: float) -> None:
+        """
+        Même calcul que steer() sur une liste de Magpie, pie par pie ;
+        les nouvelles vitesses ne sont appliquées qu'une fois toutes calculées.
+        """
+        active = [m for m in magpies if not m.flying_away]
+        radius2 = self.radius * self.radius
+        separation_radius = self.separation_radius
+        cohesion = self.cohesion * speed / self.radius
+        low, high = self.min_speed * speed, self.max_speed * speed
+        steered = []
+        for m in active:
+            count = 0
+            center_x = center_y = mean_vx = mean_vy = push_x = push_y = 0.0
+            for other in active:
+                if other is m:
+                    continue
+                dx = other.x - m.x
+                dy = other.y - m.y
+                dist2 = dx * dx + dy * dy
+                if dist2 <= radius2:
+                    count += 1
+                    center_x += dx
+                    center_y += dy
+                    mean_vx += other.vx
+                    mean_vy += other.vy
+                    dist = math.sqrt(dist2)
+                    if dist < separation_radius:
+                        weight = (1.0 - dist / separation_radius) / max(dist, 1e-6)
+                        push_x -= dx * weight
+                        push_y -= dy * weight
+            vx, vy = m.vx, m.vy
+            if count:
+                vx += (mean_vx / count - vx) * self.alignment
+                vy += (mean_vy / count - vy) * self.alignment
+                vx += center_x / count * cohesion
+                vy += center_y / count * cohesion
+                vx += push_x * self.separation * speed
+                vy += push_y * self.separation * speed
+            for ox, oy, radius in self.obstacles:
+                away_x, away_y = m.x - ox, m.y - oy
+                dist = math.sqrt(away_x * away_x + away_y * away_y)
+                if dist < radius + self.avoidance_margin:
+                    strength = min(1.0, 1.0 - (dist - radius) / self.avoidance_margin) * self.avoidance * speed
+                    dist = max(dist, 1e-6)
+                    push_x, push_y = away_x / dist, away_y / dist
+                    if vx * away_x + vy * away_y < 0:
+                        norm = max(math.sqrt(vx * vx + vy * vy), 1e-9)
+                        side_x, side_y = -vy / norm, vx / norm
+                        if side_x * away_x + side_y * away_y < 0:
+                            side_x, side_y = -side_x, -side_y
+                        push_x += side_x
+                        push_y += side_y
+                    vx += push_x * strength
+                    vy += push_y * strength
+            norm = math.sqrt(vx * vx + vy * vy)
+            limited = min(max(norm, low), high)
+            factor = limited / max(norm, 1e-9)
+            steered.append((m, vx * factor, vy * factor))
+        for m, vx, vy in steered:
+            m.vx, m.vy = vx, vy
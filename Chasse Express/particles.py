@@ -0,0 +1,237 @@
+# ==================================================
+# Système de particules à capacité fixe (plumes, éclairs, points gagnés)
+# ==================================================
+
+# ----- Imports -----
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+
+from settings import PARTICLE_CAPACITY
+
+# ==============================
+# Sortes de particules
+# ==============================
+KIND_FEATHER_BLACK = 0
+KIND_FEATHER_WHITE = 1
+KIND_FEATHER_BLUE = 2
+KIND_FLASH = 3
+KIND_POPUP = 4
+KIND_COUNT = 5
+
+# Niveaux d'estompage : une particule est dessinée avec le sprite de sa sorte et de son niveau
+FADE_LEVELS = 8
+
+def sprite_code(kind: int, level: int) -> int:
+    """
+    Index du sprite d'une sorte de particule à un niveau d'estompage.
+    """
+    return kind * FADE_LEVELS + level
+
+# ==============================
+# Classe ParticleSystem
+# ==============================
+class ParticleSystem:
+    """
+    Particules stockées dans des tableaux NumPy préalloués de taille fixe ; les emplacements
+    libres sont tenus dans une pile d'indices, si bien qu'émettre et mettre à jour n'allouent
+    aucun objet par particule. Les mises à jour sont vectorisées sur toute la capacité.
+    Les emplacements vivants sont aussi rangés par date de fin de vie : les particules expirées
+    forment toujours un préfixe de cette liste, qu'une recherche dichotomique délimite.
+    update() et visible() n'allouent ainsi aucun tableau par image : ils travaillent sur des vues
+    de cette liste et écrivent codes et positions dans des tampons préalloués. Seule l'émission,
+    qui fusionne les nouvelles particules dans la liste, alloue.
+    Les émissions qui dépassent la capacité sont tronquées et comptées dans overflow.
+    Purement décoratif : le générateur aléatoire est distinct de celui de la manche,
+    les relectures restent donc exactes.
+    """
+
+    def __init__(self, capacity: int = PARTICLE_CAPACITY, seed: Optional[int] = None) -> None:
+        self.capacity = capacity
+        self.rng = np.random.default_rng(seed)
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        # Horloge des particules (s) et date de naissance de chaque particule sur cette horloge
+        self.clock = 0.0
+        self.birth = np.zeros(capacity)
+        self.gravity = np.zeros(capacity)
+        self.drag = np.ones(capacity)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        # Calculés à l'émission : premier code de sprite de la sorte, niveaux d'estompage par seconde
+        self.code_base = np.zeros(capacity)
+        self.fade_rate = np.zeros(capacity)
+        self.alive = np.zeros(capacity, dtype=bool)
+        # Pile des emplacements libres : les _free_count premiers indices de _free
+        self._free = np.arange(capacity - 1, -1, -1, dtype=np.int32)
+        self._free_count = capacity
+        # Emplacements vivants triés par date de fin de vie : _order[_head:_head + len(self)]
+        self._order = np.zeros(capacity, dtype=np.intp)
+        self._deaths = np.zeros(capacity)
+        self._head = 0
+        # Tampons réutilisés à chaque mise à jour et à chaque appel de visible()
+        self._scratch = np.zeros(capacity)
+        self._level = np.zeros(capacity)
+        self._codes = np.zeros(capacity, dtype=np.int64)
+        self._xs = np.zeros(capacity)
+        self._ys = np.zeros(capacity)
+        self.emitted = 0
+        self.overflow = 0
+        self.peak = 0
+
+    def __len__(self) -> int:
+        return self.capacity - self._free_count
+
+    def emit(
+        self,
+        kind,
+        x: float,
+        y: float,
+        count: int,
+        speed: Tuple[float, float],
+        life: Tuple[float, float],
+        gravity: float = 0.0,
+        drag: float = 1.0,
+        direction: float = -math.pi / 2,
+        spread: float = 2 * math.pi
+    ) -> int:
+        """
+        Émet count particules en (x, y) et retourne le nombre réellement émis.
+        kind est une sorte ou un tableau de sortes (une par particule) ;
+        speed (px/s) et life (s) sont des bornes (min, max) tirées uniformément ;
+        direction et spread (radians) délimitent le cône d'émission ;
+        gravity est en px/s², drag est la fraction de vitesse conservée par seconde.
+        """
+        n = min(count, self._free_count)
+        self.overflow += count - n
+        if n <= 0:
+            return 0
+        alive = len(self)
+        self._free_count -= n
+        slots = self._free[self._free_count:self._free_count + n].astype(np.intp)
+        angle = direction + (self.rng.random(n) - 0.5) * spread
+        norm = self.rng.uniform(speed[0], speed[1], n)
+        self.x[slots] = x
+        self.y[slots] = y
+        self.vx[slots] = np.cos(angle) * norm
+        self.vy[slots] = np.sin(angle) * norm
+        lives = self.rng.uniform(life[0], life[1], n)
+        self.birth[slots] = self.clock
+        self.fade_rate[slots] = FADE_LEVELS / lives
+        self.gravity[slots] = gravity
+        self.drag[slots] = drag
+        self.kind[slots] = kind if np.ndim(kind) == 0 else np.asarray(kind)[:n]
+        self.code_base[slots] = self.kind[slots] * FADE_LEVELS
+        self.alive[slots] = True
+        # Fusion dans la liste triée par date de fin de vie, ramenée en tête des tampons
+        head = self._head
+        deaths = np.concatenate((self._deaths[head:head + alive], self.clock + lives))
+        order = np.concatenate((self._order[head:head + alive], slots))
+        rang = np.argsort(deaths, kind="stable")
+        self._deaths[:alive + n] = deaths[rang]
+        self._order[:alive + n] = order[rang]
+        self._head = 0
+        self.emitted += n
+        self.peak = max(self.peak, len(self))
+        return n
+
+    # ----- Effets du jeu -----
+
+    def feather_burst(self, x: float, y: float, count: int) -> int:
+        """
+        Gerbe de plumes noires, blanches et bleues d'une pie touchée, qui retombent en ralentissant.
+        """
+        kinds = self.rng.choice(
+            (KIND_FEATHER_BLACK, KIND_FEATHER_WHITE, KIND_FEATHER_BLUE), size=count, p=(0.5, 0.35, 0.15)
+        )
+        return self.emit(kinds, x, y, count, speed=(60.0, 420.0), life=(0.7, 1.6), gravity=260.0, drag=0.12)
+
+    def muzzle_flash(self, x: float, y: float) -> int:
+        """
+        Bref éclair au point visé par un tir.
+        """
+        return self.emit(KIND_FLASH, x, y, 10, speed=(20.0, 160.0), life=(0.06, 0.14), drag=0.01)
+
+    def score_popup(self, x: float, y: float) -> int:
+        """
+        « +1 » qui monte depuis la pie touchée.
+        """
+        return self.emit(KIND_POPUP, x, y, 1, speed=(90.0, 90.0), life=(0.8, 0.8), drag=0.3, spread=0.0)
+
+    # ----- Simulation -----
+
+    def update(self, dt: float) -> None:
+        """
+        Avance toutes les particules de dt secondes et libère celles arrivées en fin de vie.
+        """
+        if self._free_count == self.capacity or dt <= 0:
+            return
+        scratch = self._scratch
+        np.power(self.drag, dt, out=scratch)
+        self.vx *= scratch
+        self.vy *= scratch
+        np.multiply(self.gravity, dt, out=scratch)
+        self.vy += scratch
+        np.multiply(self.vx, dt, out=scratch)
+        self.x += scratch
+        np.multiply(self.vy, dt, out=scratch)
+        self.y += scratch
+        self.clock += dt
+        head, tail = self._head, self._head + len(self)
+        count = int(self._deaths[head:tail].searchsorted(self.clock, side="right"))
+        if count:
+            self._release(self._order[head:head + count])
+            self._head = head + count
+
+    def _release(self, slots: np.ndarray) -> None:
+        """
+        Rend des emplacements à la pile des emplacements libres.
+        """
+        self.alive[slots] = False
+        self.vx[slots] = 0.0
+        self.vy[slots] = 0.0
+        self.gravity[slots] = 0.0
+        self._free[self._free_count:self._free_count + len(slots)] = slots
+        self._free_count += len(slots)
+
+    def clear(self) -> None:
+        """
+        Supprime toutes les particules (les compteurs sont conservés).
+        """
+        self._release(self._order[self._head:self._head + len(self)])
+        self._head = 0
+
+    def visible(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Retourne (codes de sprite, x, y) des particules vivantes, dans l'ordre de leur fin de vie ;
+        le niveau d'estompage suit l'âge.
+        Les trois tableaux sont des vues sur des tampons internes, valables jusqu'au prochain appel.
+        """
+        count = len(self)
+        slots = self._order[self._head:self._head + count]
+        # Les indices ne sortent jamais de la capacité : mode="clip" évite la copie tampon de take
+        level = self.birth.take(slots, out=self._level[:count], mode="clip")
+        np.subtract(self.clock, level, out=level)
+        level *= self.fade_rate.take(slots, out=self._scratch[:count], mode="clip")
+        np.minimum(level, FADE_LEVELS - 1, out=level)
+        level += self.code_base.take(slots, out=self._scratch[:count], mode="clip")
+        codes = self._codes[:count]
+        # Valeurs positives : la troncature vers zéro est la partie entière
+        np.copyto(codes, level, casting="unsafe")
+        xs = self.x.take(slots, out=self._xs[:count], mode="clip")
+        ys = self.y.take(slots, out=self._ys[:count], mode="clip")
+        return codes, xs, ys
+
+    def stats(self) -> dict:
+        """
+        Capacité, particules vivantes, pic, émissions et émissions perdues faute de place.
+        """
+        return {
+            "capacity": self.capacity,
+            "alive": len(self),
+            "peak": self.peak,
+            "emitted": self.emitted,
+            "overflow": self.overflow,
+        }
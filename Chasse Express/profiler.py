@@ -0,0 +1,297 @@
+# ==================================================
+# Profileur d'images : durée de chaque phase des boucles du menu et des manches
+# ==================================================
+# Les durées sont relevées par tours de chronomètre (time.perf_counter) : chaque marque attribue
+# le temps écoulé depuis la marque précédente à une phase. Les images terminées sont rangées
+# dans un tampon circulaire NumPy préalloué ; inactif, chaque appel se réduit à un test.
+# F3 affiche la superposition (et lance l'enregistrement), F4 exporte les images en CSV et JSON.
+
+# ----- Imports -----
+import json
+import os
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+import pygame
+
+from settings import PROFILER_ENABLED, PROFILER_FRAMES, PROFILER_WINDOW, PROFILE_DIR, WIDTH
+
+# ==============================
+# Phases et écrans
+# ==============================
+# Le fond et les arbres forment un seul calque pré-composé ; le chien et les pies
+# sont dessinés par un seul appel groupé depuis l'atlas (phase "sprites").
+PHASES = (
+    "evenements", "fond", "simulation", "sprites", "particules", "viseur",
+    "panneau", "textes", "boutons", "superposition", "affichage"
+)
+ECRANS = ("menu", "manche")
+
+TOUCHE_SUPERPOSITION = pygame.K_F3
+TOUCHE_EXPORT = pygame.K_F4
+
+# ==============================
+# Classe ProfileurImages
+# ==============================
+class ProfileurImages:
+    """
+    Enregistre, image par image, le temps passé dans chaque phase.
+    debut_image() démarre le chronomètre, marquer(phase) clôt une phase, fin_image(ecran) range l'image.
+    Le tampon garde les capacite dernières images : durées par phase, durée totale,
+    instant de début (intervalle entre images) et écran.
+    """
+
+    def __init__(self, phases: tuple = PHASES, capacite: int = PROFILER_FRAMES, actif: bool = False) -> None:
+        self.phases = tuple(phases)
+        self.capacite = capacite
+        self.actif = actif
+        self._colonnes = {phase: i for i, phase in enumerate(self.phases)}
+        self.durees = np.zeros((capacite, len(self.phases)))
+        self.totaux = np.zeros(capacite)
+        self.debuts = np.zeros(capacite)
+        self.ecrans = np.zeros(capacite, dtype=np.int8)
+        self.suivante = 0       # ligne du tampon écrite par la prochaine image
+        self.nombre = 0         # images présentes dans le tampon (au plus capacite)
+        self.images = 0         # images enregistrées depuis le lancement
+        self._courante = [0.0] * len(self.phases)
+        self._debut = 0.0
+        self._marque = 0.0
+
+    def debut_image(self) -> None:
+        """
+        Démarre (ou redémarre, après une attente à ne pas compter) le chronométrage d'une image.
+        """
+        if not self.actif:
+            return
+        self._debut = self._marque = time.perf_counter()
+        self._courante = [0.0] * len(self.phases)
+
+    def marquer(self, phase: str) -> None:
+        """
+        Attribue à phase le temps écoulé depuis la marque précédente.
+        """
+        if not self.actif:
+            return
+        maintenant = time.perf_counter()
+        self._courante[self._colonnes[phase]] += maintenant - self._marque
+        self._marque = maintenant
+
+    def fin_image(self, ecran: str) -> None:
+        """
+        Range l'image courante dans le tampon ; ignorée si elle n'a pas été démarrée.
+        """
+        if not self.actif or not self._debut:
+            return
+        i = self.suivante
+        self.durees[i] = self._courante
+        self.totaux[i] = time.perf_counter() - self._debut
+        self.debuts[i] = self._debut
+        self.ecrans[i] = ECRANS.index(ecran)
+        self.suivante = (i + 1) % self.capacite
+        self.nombre = min(self.nombre + 1, self.capacite)
+        self.images += 1
+        self._debut = 0.0
+
+    def vider(self) -> None:
+        """
+        Oublie les images enregistrées.
+        """
+        self.suivante = self.nombre = 0
+
+    def _ordre(self, dernieres: Optional[int] = None) -> np.ndarray:
+        """
+        Lignes du tampon des dernieres images (toutes par défaut), de la plus ancienne à la plus récente.
+        """
+        n = self.nombre if dernieres is None else min(dernieres, self.nombre)
+        return np.arange(self.suivante - n, self.suivante) % self.capacite
+
+    def statistiques(self, dernieres: int = PROFILER_WINDOW) -> dict:
+        """
+        Moyenne, 95e centile et maximum (ms) de chaque phase et du total sur les dernieres images,
+        ainsi que la pire image et sa phase la plus longue.
+        """
+        lignes = self._ordre(dernieres)
+        if not len(lignes):
+            return {"images": 0, "phases": {}, "total": None, "pire": None}
+        durees = self.durees[lignes] * 1e3
+        totaux = self.totaux[lignes] * 1e3
+
+        def resume(valeurs: np.ndarray) -> dict:
+            return {
+                "moyenne": float(valeurs.mean()),
+                "p95": float(np.percentile(valeurs, 95)),
+                "max": float(valeurs.max()),
+            }
+
+        pire = int(totaux.argmax())
+        return {
+            "images": len(lignes),
+            "phases": {phase: resume(durees[:, j]) for j, phase in enumerate(self.phases)},
+            "total": resume(totaux),
+            "pire": {
+                "total": float(totaux[pire]),
+                "phase": self.phases[int(durees[pire].argmax())],
+                "ecran": ECRANS[self.ecrans[lignes[pire]]],
+            },
+        }
+
+    # ----- Export -----
+
+    def echantillons(self) -> list:
+        """
+        Images du tampon, de la plus ancienne à la plus récente : instant de début (s, depuis
+        la plus ancienne), intervalle depuis l'image précédente, total et phases (ms), écran.
+        """
+        lignes = self._ordre()
+        if not len(lignes):
+            return []
+        debuts = self.debuts[lignes]
+        intervalles = np.diff(debuts, prepend=debuts[0]) * 1e3
+        images = []
+        for k, i in enumerate(lignes):
+            image = {
+                "image": self.images - len(lignes) + k,
+                "debut_s": round(float(debuts[k] - debuts[0]), 6),
+                "intervalle_ms": round(float(intervalles[k]), 4),
+                "ecran": ECRANS[self.ecrans[i]],
+                "total_ms": round(float(self.totaux[i] * 1e3), 4),
+            }
+            for j, phase in enumerate(self.phases):
+                image[phase + "_ms"] = round(float(self.durees[i, j] * 1e3), 4)
+            images.append(image)
+        return images
+
+    def exporter_csv(self, chemin: str) -> None:
+        """
+        Écrit une ligne par image dans un fichier CSV.
+        """
+        import csv
+        colonnes = ["image", "debut_s", "intervalle_ms", "ecran", "total_ms"] + [p + "_ms" for p in self.phases]
+        with open(chemin, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=colonnes)
+            writer.writeheader()
+            writer.writerows(self.echantillons())
+
+    def exporter_json(self, chemin: str) -> None:
+        """
+        Écrit le résumé de toutes les images du tampon et les images elles-mêmes dans un fichier JSON.
+        """
+        with open(chemin, "w", encoding="utf-8") as f:
+            json.dump({
+                "phases": list(self.phases),
+                "resume": self.statistiques(self.nombre),
+                "images": self.echantillons(),
+            }, f, ensure_ascii=False, indent=1)
+
+    def exporter(self, dossier: str = PROFILE_DIR) -> Tuple[str, str]:
+        """
+        Exporte le tampon en CSV et en JSON sous un nom horodaté ; retourne les deux chemins.
+        """
+        os.makedirs(dossier, exist_ok=True)
+        base = os.path.join(dossier, time.strftime("profil_%Y%m%d_%H%M%S"))
+        self.exporter_csv(base + ".csv")
+        self.exporter_json(base + ".json")
+        return base + ".csv", base + ".json"
+
+# ==============================
+# Classe SuperpositionProfil
+# ==============================
+class SuperpositionProfil:
+    """
+    Tableau affiché en haut à droite : moyenne glissante et 95e centile de chaque phase,
+    total et pire image. Le tableau n'est recomposé que toutes les periode secondes.
+    Il est composé à l'échelle de la cible (largeur de la cible / WIDTH) : à une résolution interne
+    réduite, il garde à l'écran la même taille et la même place qu'à l'échelle 1.
+    """
+
+    def __init__(self, profileur: ProfileurImages, periode: float = 0.5) -> None:
+        self.profileur = profileur
+        self.periode = periode
+        self.visible = False
+        self._surface = None
+        self._composee = 0.0
+        self._echelle = None
+        self._police = None
+
+    def basculer(self) -> None:
+        """
+        Affiche ou masque la superposition ; l'afficher lance l'enregistrement.
+        """
+        self.visible = not self.visible
+        if self.visible:
+            self.profileur.actif = True
+        self._surface = None
+
+    def _composer(self, echelle: float) -> "pygame.Surface":
+        if self._police is None or self._echelle != echelle:
+            self._police = pygame.font.Font(None, max(6, round(20 * echelle)))
+            self._echelle = echelle
+        police = self._police
+        stats = self.profileur.statistiques()
+        lignes = [("phase (ms)", "moy.", "p95")]
+        for phase, resume in stats["phases"].items():
+            if resume["max"] > 0:
+                lignes.append((phase, f"{resume['moyenne']:.2f}", f"{resume['p95']:.2f}"))
+        if stats["total"] is not None:
+            lignes.append(("total", f"{stats['total']['moyenne']:.2f}", f"{stats['total']['p95']:.2f}"))
+            pire = stats["pire"]
+            lignes.append((f"pire ({pire['phase']})", f"{pire['total']:.2f}", ""))
+        lignes.append((f"{stats['images']} images", "", ""))
+        hauteur = police.get_linesize()
+        marge = round(4 * echelle)
+        surface = pygame.Surface((round(270 * echelle), hauteur * len(lignes) + 2 * marge), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 170))
+        colonnes_x = [round(x * echelle) for x in (6, 160, 215)]
+        for n, colonnes in enumerate(lignes):
+            for x, texte in zip(colonnes_x, colonnes):
+                if texte:
+                    surface.blit(police.render(texte, True, (255, 255, 255)), (x, marge + n * hauteur))
+        return surface
+
+    def dessiner(self, cible: "pygame.Surface") -> Tuple[Optional["pygame.Rect"], bool]:
+        """
+        Dessine la superposition si elle est visible.
+        Retourne sa zone (None si masquée) et si son contenu a changé depuis l'image précédente.
+        """
+        if not self.visible:
+            return None, False
+        maintenant = time.perf_counter()
+        echelle = cible.get_width() / WIDTH
+        recomposee = (
+            self._surface is None or echelle != self._echelle or maintenant - self._composee >= self.periode
+        )
+        if recomposee:
+            self._surface = self._composer(echelle)
+            self._composee = maintenant
+        marge = round(10 * echelle)
+        return cible.blit(self._surface, (cible.get_width() - self._surface.get_width() - marge, marge)), recomposee
+
+# ==============================
+# Profileur du jeu et raccourcis clavier
+# ==============================
+PROFILEUR = ProfileurImages(actif=PROFILER_ENABLED)
+SUPERPOSITION = SuperpositionProfil(PROFILEUR)
+
+def exporter_profil() -> None:
+    """
+    Exporte les images enregistrées par le profileur du jeu, s'il y en a.
+    """
+    if not PROFILEUR.nombre:
+        return
+    try:
+        print("Profil exporté : {} et {}".format(*PROFILEUR.exporter()))
+    except OSError as e:
+        print(f"Erreur lors de l'export du profil : {e}")
+
+def traiter_touche(touche: int) -> bool:
+    """
+    F3 affiche ou masque la superposition, F4 exporte les images enregistrées.
+    Retourne True si l'écran doit être redessiné.
+    """
+    if touche == TOUCHE_SUPERPOSITION:
+        SUPERPOSITION.basculer()
+        return True
+    if touche == TOUCHE_EXPORT:
+        exporter_profil()
+    return False
@@ -0,0 +1,337 @@
+# ==================================================
+# Outils de rendu d'image pour Chasse Express
+# ==================================================
+
+import math
+
+import numpy as np
+import pygame
+from typing import Optional
+
+# ==========================================
+# Calques statiques pré-composés
+# ==========================================
+
+def composer_calque_statique(
+    taille: tuple,
+    image_fond: Optional["pygame.Surface"] = None,
+    elements: tuple = ()
+) -> "pygame.Surface":
+    """
+    Compose une seule fois un calque opaque : le fond puis chaque (surface, position) d'elements.
+    """
+    calque = pygame.Surface(taille)
+    if image_fond:
+        calque.blit(image_fond, (0, 0))
+    else:
+        calque.fill((100, 180, 255))
+    for image, position in elements:
+        if image:
+            calque.blit(image, position)
+    if pygame.display.get_surface() is not None:
+        calque = calque.convert()
+    return calque
+
+# ==========================================
+# Rendu par rectangles modifiés
+# ==========================================
+
+class ZonesSales:
+    """
+    Rendu par rectangles modifiés (« dirty rects »).
+    Chaque image restaure le calque statique sous les éléments dessinés à l'image précédente,
+    puis n'envoie à l'écran que les zones qui ont changé avec pygame.display.update(rects).
+    Inactif, il redessine tout le calque et appelle pygame.display.flip().
+    Avec une echelle (EchelleRendu), l'image rendue est d'abord agrandie dans la fenêtre.
+    """
+
+    def __init__(self, calque: "pygame.Surface", actif: bool = True, echelle: Optional["EchelleRendu"] = None) -> None:
+        self.calque = calque
+        self.actif = actif
+        self.echelle = echelle
+        self.complet = True
+        self._precedents = []
+        self._courants = []
+
+    def invalider(self) -> None:
+        """
+        Force un rendu complet à la prochaine image.
+        """
+        self.complet = True
+
+    def commencer(self, surface: "pygame.Surface") -> None:
+        """
+        Restaure le calque statique : en entier pour une image complète,
+        sinon seulement sous les éléments de l'image précédente.
+        """
+        if self.complet or not self.actif:
+            surface.blit(self.calque, (0, 0))
+        else:
+            for rect, _ in self._precedents:
+                surface.blit(self.calque, rect, rect)
+
+    def ajouter(self, rect: Optional["pygame.Rect"], modifie: bool = True) -> None:
+        """
+        Enregistre la zone d'un élément dessiné pendant l'image.
+        modifie=False indique que l'élément est identique, au même endroit, à l'image précédente.
+        """
+        if rect is not None and self.actif:
+            self._courants.append((pygame.Rect(rect), modifie))
+
+    def rectangles_a_envoyer(self) -> list:
+        """
+        Retourne les zones dont les pixels ont changé depuis l'image précédente.
+        """
+        anciens = [rect for rect, _ in self._precedents]
+        inchanges = [rect for rect, modifie in self._courants if not modifie and rect in anciens]
+        rects = [rect for rect in anciens if rect not in inchanges]
+        rects += [rect for rect, modifie in self._courants if rect not in inchanges]
+        return rects
+
+    def presenter(self) -> None:
+        """
+        Affiche l'image et prépare le suivi de la suivante.
+        """
+        rects = None if self.complet or not self.actif else self.rectangles_a_envoyer()
+        if self.echelle is not None:
+            self.echelle.afficher(rects)
+        elif rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+        self.complet = False
+        self._precedents = self._courants
+        self._courants = []
+
+# ==========================================
+# Résolution interne du rendu
+# ==========================================
+
+class EchelleRendu:
+    """
+    Correspondance entre les coordonnées du jeu (taille_jeu) et l'image rendue, echelle fois plus petite.
+    Les surfaces préparées une seule fois (calques, sprites, boutons, textes fixes) sont réduites
+    à leur création ; à chaque image, seules les positions sont converties.
+    La fenêtre garde la taille du jeu : l'image est rendue hors écran puis agrandie une fois
+    par image dans la fenêtre (afficher), et la souris reste en coordonnées du jeu.
+    À l'échelle 1, les conversions rendent leurs arguments inchangés et l'image est la fenêtre.
+    """
+
+    def __init__(self, taille_jeu: tuple, echelle: float = 1.0) -> None:
+        self.taille_jeu = tuple(taille_jeu)
+        self.echelle = echelle
+        self.active = echelle != 1.0
+        self.taille = tuple(max(1, round(c * echelle)) for c in self.taille_jeu)
+        self.fenetre = None
+        self.image = None
+        self._surfaces = {}
+
+    def preparer(self, fenetre: "pygame.Surface") -> "pygame.Surface":
+        """
+        Retourne la surface où dessiner pour la fenêtre (de la taille du jeu) :
+        la fenêtre elle-même à l'échelle 1, sinon une image hors écran à la résolution interne.
+        """
+        self.fenetre = fenetre
+        self.image = pygame.Surface(self.taille).convert(fenetre) if self.active else fenetre
+        return self.image
+
+    def afficher(self, rects: Optional[list] = None) -> None:
+        """
+        Agrandit l'image dans la fenêtre puis l'affiche, en entier si rects vaut None,
+        sinon seulement les zones rects (en coordonnées de l'image rendue).
+        """
+        if self.active:
+            pygame.transform.scale(self.image, self.taille_jeu, self.fenetre)
+            if rects is not None:
+                rects = [self.rect_fenetre(rect) for rect in rects]
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+
+    def rect_fenetre(self, rect) -> "pygame.Rect":
+        """
+        Rectangle de l'image rendue -> plus petit rectangle de la fenêtre qui le couvre.
+        """
+        rect = pygame.Rect(rect)
+        if not self.active:
+            return rect
+        x0, y0 = math.floor(rect.left / self.echelle), math.floor(rect.top / self.echelle)
+        x1, y1 = math.ceil(rect.right / self.echelle), math.ceil(rect.bottom / self.echelle)
+        return pygame.Rect(x0, y0, x1 - x0, y1 - y0)
+
+    def point(self, x, y) -> tuple:
+        """
+        Position du jeu -> position dans l'image rendue.
+        """
+        if not self.active:
+            return x, y
+        return int(x * self.echelle), int(y * self.echelle)
+
+    def rect(self, rect) -> "pygame.Rect":
+        """
+        Rectangle du jeu -> rectangle dans l'image rendue.
+        """
+        rect = pygame.Rect(rect)
+        if not self.active:
+            return rect
+        x0, y0 = self.point(rect.left, rect.top)
+        x1, y1 = self.point(rect.right, rect.bottom)
+        return pygame.Rect(x0, y0, x1 - x0, y1 - y0)
+
+    def reduire(self, surface: Optional["pygame.Surface"]) -> Optional["pygame.Surface"]:
+        """
+        Retourne la surface réduite (avec lissage) à la résolution interne.
+        """
+        if not self.active or surface is None:
+            return surface
+        taille = tuple(max(1, round(c * self.echelle)) for c in surface.get_size())
+        return pygame.transform.smoothscale(surface, taille)
+
+    def surface_fixe(self, cle, construire) -> "pygame.Surface":
+        """
+        Retourne la surface construite par construire() puis réduite, une seule fois par clé.
+        """
+        surface = self._surfaces.get(cle)
+        if surface is None:
+            surface = self._surfaces[cle] = self.reduire(construire())
+        return surface
+
+# ==========================================
+# Atlas de textures
+# ==========================================
+
+class AtlasTextures:
+    """
+    Regroupe de petites images dans une ou quelques grandes surfaces (rangement par étagères),
+    avec une table nom -> (page, sous-rectangle, ancre). Les sprites sont ensuite dessinés
+    par lots avec Surface.blits (ou fblits lorsqu'il est disponible) à partir de sous-surfaces
+    qui partagent les pixels des pages.
+    """
+
+    def __init__(self, taille_page: int = 1024, marge: int = 1) -> None:
+        self.taille_page = taille_page
+        self.marge = marge
+        self._images = {}
+        self.pages = []
+        self.regions = {}
+        self._sprites = {}
+
+    def ajouter(self, nom, image: "pygame.Surface", ancre: tuple = (0, 0)) -> None:
+        """
+        Ajoute une image à placer ; l'ancre est le point de l'image aligné sur la position de dessin.
+        """
+        self._images[nom] = (image, ancre)
+
+    def construire(self) -> "AtlasTextures":
+        """
+        Place les images par hauteur décroissante sur des étagères et compose les pages.
+        """
+        placements = []
+        page, x, y, hauteur_etagere = 0, 0, 0, 0
+        hauteurs_pages, largeurs_pages = [0], [0]
+        ordre = sorted(self._images.items(), key=lambda item: item[1][0].get_height(), reverse=True)
+        for nom, (image, ancre) in ordre:
+            w, h = image.get_width() + self.marge, image.get_height() + self.marge
+            if x > 0 and x + w > self.taille_page:
+                x, y, hauteur_etagere = 0, y + hauteur_etagere, 0
+            if y > 0 and y + h > self.taille_page:
+                page, x, y, hauteur_etagere = page + 1, 0, 0, 0
+                hauteurs_pages.append(0)
+                largeurs_pages.append(0)
+            placements.append((nom, image, ancre, page, x, y))
+            x += w
+            hauteur_etagere = max(hauteur_etagere, h)
+            largeurs_pages[page] = max(largeurs_pages[page], x)
+            hauteurs_pages[page] = max(hauteurs_pages[page], y + hauteur_etagere)
+        self.pages = [pygame.Surface((max(w, 1), max(h, 1)), pygame.SRCALPHA) for w, h in zip(largeurs_pages, hauteurs_pages)]
+        self.regions = {}
+        for nom, image, ancre, page, x, y in placements:
+            # Copie exacte des pixels (alpha compris) sur la page transparente
+            self.pages[page].blit(image, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+            self.regions[nom] = (page, pygame.Rect(x, y, image.get_width(), image.get_height()), ancre)
+        if pygame.display.get_surface() is not None:
+            self.pages = [page.convert_alpha() for page in self.pages]
+        self._sprites = {
+            nom: (self.pages[page].subsurface(rect), ancre) for nom, (page, rect, ancre) in self.regions.items()
+        }
+        self._images = {}
+        return self
+
+    def sous_surface(self, nom) -> "pygame.Surface":
+        """
+        Retourne une sous-surface de la page qui partage les pixels de l'image nommée.
+        """
+        return self._sprites[nom][0]
+
+    def ancre(self, nom) -> tuple:
+        """
+        Retourne l'ancre de l'image nommée.
+        """
+        return self._sprites[nom][1]
+
+    def dessiner(self, cible: "pygame.Surface", elements, retour_rects: bool = False) -> Optional[list]:
+        """
+        Dessine une suite de (nom, position) en un appel de blit par lot.
+        Retourne la liste des rectangles dessinés si retour_rects est vrai.
+        """
+        sprites = self._sprites
+        lot = []
+        for nom, (x, y) in elements:
+            sprite, (ancre_x, ancre_y) = sprites[nom]
+            lot.append((sprite, (x - ancre_x, y - ancre_y)))
+        if retour_rects:
+            return cible.blits(lot, doreturn=1)
+        fblits = getattr(cible, "fblits", None)
+        if fblits is not None:
+            fblits(lot)
+        else:
+            cible.blits(lot, doreturn=0)
+        return None
+
+# ==========================================
+# Sprites des particules
+# ==========================================
+
+class SpritesParticules:
+    """
+    Table code -> sous-surface de l'atlas pour les particules, indexée d'un coup par tableau NumPy :
+    les positions de dessin sont calculées en bloc puis envoyées en un seul appel de blit par lot.
+    Les positions des particules, en coordonnées du jeu, sont multipliées par echelle.
+    """
+
+    def __init__(self, atlas: AtlasTextures, nombre_codes: int, echelle: float = 1.0) -> None:
+        self.echelle = echelle
+        self.surfaces = np.empty(nombre_codes, dtype=object)
+        self.ancres = np.zeros((nombre_codes, 2), dtype=np.int64)
+        self.tailles = np.zeros((nombre_codes, 2), dtype=np.int64)
+        for code in range(nombre_codes):
+            sprite = atlas.sous_surface(("particule", code))
+            self.surfaces[code] = sprite
+            self.ancres[code] = atlas.ancre(("particule", code))
+            self.tailles[code] = sprite.get_size()
+
+    def dessiner(self, cible: "pygame.Surface", particules, retour_rect: bool = False) -> Optional["pygame.Rect"]:
+        """
+        Dessine toutes les particules vivantes.
+        Si retour_rect est vrai, retourne un seul rectangle englobant (limité à la cible), ou None.
+        """
+        codes, xs, ys = particules.visible()
+        if not len(codes):
+            return None
+        if self.echelle != 1.0:
+            xs, ys = xs * self.echelle, ys * self.echelle
+        gauche = xs.astype(np.int64) - self.ancres[codes, 0]
+        haut = ys.astype(np.int64) - self.ancres[codes, 1]
+        lot = list(zip(self.surfaces[codes].tolist(), zip(gauche.tolist(), haut.tolist())))
+        fblits = getattr(cible, "fblits", None)
+        if fblits is not None:
+            fblits(lot)
+        else:
+            cible.blits(lot, doreturn=0)
+        if not retour_rect:
+            return None
+        x0, y0 = int(gauche.min()), int(haut.min())
+        x1 = int((gauche + self.tailles[codes, 0]).max())
+        y1 = int((haut + self.tailles[codes, 1]).max())
+        return pygame.Rect(x0, y0, x1 - x0, y1 - y0).clip(cible.get_rect())
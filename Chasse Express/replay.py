@@ -0,0 +1,192 @@
+# ==================================================
+# Enregistrement et relecture déterministe des manches
+# ==================================================
+# Format binaire (petit-boutiste) :
+#   en-tête  : magie b"CERPL1", graine (u64), fréquence de simulation (u16),
+#              largeur et hauteur (u16), dernier pas (u32), nombre de clics (u32),
+#              longueur de la difficulté (u8) puis son nom en UTF-8
+#   clics    : (pas u32, x i16, y i16) par clic, dans l'ordre
+# Usage : python replay.py fichier.cerp [--temps-reel]
+
+# ----- Imports -----
+import os
+import struct
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from session import GameSession
+
+# ==============================
+# Constantes du format
+# ==============================
+REPLAY_MAGIC = b"CERPL1"
+_HEADER = struct.Struct("<6sQHHHIIB")
+_CLICK = struct.Struct("<Ihh")
+
+# ==============================
+# Classe Replay
+# ==============================
+@dataclass
+class Replay:
+    """
+    Graine, difficulté et clics horodatés (en pas de simulation) d'une manche.
+    """
+    seed: int
+    difficulty: str
+    sim_hz: int
+    width: int
+    height: int
+    end_tick: int = 0
+    clicks: List[Tuple[int, int, int]] = field(default_factory=list)
+
+    @classmethod
+    def from_session(cls, session: GameSession) -> "Replay":
+        """
+        Construit l'enregistrement d'une manche jouée.
+        """
+        return cls(
+            seed=session.seed, difficulty=session.difficulty, sim_hz=session.sim_hz,
+            width=session.width, height=session.height,
+            end_tick=session.sim_ticks, clicks=list(session.inputs)
+        )
+
+    def to_bytes(self) -> bytes:
+        name = self.difficulty.encode("utf-8")
+        header = _HEADER.pack(
+            REPLAY_MAGIC, self.seed, self.sim_hz, self.width, self.height,
+            self.end_tick, len(self.clicks), len(name)
+        )
+        return header + name + b"".join(_CLICK.pack(*click) for click in self.clicks)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Replay":
+        if len(data) < _HEADER.size:
+            raise ValueError("Fichier de relecture tronqué")
+        magic, seed, sim_hz, width, height, end_tick, count, name_len = _HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC:
+            raise ValueError("Ce fichier n'est pas une relecture Chasse Express")
+        offset = _HEADER.size
+        difficulty = data[offset:offset + name_len].decode("utf-8")
+        offset += name_len
+        if len(data) != offset + count * _CLICK.size:
+            raise ValueError("Fichier de relecture tronqué")
+        clicks = [tuple(click) for click in _CLICK.iter_unpack(data[offset:])]
+        return cls(seed, difficulty, sim_hz, width, height, end_tick, clicks)
+
+    def save(self, path: str) -> None:
+        """
+        Écrit la relecture (remplacement atomique du fichier).
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self.to_bytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "Replay":
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+# ==============================
+# Relecture
+# ==============================
+
+class Relecteur:
+    """
+    Rejoue les clics d'une relecture sur une nouvelle GameSession, pas par pas :
+    au pas n, les clics enregistrés au pas n sont appliqués avant d'avancer la manche.
+    """
+
+    def __init__(self, replay: Replay, dog_pos: Tuple[int, int], dog_size: Tuple[int, int]) -> None:
+        self.replay = replay
+        self.session = GameSession(
+            replay.difficulty, replay.seed, dog_pos, dog_size,
+            width=replay.width, height=replay.height, sim_hz=replay.sim_hz
+        )
+        self._next_click = 0
+
+    @property
+    def termine(self) -> bool:
+        return self.session.sim_ticks >= self.replay.end_tick and self._next_click >= len(self.replay.clicks)
+
+    def clics_du_pas(self) -> List[Tuple[int, int]]:
+        """
+        Retourne les clics enregistrés au pas courant et avance dans le flux.
+        """
+        clicks = self.replay.clicks
+        tick = self.session.sim_ticks
+        found = []
+        while self._next_click < len(clicks) and clicks[self._next_click][0] == tick:
+            found.append(clicks[self._next_click][1:])
+            self._next_click += 1
+        return found
+
+    def appliquer(self, x: int, y: int) -> Tuple[int, int, Optional[str], Optional[Tuple[int, int]]]:
+        """
+        Applique un clic à la session et retourne (x, y, effet, position de la pie touchée ou None).
+        """
+        result = self.session.click(x, y)
+        return x, y, result, self.session.last_hit if result == "hit" else None
+
+    def avancer(self, pas: int) -> List[Tuple[int, int, Optional[str], Optional[Tuple[int, int]]]]:
+        """
+        Rejoue au plus pas pas de simulation et retourne les clics appliqués (voir appliquer).
+        """
+        results = []
+        for _ in range(pas):
+            for x, y in self.clics_du_pas():
+                results.append(self.appliquer(x, y))
+            if self.session.sim_ticks >= self.replay.end_tick:
+                break
+            self.session.step()
+        if self.session.sim_ticks >= self.replay.end_tick:
+            for x, y in self.clics_du_pas():
+                results.append(self.appliquer(x, y))
+        return results
+
+    def tick(self, dt: float) -> List[Tuple[int, int, Optional[str], Optional[Tuple[int, int]]]]:
+        """
+        Rejoue les pas correspondant à dt secondes de temps réel (horloge à pas fixe de la session).
+        Rien n'avance tant que la session est en pause.
+        """
+        if self.session.paused:
+            return []
+        return self.avancer(self.session.clock.avancer(dt))
+
+def rejouer(replay: Replay, dog_pos: Tuple[int, int], dog_size: Tuple[int, int]) -> GameSession:
+    """
+    Rejoue une manche entière sans affichage, aussi vite que possible, et retourne la session finale.
+    """
+    relecteur = Relecteur(replay, dog_pos, dog_size)
+    relecteur.avancer(replay.end_tick + 1)
+    return relecteur.session
+
+# ==============================
+# Ligne de commande
+# ==============================
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        print("Usage : python replay.py fichier.cerp [--temps-reel]")
+        sys.exit(1)
+    if "--temps-reel" in sys.argv[2:]:
+        from chasse_express import main as jouer
+        jouer(replay_path=sys.argv[1])
+        return
+    from settings import DOG_POS, DOG_SIZE
+    replay = Replay.load(sys.argv[1])
+    start = time.perf_counter()
+    session = rejouer(replay, DOG_POS, DOG_SIZE)
+    elapsed = time.perf_counter() - start
+    real_time = replay.end_tick / replay.sim_hz
+    print(f"Difficulté : {replay.difficulty}  graine : {replay.seed}  clics : {len(replay.clicks)}")
+    print(f"Résultat : {'victoire' if session.win else 'défaite'}  score : {session.score}/{session.goal}"
+          f"  munitions : {session.ammo}  temps restant : {session.time_left}")
+    print(f"{replay.end_tick} pas rejoués en {elapsed * 1000:.1f} ms"
+          f" ({real_time / max(elapsed, 1e-9):.0f}x le temps réel)")
+
+if __name__ == '__main__':
+    main()
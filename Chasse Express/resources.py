@@ -1,49 +1,278 @@
 # =======================================
 # Imports et variables globales de cache
 # =======================================
+import hashlib
+import json
 import os
+import struct
+import sys
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import pygame
+from settings import FONT_SPECS, FONT_INDEX_PATH, IMAGE_CACHE_DIR, ASSET_DISK_CACHE, RESOURCE_CACHE_BUDGET
 
-# Caches globaux pour les ressources chargées
-FONT_CACHE = {}
-ICON_CACHE = {}
-IMAGE_CACHE = {}
-SOUND_CACHE = {}
+# ==============================================
+# Cache unifié des ressources chargées
+# ==============================================
+
+class ResourceCache:
+    """
+    Cache LRU unifié des ressources, borné en octets.
+    Les clés sont des tuples dont le premier élément est le type ("image", "sound", "font"...),
+    utilisé pour la comptabilité des octets, des hits, des misses et des évictions par type.
+    Les entrées épinglées ne sont jamais évincées.
+    """
+
+    def __init__(self, budget_bytes=RESOURCE_CACHE_BUDGET):
+        self.budget_bytes = budget_bytes
+        self._entries = OrderedDict()
+        self._pinned = set()
+        self._kinds = {}
+        self.total_bytes = 0
+
+    def _kind_stats(self, kind):
+        if kind not in self._kinds:
+            self._kinds[kind] = {"entries": 0, "bytes": 0, "hits": 0, "misses": 0, "evictions": 0}
+        return self._kinds[kind]
+
+    def get(self, key, default=None):
+        """Retourne la valeur associée à la clé (et la marque comme récente), sinon default."""
+        entry = self._entries.get(key)
+        kind_stats = self._kind_stats(key[0])
+        if entry is None:
+            kind_stats["misses"] += 1
+            return default
+        self._entries.move_to_end(key)
+        kind_stats["hits"] += 1
+        return entry[0]
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def put(self, key, value, nbytes=None, pin=False):
+        """Ajoute une valeur ; la taille est estimée selon son type si nbytes n'est pas fourni."""
+        self.discard(key)
+        nbytes = estimate_bytes(value) if nbytes is None else nbytes
+        self._entries[key] = (value, nbytes)
+        kind_stats = self._kind_stats(key[0])
+        kind_stats["entries"] += 1
+        kind_stats["bytes"] += nbytes
+        self.total_bytes += nbytes
+        if pin:
+            self._pinned.add(key)
+        self._enforce_budget()
+        return value
+
+    def discard(self, key):
+        """Retire une entrée si elle existe."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        kind_stats = self._kind_stats(key[0])
+        kind_stats["entries"] -= 1
+        kind_stats["bytes"] -= entry[1]
+        self.total_bytes -= entry[1]
+        self._pinned.discard(key)
+        return True
+
+    def pin(self, key):
+        """Épingle une entrée présente : elle ne sera plus évincée."""
+        if key in self._entries:
+            self._pinned.add(key)
+
+    def unpin(self, key):
+        """Retire l'épingle d'une entrée ; le budget est réappliqué."""
+        self._pinned.discard(key)
+        self._enforce_budget()
+
+    def _enforce_budget(self):
+        if self.budget_bytes is None:
+            return
+        for key in list(self._entries):
+            if self.total_bytes <= self.budget_bytes:
+                break
+            if key in self._pinned:
+                continue
+            self.discard(key)
+            self._kind_stats(key[0])["evictions"] += 1
+
+    def clear(self, kind=None, include_pinned=False):
+        """Vide le cache (ou un seul type) ; les entrées épinglées sont gardées par défaut."""
+        for key in list(self._entries):
+            if (kind is None or key[0] == kind) and (include_pinned or key not in self._pinned):
+                self.discard(key)
+
+    def stats(self):
+        """Retourne l'occupation du cache et les compteurs par type."""
+        return {
+            "budget_bytes": self.budget_bytes,
+            "total_bytes": self.total_bytes,
+            "entries": len(self._entries),
+            "pinned": len(self._pinned),
+            "kinds": {kind: dict(values) for kind, values in self._kinds.items()},
+        }
+
+# Estime l'occupation mémoire d'une ressource : pitch × hauteur pour une surface,
+# nombre d'échantillons × octets par échantillon pour un son
+def estimate_bytes(value):
+    if isinstance(value, pygame.Surface):
+        return value.get_pitch() * value.get_height()
+    if isinstance(value, pygame.mixer.Sound):
+        mixer = pygame.mixer.get_init()
+        if mixer:
+            frequency, sample_format, channels = mixer
+            return int(value.get_length() * frequency) * channels * (abs(sample_format) // 8)
+    return 0
+
+# Cache global des ressources chargées et registre des polices du jeu
+CACHE = ResourceCache()
+FONT_REGISTRY = {}
+FONT_RESOLUTION = {}
+_FONT_INDEX = None
+_FONT_INDEX_DIRTY = False
+
+# Chemin absolu d'une ressource (relative au dossier du jeu)
+def _asset_path(path):
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
 
 # =============================================
 # Fonctions de chargement d'images et d'icônes
 # =============================================
 
-# Charge et met en cache une image depuis le disque
-def load_image(path):
-    if path in IMAGE_CACHE:
-        return IMAGE_CACHE[path]
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    abs_path = os.path.join(base_dir, path)
-    try:
-        img = pygame.image.load(abs_path).convert_alpha()
-        IMAGE_CACHE[path] = img
+# Charge et met en cache une image depuis le disque, redimensionnée à size si fourni
+# Les pixels prêts pour l'affichage sont conservés dans le cache disque des images.
+def load_image(path, size=None):
+    abs_path = _asset_path(path)
+    key = ("image", abs_path, size)
+    img = CACHE.get(key)
+    if img is not None:
         return img
-    except (pygame.error, FileNotFoundError):
-        return None
+    img = _read_cached_pixels(abs_path, size)
+    if img is None:
+        try:
+            img = pygame.image.load(abs_path).convert_alpha()
+        except (pygame.error, FileNotFoundError):
+            return None
+        if size:
+            img = pygame.transform.smoothscale(img, size)
+        _write_cached_pixels(abs_path, size, img)
+    return CACHE.put(key, img)
 
 # Charge et met en cache une icône, génère une surface par défaut si le fichier est absent
 # Remarque : le fallback sert surtout à tester la gestion des fichiers manquants.
 # Il n'est techniquement pas nécessaire dans ce projet puisque toutes les images sont incluses dans le dépôt.
+# Une icône partage l'entrée de cache de load_image pour le même fichier.
 def load_icon(path, fallback_size=32):
-    if path in ICON_CACHE:
-        return ICON_CACHE[path]
+    abs_path = _asset_path(path)
+    key = ("image", abs_path, None)
+    icon = CACHE.get(key)
+    if icon is not None:
+        return icon
+    icon = _read_cached_pixels(abs_path, None)
+    if icon is not None:
+        return CACHE.put(key, icon)
     try:
-        img = pygame.image.load(path)
+        img = pygame.image.load(abs_path)
         icon = img.convert_alpha()
-        ICON_CACHE[path] = icon
-        return icon
+        _write_cached_pixels(abs_path, None, icon)
+        return CACHE.put(key, icon)
     except (pygame.error, FileNotFoundError):
+        fallback_key = ("fallback", abs_path, fallback_size)
+        surf = CACHE.get(fallback_key)
+        if surf is not None:
+            return surf
         surf = pygame.Surface((fallback_size, fallback_size), pygame.SRCALPHA)
         pygame.draw.rect(surf, (180, 180, 180, 200), (0, 0, fallback_size, fallback_size), border_radius=6)
         pygame.draw.rect(surf, (120, 120, 120, 220), (0, 0, fallback_size, fallback_size), 2, border_radius=6)
-        ICON_CACHE[path] = surf
-        return surf
+        return CACHE.put(fallback_key, surf)
+
+# ==============================================
+# Cache disque des images prétraitées
+# ==============================================
+
+# En-tête des fichiers du cache : signature, largeur, hauteur, format des octets
+_PIXEL_CACHE_HEADER = struct.Struct("<6sII4s")
+_PIXEL_CACHE_MAGIC = b"CEIMG1"
+
+# Format d'octets correspondant aux masques d'une surface 32 bits (petit-boutiste)
+_BYTE_FORMATS = {
+    (0xff0000, 0xff00, 0xff, 0xff000000): "BGRA",
+    (0xff, 0xff00, 0xff0000, 0xff000000): "RGBA",
+    (0xff00, 0xff0000, 0xff000000, 0xff): "ARGB",
+}
+
+# Format des pixels de l'affichage courant (None si aucune fenêtre n'est ouverte)
+def _display_pixel_format():
+    display = pygame.display.get_surface()
+    if display is None:
+        return None
+    probe = pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha()
+    if probe.get_bitsize() != 32 or sys.byteorder != "little":
+        return None
+    return _BYTE_FORMATS.get(tuple(probe.get_masks()))
+
+# Chemin du fichier de cache : dépend de la source (chemin, mtime, taille), de la taille cible et du format
+def _pixel_cache_path(abs_path, size, fmt):
+    try:
+        stat = os.stat(abs_path)
+    except OSError:
+        return None
+    key = f"{os.path.abspath(abs_path)}|{stat.st_mtime_ns}|{stat.st_size}|{size}|{fmt}"
+    return os.path.join(IMAGE_CACHE_DIR, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".px")
+
+# Lit un fichier du cache disque : (pixels, taille, format) ou None (sans appel à pygame, utilisable hors du thread principal)
+# Les pixels sont lus dans un bytearray : la Surface qui les projette peut y dessiner sans toucher à des octets immuables
+def _read_pixel_file(abs_path, size, fmt):
+    if not ASSET_DISK_CACHE or not fmt:
+        return None
+    cache_path = _pixel_cache_path(abs_path, size, fmt)
+    if cache_path is None:
+        return None
+    try:
+        with open(cache_path, "rb") as f:
+            magic, width, height, stored_fmt = _PIXEL_CACHE_HEADER.unpack(f.read(_PIXEL_CACHE_HEADER.size))
+            if magic != _PIXEL_CACHE_MAGIC:
+                return None
+            pixels = bytearray(width * height * 4)
+            if f.readinto(pixels) != len(pixels) or f.read(1):
+                return None
+    except (OSError, struct.error):
+        return None
+    return pixels, (width, height), stored_fmt.decode("ascii")
+
+# Projette des pixels prétraités (bytearray modifiable) directement dans une Surface, sans copie
+def _surface_from_pixels(raw):
+    pixels, size, fmt = raw
+    try:
+        return pygame.image.frombuffer(pixels, size, fmt)
+    except (ValueError, pygame.error):
+        return None
+
+# Relit des pixels prétraités depuis le cache disque
+def _read_cached_pixels(abs_path, size):
+    if not ASSET_DISK_CACHE:
+        return None
+    raw = _read_pixel_file(abs_path, size, _display_pixel_format())
+    return _surface_from_pixels(raw) if raw else None
+
+# Écrit les pixels d'une surface déjà convertie dans le cache disque
+def _write_cached_pixels(abs_path, size, surface):
+    if not ASSET_DISK_CACHE:
+        return False
+    fmt = _display_pixel_format()
+    cache_path = _pixel_cache_path(abs_path, size, fmt) if fmt else None
+    if cache_path is None:
+        return False
+    try:
+        os.makedirs(IMAGE_CACHE_DIR, exist_ok=True)
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_PIXEL_CACHE_HEADER.pack(_PIXEL_CACHE_MAGIC, surface.get_width(), surface.get_height(), fmt.encode("ascii")))
+            f.write(pygame.image.tobytes(surface, fmt))
+        os.replace(tmp_path, cache_path)
+    except (OSError, pygame.error):
+        return False
+    return True
 
 # =============================================
 # Fonctions de chargement de sons et polices
@@ -51,40 +280,256 @@ def load_icon(path, fallback_size=32):
 
 # Charge et met en cache un son depuis le disque
 def load_sound(path):
-    if path in SOUND_CACHE:
-        return SOUND_CACHE[path]
-    try:
-        sound = pygame.mixer.Sound(path)
-        SOUND_CACHE[path] = sound
+    key = ("sound", _asset_path(path))
+    sound = CACHE.get(key)
+    if sound is not None:
         return sound
+    try:
+        return CACHE.put(key, pygame.mixer.Sound(key[1]))
     except (pygame.error, FileNotFoundError):
         return None
 
 # Charge et met en cache une police, cherche localement et dans le système
-def load_font(font_names, size):
-    key = (tuple(font_names) if isinstance(font_names, list) else font_names, size)
-    if key in FONT_CACHE:
-        return FONT_CACHE[key]
-    if isinstance(font_names, str):
+# La première famille trouvée est utilisée ; sinon la police par défaut de pygame.
+# Les polices sont épinglées dans le cache : elles sont petites et réutilisées à chaque image.
+def load_font(font_names, size, bold=False):
+    families = tuple(font_names) if isinstance(font_names, list) else font_names
+    key = ("font", families, size, bold)
+    font = CACHE.get(key)
+    if font is not None:
+        return font
+    if font_names is None:
+        font_names = []
+    elif isinstance(font_names, str):
         font_names = [font_names]
+    font = None
+    local_path = _find_local_font(font_names)
+    if local_path:
+        font = pygame.font.Font(local_path, size)
+        font.bold = bold
+        FONT_RESOLUTION[families] = local_path
+    if font is None:
+        for sys_name in font_names:
+            path, synthetic_bold = _resolve_system_font(sys_name, bold)
+            if path:
+                font = pygame.font.Font(path, size)
+                font.bold = synthetic_bold
+                FONT_RESOLUTION[families] = path
+                break
+    if font is None:
+        font = pygame.font.Font(None, size)
+        font.bold = bold
+        FONT_RESOLUTION[families] = None
+    path = FONT_RESOLUTION[families]
+    return CACHE.put(key, font, nbytes=os.path.getsize(path) if path else 0, pin=True)
+
+# Cherche un fichier .ttf local correspondant à l'une des familles
+def _find_local_font(font_names):
     for fname in font_names:
         for suffix in ["", "-Regular"]:
             for ext in [".ttf"]:
                 path = fname + suffix + ext
                 if os.path.exists(path):
-                    font = pygame.font.Font(path, size)
-                    FONT_CACHE[key] = font
-                    return font
-    for sys_name in font_names:
+                    return path
+    return None
+
+# ==============================================
+# Index des polices système (persisté sur disque)
+# ==============================================
+
+# Charge l'index des polices système sauvegardé lors d'un lancement précédent
+def _font_index():
+    global _FONT_INDEX
+    if _FONT_INDEX is None:
+        _FONT_INDEX = {}
         try:
-            font = pygame.font.SysFont(sys_name, size)
-            FONT_CACHE[key] = font
-            return font
-        except Exception:
-            continue
-    font = pygame.font.SysFont(None, size)
-    FONT_CACHE[key] = font
-    return font
+            with open(FONT_INDEX_PATH, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("pygame") == pygame.version.ver:
+                _FONT_INDEX = data.get("fonts", {})
+        except (OSError, ValueError, AttributeError):
+            pass
+    return _FONT_INDEX
+
+# Trouve le fichier d'une famille système : (chemin ou None, gras synthétique)
+# L'index évite le balayage des polices système (fontconfig) au démarrage.
+def _resolve_system_font(name, bold=False):
+    global _FONT_INDEX_DIRTY
+    index = _font_index()
+    entry_key = f"{name.lower()}|{int(bold)}"
+    entry = index.get(entry_key)
+    if entry is not None and (entry["path"] is None or os.path.exists(entry["path"])):
+        return entry["path"], entry["synthetic_bold"]
+    path = pygame.font.match_font(name, bold)
+    synthetic_bold = bool(bold and path and path == pygame.font.match_font(name, False))
+    index[entry_key] = {"path": path, "synthetic_bold": synthetic_bold}
+    _FONT_INDEX_DIRTY = True
+    return path, synthetic_bold
+
+# Sauvegarde l'index des polices système s'il a changé
+def save_font_index(path=None):
+    global _FONT_INDEX_DIRTY
+    path = path or FONT_INDEX_PATH
+    if not _FONT_INDEX_DIRTY and os.path.exists(path):
+        return False
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"pygame": pygame.version.ver, "fonts": _font_index()}, f, indent=2)
+    except OSError:
+        return False
+    _FONT_INDEX_DIRTY = False
+    return True
+
+# =====================================
+# Registre des polices du jeu
+# =====================================
+
+# Résout une seule fois toutes les polices du jeu (rôle -> (famille, taille, gras))
+def init_fonts(specs=None, index_path=None):
+    specs = FONT_SPECS if specs is None else specs
+    for role, (family, size, bold) in specs.items():
+        FONT_REGISTRY[role] = load_font(family, size, bold)
+    save_font_index(index_path)
+    return FONT_REGISTRY
+
+# Retourne la police associée à un rôle (résolue au besoin)
+def get_font(role):
+    if role not in FONT_REGISTRY:
+        family, size, bold = FONT_SPECS[role]
+        FONT_REGISTRY[role] = load_font(family, size, bold)
+    return FONT_REGISTRY[role]
+
+# Indique pour chaque famille demandée le fichier retenu (None : police par défaut de pygame)
+def font_report():
+    return dict(FONT_RESOLUTION)
+
+# =============================================
+# Chargement asynchrone des ressources
+# =============================================
+
+# Décode une image hors du thread principal : pixels du cache disque ou surface 32 bits redimensionnée
+def _decode_image(abs_path, size, fmt, template):
+    raw = _read_pixel_file(abs_path, size, fmt)
+    if raw:
+        return "raw", raw
+    return "surface", _decode_source(abs_path, size, template)
+
+# Décode l'image source en surface 32 bits, redimensionnée si besoin
+def _decode_source(abs_path, size, template):
+    img = pygame.image.load(abs_path).convert(template)
+    if size:
+        img = pygame.transform.smoothscale(img, size)
+    return img
+
+class AssetLoader:
+    """
+    Charge les ressources en arrière-plan : le décodage se fait sur un pool de threads,
+    la conversion finale des surfaces et la mise en cache sur le thread principal (poll).
+    Les ressources critiques sont épinglées dans le cache global.
+    """
+
+    def __init__(self, max_workers=4):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="assets")
+        self._pending = {}
+        self._critical = set()
+        self.assets = {}
+        self.errors = {}
+        self._fmt = _display_pixel_format()
+        self._template = pygame.Surface((1, 1), pygame.SRCALPHA, 32)
+        if pygame.display.get_surface() is not None:
+            self._template = self._template.convert_alpha()
+
+    def _submit(self, name, critical, finalize, fallback, func, *args):
+        self._pending[name] = (self._executor.submit(func, *args), finalize, fallback)
+        if critical:
+            self._critical.add(name)
+
+    def load_image(self, name, path, size=None, critical=True):
+        """Décode une image (et la redimensionne) en arrière-plan, comme load_image."""
+        abs_path = _asset_path(path)
+        key = ("image", abs_path, size)
+        if key in CACHE:
+            self.assets[name] = CACHE.get(key)
+            return
+
+        def finalize(result):
+            return CACHE.put(key, self._finalize_surface(abs_path, size, result), pin=critical)
+        self._submit(name, critical, finalize, None, _decode_image, abs_path, size, self._fmt, self._template)
+
+    def load_icon(self, name, path, critical=True):
+        """Décode une icône en arrière-plan, avec la même surface de repli que load_icon."""
+        abs_path = _asset_path(path)
+        key = ("image", abs_path, None)
+        if key in CACHE:
+            self.assets[name] = CACHE.get(key)
+            return
+
+        def finalize(result):
+            return CACHE.put(key, self._finalize_surface(abs_path, None, result), pin=critical)
+        self._submit(name, critical, finalize, lambda: load_icon(path), _decode_image, abs_path, None, self._fmt, self._template)
+
+    def load_sound(self, name, path, critical=False):
+        """Décode un son en arrière-plan, comme load_sound."""
+        key = ("sound", _asset_path(path))
+        if key in CACHE:
+            self.assets[name] = CACHE.get(key)
+            return
+
+        def finalize(sound):
+            return CACHE.put(key, sound, pin=critical)
+        self._submit(name, critical, finalize, None, pygame.mixer.Sound, key[1])
+
+    def _finalize_surface(self, abs_path, size, result):
+        kind, payload = result
+        if kind == "raw":
+            surface = _surface_from_pixels(payload)
+            if surface is not None:
+                return surface
+            # Pixels du cache refusés : défaut de cache, l'image est décodée depuis la source
+            # (une erreur de décodage passe par le repli de poll) et le fichier du cache est réécrit
+            payload = _decode_source(abs_path, size, self._template)
+        img = payload.convert_alpha() if pygame.display.get_surface() is not None else payload
+        _write_cached_pixels(abs_path, size, img)
+        return img
+
+    def poll(self):
+        """Finalise sur le thread principal les ressources décodées. Retourne leur nombre."""
+        done = [name for name, (future, _, _) in self._pending.items() if future.done()]
+        for name in done:
+            future, finalize, fallback = self._pending.pop(name)
+            try:
+                self.assets[name] = finalize(future.result())
+            except (pygame.error, FileNotFoundError, OSError) as e:
+                self.assets[name] = fallback() if fallback else None
+                self.errors[name] = str(e)
+        return len(done)
+
+    def wait(self, timeout=None):
+        """Attend qu'au moins un décodage en cours se termine, au plus timeout secondes."""
+        running = [future for future, _, _ in self._pending.values() if not future.done()]
+        if running:
+            wait(running, timeout, return_when=FIRST_COMPLETED)
+
+    def progress(self, critical_only=True):
+        """Fraction des ressources (critiques par défaut) déjà disponibles."""
+        names = self._critical if critical_only else set(self.assets) | set(self._pending)
+        if not names:
+            return 1.0
+        return sum(1 for name in names if name in self.assets) / len(names)
+
+    def ready(self, critical_only=True):
+        """Indique si toutes les ressources (critiques par défaut) sont disponibles."""
+        return self.progress(critical_only) >= 1.0
+
+    def get(self, name, default=None):
+        """Retourne une ressource finalisée, ou default si elle n'est pas (encore) disponible."""
+        asset = self.assets.get(name)
+        return default if asset is None else asset
+
+    def shutdown(self, wait=False):
+        """Arrête le pool de threads."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
 
 # ============================================
 # Exception personnalisée pour les ressources
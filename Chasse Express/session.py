@@ -0,0 +1,240 @@
+# ==================================================
+# Règles d'une manche, sans affichage ni son
+# ==================================================
+
+# ----- Imports -----
+import random
+from typing import List, Optional, Tuple
+
+from entities import MagpieFlock, MagpieSwarm, Dog
+from flocking import FlockingRules
+from settings import (
+    WIDTH, HEIGHT, MAGPIE_BODY_RADIUS, SIM_HZ, MAX_SIM_STEPS, SWARM_MIN_COUNT, DIFFICULTY_SETTINGS
+)
+from utils import (
+    calcule_score, consomme_munition, verifie_victoire, verifie_defaite, secondes_simulees, PasDeTempsFixe
+)
+
+# ==============================
+# Phases d'une manche
+# ==============================
+PHASE_WAITING = "waiting"      # le chien attend d'être cliqué
+PHASE_JUMPING = "jumping"      # le chien saute, les pies ne sont pas encore lâchées
+PHASE_PLAYING = "playing"      # les pies volent, la minuterie tourne
+PHASE_PAUSED = "paused"        # manche suspendue (fenêtre inactive), minuterie figée
+PHASE_OVER = "over"            # victoire ou défaite, en attente du clic de retour au menu
+PHASE_FINISHED = "finished"    # manche terminée
+
+# ==============================
+# Classe GameSession
+# ==============================
+class GameSession:
+    """
+    Machine à états d'une manche, sans affichage ni son : saut du chien, envol des pies,
+    score, munitions, minuterie en pas de simulation et victoire/défaite.
+    Entrées explicites : tick(dt) avance du temps réel écoulé (par pas fixes), step() d'un pas,
+    click(x, y) applique un clic, set_paused() suspend ou reprend la manche. L'état est lisible par attributs, par phase et par snapshot().
+    Tous les tirages aléatoires viennent d'un générateur propre à la manche, initialisé par seed,
+    et chaque clic est enregistré avec son numéro de pas pour pouvoir rejouer la manche.
+    timed=False fige la minuterie : la manche ne se perd jamais au temps (mesures, simulations longues).
+    """
+
+    def __init__(
+        self,
+        difficulty: str,
+        seed: int,
+        dog_pos: Tuple[int, int],
+        dog_size: Tuple[int, int],
+        width: int = WIDTH,
+        height: int = HEIGHT,
+        sim_hz: int = SIM_HZ,
+        settings: Optional[dict] = None,
+        timed: bool = True
+    ) -> None:
+        # settings remplace le préréglage nommé (réglages expérimentaux, équilibrage)
+        settings = settings if settings is not None else DIFFICULTY_SETTINGS[difficulty]
+        self.difficulty = difficulty
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.width = width
+        self.height = height
+        self.sim_hz = sim_hz
+        self.timed = timed
+        self.score = 0
+        self.ammo = settings.get("ammo", 10)
+        self.goal = settings.get("goal", 5)
+        self.magpie_count = max(1, settings.get("magpie_count", 1))
+        self.speed = max(1, settings.get("speed", 1))
+        self.round_time = max(5, settings.get("time", 30))
+        self.label = settings.get("label", "Facile")
+        flocking = settings.get("flocking", False)
+        self.flocking = FlockingRules.from_setting(flocking) if flocking else None
+        self.dog = Dog(x=dog_pos[0], y=dog_pos[1])
+        self.dog_size = dog_size
+        self.magpies = None
+        self.magpies_released = False
+        self.sim_ticks = 0
+        self.timer_start: Optional[int] = None
+        self._deadline: Optional[int] = None
+        self.game_over = False
+        self.win = False
+        self.finished = False
+        self.paused = False
+        self.frozen_time_left: Optional[int] = None
+        self.inputs: List[Tuple[int, int, int]] = []
+        self.last_hit: Optional[Tuple[int, int]] = None
+        self.clock = PasDeTempsFixe(1.0 / sim_hz, MAX_SIM_STEPS)
+
+    @property
+    def phase(self) -> str:
+        """
+        Phase courante de la manche.
+        """
+        if self.finished:
+            return PHASE_FINISHED
+        if self.game_over:
+            return PHASE_OVER
+        if self.paused:
+            return PHASE_PAUSED
+        if self.magpies_released:
+            return PHASE_PLAYING
+        if self.dog.jump_started:
+            return PHASE_JUMPING
+        return PHASE_WAITING
+
+    @property
+    def alpha(self) -> float:
+        """
+        Fraction du pas suivant déjà écoulée, pour interpoler le rendu.
+        """
+        return self.clock.alpha
+
+    @property
+    def time_left(self) -> Optional[int]:
+        """
+        Secondes restantes (figées en fin de partie ou sans minuterie), None tant que les pies ne sont pas lâchées.
+        """
+        if self.frozen_time_left is not None:
+            return self.frozen_time_left
+        if self.timer_start is None:
+            return None
+        if not self.timed:
+            return self.round_time
+        return max(0, self.round_time - secondes_simulees(self.sim_ticks - self.timer_start, self.sim_hz))
+
+    def step(self) -> None:
+        """
+        Avance la manche d'un pas de simulation.
+        """
+        if self.dog.jumping and self.dog.update_jump():
+            self._release()
+        # En fin de partie, la scène se fige
+        if self.magpies is not None and not self.game_over:
+            self.magpies.update(*self._update_args)
+        self.sim_ticks += 1
+        if self._deadline is not None and self.sim_ticks >= self._deadline:
+            self._check_end()
+
+    def run(self, ticks: int) -> None:
+        """
+        Avance la manche de ticks pas de simulation.
+        """
+        step = self.step
+        for _ in range(ticks):
+            step()
+
+    def tick(self, dt: float) -> int:
+        """
+        Avance la manche de dt secondes de temps réel et retourne le nombre de pas simulés.
+        En pause, rien n'avance : la minuterie, comptée en pas, reste figée.
+        """
+        if self.paused:
+            return 0
+        steps = self.clock.avancer(dt)
+        self.run(steps)
+        return steps
+
+    def set_paused(self, paused: bool) -> None:
+        """
+        Suspend ou reprend la manche ; le temps accumulé par l'horloge est oublié
+        pour ne pas rattraper la durée de la pause à la reprise.
+        """
+        self.paused = paused
+        self.clock.reinitialiser()
+
+    def _release(self) -> None:
+        """
+        Lâche les pies à la fin du saut et démarre la minuterie.
+        Les petites nuées restent des listes de Magpie, les grandes passent en tableaux NumPy.
+        """
+        self.magpies_released = True
+        self.timer_start = self.sim_ticks
+        # La défaite au temps tombe au premier pas où il ne reste plus de seconde entière
+        if self.timed:
+            self._deadline = self.timer_start + self.round_time * self.sim_hz
+        flock = MagpieSwarm if self.magpie_count >= SWARM_MIN_COUNT else MagpieFlock
+        self.magpies = flock.create_random(self.magpie_count, self.speed, self.height, MAGPIE_BODY_RADIUS, self.rng)
+        self.magpies.flocking = self.flocking
+        self._update_args = (self.speed, self.width, self.height, MAGPIE_BODY_RADIUS, self.rng)
+
+    def click(self, x: int, y: int) -> Optional[str]:
+        """
+        Applique un clic au pas courant et retourne ce qu'il a déclenché :
+        "dog" (départ du saut), "menu" (clic de fin de partie), "hit", "miss" ou None.
+        Après un "hit", last_hit contient la position de la pie touchée.
+        Les clics d'une manche en pause sont ignorés et ne sont pas enregistrés.
+        """
+        if self.paused:
+            return None
+        self.inputs.append((self.sim_ticks, x, y))
+        result = None
+        if not self.dog.jump_started and self.dog.is_clicked(x, y, *self.dog_size):
+            self.dog.start_jump()
+            result = "dog"
+        if self.game_over:
+            self.finished = True
+            return "menu"
+        if self.magpies_released:
+            if self.ammo > 0:
+                result = "miss"
+                hits = self.magpies.hits_at(x, y, MAGPIE_BODY_RADIUS)
+                if hits:
+                    # Seule la pie la plus proche du clic s'envole ; sa position sert aux effets
+                    self.last_hit = self.magpies.position(hits[0])
+                    self.magpies.fly_away(hits[:1])
+                    self.score = calcule_score(self.score)
+                    result = "hit"
+                self.ammo = consomme_munition(self.ammo)
+            self._check_end()
+        return result
+
+    def _check_end(self) -> None:
+        """
+        Détermine la victoire ou la défaite et fige la minuterie.
+        """
+        if self.game_over or not self.magpies_released:
+            return
+        time_left = self.time_left
+        if verifie_victoire(self.score, self.goal):
+            self.win = True
+        elif not verifie_defaite(self.ammo, time_left):
+            return
+        self.game_over = True
+        self.frozen_time_left = time_left
+
+    def snapshot(self) -> dict:
+        """
+        Retourne une copie de l'état observable de la manche.
+        """
+        return {
+            "phase": self.phase,
+            "difficulty": self.difficulty,
+            "sim_ticks": self.sim_ticks,
+            "score": self.score,
+            "goal": self.goal,
+            "ammo": self.ammo,
+            "time_left": self.time_left,
+            "win": self.win,
+            "dog_y": self.dog.get_jump_y(),
+            "magpies": self.magpies.visible() if self.magpies is not None else [],
+        }
@@ -24,6 +24,85 @@ RED = (255, 0, 0)
 
 MAGPIE_BODY_RADIUS = 32
 
+# À partir de ce nombre de pies, la nuée est stockée en tableaux NumPy (MagpieSwarm) plutôt qu'en liste
+SWARM_MIN_COUNT = 32
+
+# ===========================
+# Paramètres liés au chien
+# ===========================
+
+DOG_SIZE = (200, 170)
+DOG_POS = (55 + 150 + 18, HEIGHT - 170)
+
+# ===========================
+# Paramètres du décor
+# ===========================
+
+TREE_SIZE = (150, 240)
+TREE_POSITIONS = ((55, HEIGHT - 110 - 240 // 2 - 10), (WIDTH - 55 - 150, HEIGHT - 110 - 240 // 2 - 10))
+
+# Cercles (x, y, rayon) autour des arbres, contournés par les pies qui volent en nuée
+TREE_OBSTACLES = tuple((x + 75, y + 130, 100) for x, y in TREE_POSITIONS)
+
+# ===========================
+# Simulation et cadence
+# ===========================
+
+# Pas fixe de la simulation (mises à jour par seconde, indépendamment du rendu)
+SIM_HZ = 60
+
+# Cadence d'affichage visée (0 = sans limite)
+RENDER_FPS = 60
+
+# Nombre maximal de pas de simulation rattrapés par image ; au-delà, le retard est abandonné
+MAX_SIM_STEPS = 5
+
+# Sur un écran figé (menu, fin de partie, pause), attente maximale entre deux vérifications
+# des ressources encore en chargement ; une fois tout chargé, l'attente n'est bornée par rien
+IDLE_POLL_MS = 100
+
+# ===========================
+# Effets de particules
+# ===========================
+
+# Nombre maximal de particules vivantes (tableaux préalloués) ; au-delà, les émissions sont tronquées
+PARTICLE_CAPACITY = 8192
+
+# Plumes projetées par une pie touchée
+FEATHERS_PER_HIT = 48
+
+# ===========================
+# Son
+# ===========================
+
+# Réglages du mixer, fixés avant son démarrage (différé après le premier écran du menu) :
+# fréquence (Hz), format des échantillons, canaux et tampon (échantillons ; petit = faible latence)
+MIXER_SETTINGS = {"frequency": 44100, "size": -16, "channels": 2, "buffer": 512}
+
+# ===========================
+# Options d'affichage
+# ===========================
+
+# Utilise le viseur comme curseur système : il suit la souris indépendamment des images du jeu
+USE_SYSTEM_CURSOR = False
+
+# Rendu par rectangles modifiés : n'envoie à l'écran que les zones qui changent pendant une manche
+DIRTY_RECTS = False
+
+# ==================================================
+# Polices du jeu : rôle -> (famille, taille, gras)
+# ==================================================
+
+FONT_SPECS = {
+    "title": ("Montserrat", 96, False),
+    "button": ("Montserrat", 44, False),
+    "label": ("Montserrat", 28, False),
+    "stat": ("Consolas", 28, False),
+    "instruct": (None, 36, False),
+    "over": (None, 64, True),
+    "sub": (None, 36, False),
+}
+
 # ===========================
 # Préréglages de difficulté
 # ===========================
@@ -31,14 +110,16 @@ MAGPIE_BODY_RADIUS = 32
 DIFFICULTY_SETTINGS = {
     "Facile": {"magpie_count": 1, "speed": 3, "ammo": 10, "goal": 5, "time": 30, "label": "Facile"},
     "Moyen": {"magpie_count": 2, "speed": 5, "ammo": 15, "goal": 10, "time": 30, "label": "Moyen"},
-    "Difficile": {"magpie_count": 4, "speed": 8, "ammo": 10, "goal": 10, "time": 30, "label": "Difficile"},
+    "Difficile": {"magpie_count": 4, "speed": 8, "ammo": 10, "goal": 10, "time": 30, "label": "Difficile", "flocking": False},
 }
 
 # ===========================================================
 # Chemins des ressources (centralisés ici, toujours absolus)
 # ===========================================================
 
+import math
 import os
+import warnings
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 SHELTIE_IMG_PATH = os.path.join(BASE_DIR, "assets", "images", "sheltie.png")
 BARKING_SOUND_PATH = os.path.join(BASE_DIR, "assets", "audio", "barking.mp3")
@@ -48,3 +129,61 @@ BACKGROUND_IMG_PATH = os.path.join(BASE_DIR, "assets", "images", "background.jpg
 BIRD_IMG_PATH = os.path.join(BASE_DIR, "assets", "images", "bird.png")
 AMMO_IMG_PATH = os.path.join(BASE_DIR, "assets", "images", "ammo.png")
 TIMER_IMG_PATH = os.path.join(BASE_DIR, "assets", "images", "timer.png")
+
+# Caches générés au premier lancement (non versionnés)
+CACHE_DIR = os.path.join(BASE_DIR, "assets", ".cache")
+FONT_INDEX_PATH = os.path.join(CACHE_DIR, "fonts.json")
+IMAGE_CACHE_DIR = os.path.join(CACHE_DIR, "images")
+
+# Conserve sur disque les images déjà redimensionnées et converties au format de l'affichage
+ASSET_DISK_CACHE = True
+
+# Budget mémoire du cache des ressources (octets) ; les entrées épinglées ne sont jamais évincées
+RESOURCE_CACHE_BUDGET = 64 * 1024 * 1024
+
+# Relecture de la dernière manche jouée (graine, difficulté et clics horodatés) ; désactivée par défaut
+# pour ne rien écrire à côté du jeu, activable avec la variable d'environnement CHASSE_EXPRESS_RELECTURES=1
+RECORD_REPLAYS = os.environ.get("CHASSE_EXPRESS_RELECTURES", "") not in ("", "0")
+REPLAY_DIR = os.path.join(BASE_DIR, "replays")
+LAST_REPLAY_PATH = os.path.join(REPLAY_DIR, "derniere_manche.cerp")
+
+# Exports CSV/JSON du profileur d'images
+PROFILE_DIR = os.path.join(BASE_DIR, "profils")
+
+# ===========================
+# Profileur d'images
+# ===========================
+
+# Enregistre la durée de chaque phase des images dès le lancement (F3 : superposition, F4 : export) ;
+# activable sans modifier le code avec la variable d'environnement CHASSE_EXPRESS_PROFIL=1
+PROFILER_ENABLED = os.environ.get("CHASSE_EXPRESS_PROFIL", "") not in ("", "0")
+
+# Images conservées par le tampon circulaire du profileur (une minute à 60 images/s)
+PROFILER_FRAMES = 3600
+
+# Images prises en compte par les moyennes glissantes de la superposition
+PROFILER_WINDOW = 120
+
+# ===========================
+# Résolution interne du rendu
+# ===========================
+
+# Fraction de WIDTH x HEIGHT à laquelle les images sont dessinées (0.5 : quatre fois moins de pixels à remplir) ;
+# elles sont agrandies une fois par image dans la fenêtre, qui garde sa taille. La simulation, les clics
+# et les relectures restent en coordonnées du jeu. Réglable sans modifier le code avec la variable d'environnement CHASSE_EXPRESS_ECHELLE=0.5
+
+def lire_echelle_rendu(valeur: str) -> float:
+    """
+    Convertit la valeur de CHASSE_EXPRESS_ECHELLE en échelle de rendu, bornée entre 0.25 et 1 ;
+    une valeur qui n'est pas un nombre est ignorée (échelle 1) avec un avertissement.
+    """
+    try:
+        echelle = float(valeur)
+    except ValueError:
+        echelle = math.nan
+    if math.isnan(echelle):
+        warnings.warn(f"CHASSE_EXPRESS_ECHELLE={valeur!r} n'est pas un nombre : rendu à l'échelle 1.")
+        return 1.0
+    return min(1.0, max(0.25, echelle))
+
+RENDER_SCALE = lire_echelle_rendu(os.environ.get("CHASSE_EXPRESS_ECHELLE", "1"))
@@ -0,0 +1,156 @@
+# ==================================================
+# Index spatial pour les tests de tir (grille uniforme)
+# ==================================================
+
+# ----- Imports -----
+import math
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+# ==============================
+# Classe SpatialGrid
+# ==============================
+class SpatialGrid:
+    """
+    Grille uniforme qui range des cercles de rayon body_radius par cellule.
+    sync() ne déplace que les identifiants dont la cellule a changé depuis la synchronisation précédente ;
+    les requêtes ne parcourent que les cellules couvertes par la zone cherchée.
+    Les résultats sont triés par distance au centre croissante, puis par identifiant.
+    """
+
+    def __init__(self, body_radius: float, cell_size: float = None) -> None:
+        self.body_radius = body_radius
+        self.cell_size = cell_size if cell_size else max(1.0, 2.0 * body_radius)
+        self.cells: Dict[Tuple[int, int], Set[int]] = {}
+        self._cell_x = np.zeros(0, dtype=np.int64)
+        self._cell_y = np.zeros(0, dtype=np.int64)
+        self._present = np.zeros(0, dtype=bool)
+        self._positions = np.zeros((0, 2), dtype=np.float64)
+
+    def __len__(self) -> int:
+        return int(self._present.sum())
+
+    def _resize(self, count: int) -> None:
+        """
+        Adapte les tableaux internes à un nombre d'identifiants différent.
+        """
+        for i in np.flatnonzero(self._present[count:]) + count:
+            self._discard(int(i))
+        keep = min(count, len(self._present))
+        grow = count - keep
+        self._cell_x = np.concatenate((self._cell_x[:keep], np.zeros(grow, dtype=np.int64)))
+        self._cell_y = np.concatenate((self._cell_y[:keep], np.zeros(grow, dtype=np.int64)))
+        self._present = np.concatenate((self._present[:keep], np.zeros(grow, dtype=bool)))
+
+    def _discard(self, i: int) -> None:
+        key = (int(self._cell_x[i]), int(self._cell_y[i]))
+        bucket = self.cells.get(key)
+        if bucket is not None:
+            bucket.discard(i)
+            if not bucket:
+                del self.cells[key]
+
+    def sync(self, positions: "np.ndarray", active: "np.ndarray") -> int:
+        """
+        Met l'index à jour avec les positions (n, 2) ; seuls les identifiants actifs sont indexés.
+        Retourne le nombre d'identifiants déplacés.
+        """
+        if len(positions) != len(self._present):
+            self._resize(len(positions))
+        cell_x = np.floor(positions[:, 0] / self.cell_size).astype(np.int64)
+        cell_y = np.floor(positions[:, 1] / self.cell_size).astype(np.int64)
+        active = np.asarray(active, dtype=bool)
+        changed = (active != self._present) | (active & ((cell_x != self._cell_x) | (cell_y != self._cell_y)))
+        moved = np.flatnonzero(changed)
+        for i in moved.tolist():
+            if self._present[i]:
+                self._discard(i)
+            if active[i]:
+                self.cells.setdefault((int(cell_x[i]), int(cell_y[i])), set()).add(i)
+        self._cell_x, self._cell_y, self._present = cell_x, cell_y, active.copy()
+        self._positions = np.array(positions, dtype=np.float64)
+        return len(moved)
+
+    def _candidates(self, x: float, y: float, reach: float) -> List[int]:
+        """
+        Identifiants rangés dans les cellules qui recouvrent le carré de demi-côté reach autour de (x, y).
+        """
+        size = self.cell_size
+        x0, x1 = math.floor((x - reach) / size), math.floor((x + reach) / size)
+        y0, y1 = math.floor((y - reach) / size), math.floor((y + reach) / size)
+        found = []
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(self.cells):
+            for (cx, cy), bucket in self.cells.items():
+                if x0 <= cx <= x1 and y0 <= cy <= y1:
+                    found.extend(bucket)
+        else:
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    bucket = self.cells.get((cx, cy))
+                    if bucket:
+                        found.extend(bucket)
+        return found
+
+    def query_radius(self, x: float, y: float, radius: float = 0.0) -> List[int]:
+        """
+        Identifiants dont le cercle touche le disque de centre (x, y) et de rayon radius,
+        du centre le plus proche au plus éloigné (à égalité, le plus petit identifiant).
+        """
+        reach = radius + self.body_radius
+        found = self._candidates(x, y, reach)
+        if not found:
+            return []
+        ids = np.array(found, dtype=np.int64)
+        dx = x - self._positions[ids, 0]
+        dy = y - self._positions[ids, 1]
+        dist2 = dx * dx + dy * dy
+        inside = dist2 <= reach * reach
+        ids, dist2 = ids[inside], dist2[inside]
+        order = np.lexsort((ids, dist2))
+        return ids[order].tolist()
+
+    def query_point(self, x: float, y: float) -> List[int]:
+        """
+        Identifiants dont le cercle contient le point (x, y), du centre le plus proche au plus éloigné.
+        """
+        return self.query_radius(x, y, 0.0)
+
+# ==============================
+# Voisinage de toute une nuée
+# ==============================
+
+def neighbor_pairs(positions: "np.ndarray", active: "np.ndarray", radius: float) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Couples (i, j), i != j, d'identifiants actifs distants d'au plus radius, dans les deux sens.
+    Les points sont rangés dans une grille uniforme de pas radius puis triés par cellule :
+    chaque point n'est comparé qu'aux points des 9 cellules voisines de la sienne,
+    d'où un coût proche de O(n + couples) au lieu de O(n²). Tout est calculé par tableaux NumPy.
+    """
+    empty = np.zeros(0, dtype=np.int64)
+    ids = np.flatnonzero(active)
+    if ids.size < 2:
+        return empty, empty
+    points = positions[ids]
+    cells = np.floor(points / radius).astype(np.int64)
+    # Décalage pour que les cellules voisines (-1) aient aussi une clé positive et unique
+    cells -= cells.min(axis=0) - 1
+    rows = int(cells[:, 1].max()) + 2
+    keys = cells[:, 0] * rows + cells[:, 1]
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    # Clés des 9 cellules voisines de chaque point, cherchées d'un seul coup dans les clés triées
+    offsets = np.array((-rows - 1, -rows, -rows + 1, -1, 0, 1, rows - 1, rows, rows + 1), dtype=np.int64)
+    targets = (keys[:, None] + offsets).ravel()
+    start = np.searchsorted(sorted_keys, targets, side="left")
+    counts = np.searchsorted(sorted_keys, targets, side="right") - start
+    total = int(counts.sum())
+    if not total:
+        return empty, empty
+    # Déroulement des plages [start, start + count) sans boucle Python
+    first = np.repeat(np.arange(len(targets)) // len(offsets), counts)
+    rank = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    second = order[np.repeat(start, counts) + rank]
+    delta = points[second] - points[first]
+    close = (first != second) & ((delta * delta).sum(axis=1) <= radius * radius)
+    return ids[first[close]], ids[second[close]]
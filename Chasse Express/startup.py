@@ -0,0 +1,61 @@
+# ==================================================
+# Mesure du démarrage : imports, initialisations et premier écran du menu
+# ==================================================
+# Importé en premier par chasse_express, avant pygame : la chronologie part du début des imports du jeu.
+
+# ----- Imports -----
+import time
+
+# ==============================
+# Classe ProfilDemarrage
+# ==============================
+class ProfilDemarrage:
+    """
+    Chronologie du démarrage : chaque étape marquée reçoit le temps écoulé depuis la précédente.
+    terminer() clôt la chronologie au premier écran interactif.
+    """
+
+    def __init__(self) -> None:
+        self.debut = time.perf_counter()
+        self._marque = self.debut
+        self.etapes = []
+        self.termine = False
+
+    def marquer(self, etape: str) -> None:
+        """
+        Enregistre la durée de l'étape qui vient de s'achever.
+        """
+        if self.termine:
+            return
+        maintenant = time.perf_counter()
+        self.etapes.append((etape, maintenant - self._marque))
+        self._marque = maintenant
+
+    def terminer(self, etape: str) -> float:
+        """
+        Marque la dernière étape et retourne la durée totale du démarrage (ms).
+        """
+        self.marquer(etape)
+        self.termine = True
+        return self.total_ms()
+
+    def total_ms(self) -> float:
+        """
+        Durée (ms) entre le début des imports et la dernière étape marquée.
+        """
+        return (self._marque - self.debut) * 1e3
+
+    def rapport(self) -> str:
+        """
+        Tableau des étapes : durée, part du total et temps cumulé.
+        """
+        total = self.total_ms() or 1.0
+        lignes = [f"{'étape':44}{'ms':>9}{'part':>7}{'cumul':>9}"]
+        cumul = 0.0
+        for etape, duree in self.etapes:
+            cumul += duree * 1e3
+            lignes.append(f"{etape:44}{duree * 1e3:>9.1f}{duree * 1e3 / total:>7.0%}{cumul:>9.1f}")
+        return "\n".join(lignes)
+
+# Chronologie du démarrage du jeu
+DEMARRAGE = ProfilDemarrage()
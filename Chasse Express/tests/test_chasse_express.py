@@ -5,15 +5,35 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 # === Imports pour les tests ===
 from ui import (
     obtenir_surface_panneau, dessiner_icone_texte, dessiner_texte_avec_contour,
-    dessiner_panneau_etat, dessiner_fond
+    dessiner_panneau_etat, dessiner_fond, dessiner_pie, obtenir_sprite_pie, _rasteriser_pie,
+    CacheTexteContour, rendre_texte_avec_contour, rendre_titre_degrade, PanneauEtat,
+    dessiner_viseur, obtenir_surface_viseur, dessiner_bouton, BoutonPrerendu
 )
-from resources import load_font, load_icon
-from settings import DIFFICULTY_SETTINGS
-from entities import Magpie, Dog
+from resources import load_font, load_icon, init_fonts, get_font, font_report, save_font_index
+import resources
+from rendering import composer_calque_statique, ZonesSales, AtlasTextures, SpritesParticules, EchelleRendu
+from settings import DIFFICULTY_SETTINGS, lire_echelle_rendu
+from entities import Magpie, MagpieSwarm, Dog
+from spatial import SpatialGrid, neighbor_pairs
+from flocking import FlockingRules
+from particles import ParticleSystem, KIND_POPUP, KIND_FLASH, KIND_COUNT, FADE_LEVELS, sprite_code
+import numpy as np
 from chasse_express import (
     calcule_score, consomme_munition, verifie_victoire, verifie_defaite
 )
+from utils import PasDeTempsFixe, secondes_simulees
+from events import attendre_evenements, EtatFenetre
+from session import GameSession, PHASE_WAITING, PHASE_JUMPING, PHASE_PLAYING, PHASE_PAUSED, PHASE_OVER, PHASE_FINISHED
+from entities import MagpieFlock
+from replay import Replay, Relecteur, rejouer
+from balance import Tireur, jouer_manche_auto, equilibrer, centile
+from profiler import ProfileurImages, SuperpositionProfil
+from startup import ProfilDemarrage
+from benchmarks.suite import comparer, remesurer
+from settings import DOG_POS, DOG_SIZE, MAGPIE_BODY_RADIUS
 
+import math
+import random
 import unittest
 
 # === Tests settings.py ===
@@ -44,6 +64,15 @@ class TestGetDifficultySettings(unittest.TestCase):
         params = DIFFICULTY_SETTINGS.get("Impossible")
         self.assertIsNone(params)
 
+    def test_lire_echelle_rendu(self):
+        # Vérifie les bornes de l'échelle de rendu et le repli sur 1 pour une valeur invalide
+        self.assertEqual(lire_echelle_rendu("0.5"), 0.5)
+        self.assertEqual(lire_echelle_rendu("0.1"), 0.25)
+        self.assertEqual(lire_echelle_rendu("3"), 1.0)
+        for valeur in ("", "demi", "nan"):
+            with self.assertWarns(UserWarning):
+                self.assertEqual(lire_echelle_rendu(valeur), 1.0)
+
 # === Tests entities.py ===
 class TestMagpie(unittest.TestCase):
     def test_create_random(self):
@@ -105,6 +134,243 @@ class TestMagpie(unittest.TestCase):
         hit = magpie.check_hit(100, 100, 32)
         self.assertFalse(hit)
 
+    def test_compact_layout(self):
+        # Vérifie la représentation à __slots__ et les couples pos/vel
+        magpie = Magpie(pos=[10, 20], vel=[3, -4])
+        self.assertFalse(hasattr(magpie, "__dict__"))
+        self.assertEqual((magpie.x, magpie.y, magpie.vx, magpie.vy), (10, 20, 3, -4))
+        self.assertEqual(magpie.pos, (10, 20))
+        magpie.pos = (5, 6)
+        self.assertEqual(magpie.get_position(), (5, 6))
+        self.assertFalse(hasattr(Dog(x=0, y=0), "__dict__"))
+
+class TestMagpieSwarm(unittest.TestCase):
+    def _etats(self, magpies):
+        return [(list(m.pos), list(m.vel), m.flying_away, m.fly_away_timer) for m in magpies]
+
+    def test_swarm_matches_scalar_path(self):
+        # Vérifie que la nuée vectorisée reproduit exactement une liste de Magpie avec la même graine
+        # (le clic fait s'envoler la pie touchée dont le centre est le plus proche)
+        random.seed(42)
+        scalaires = [Magpie.create_random(8, 600, 32) for _ in range(30)] + [Magpie(pos=[20, 20], vel=[0, -3])]
+        historique, clics = [], []
+        for etape in range(300):
+            for m in scalaires:
+                m.update(8, 800, 600, 32)
+            if etape % 5 == 0:
+                cible = scalaires[etape % len(scalaires)]
+                clic = (int(cible.pos[0]), int(cible.pos[1]))
+                clics.append(clic)
+                touchees = [m for m in scalaires if not m.flying_away
+                            and (clic[0] - m.pos[0]) ** 2 + (clic[1] - m.pos[1]) ** 2 <= 32 * 32]
+                if touchees:
+                    min(touchees, key=lambda m: (clic[0] - m.pos[0]) ** 2 + (clic[1] - m.pos[1]) ** 2).check_hit(*clic, 32)
+            historique.append(self._etats(scalaires))
+        random.seed(42)
+        nuee = MagpieSwarm.create_random(30, 8, 600, 32)
+        nuee = MagpieSwarm.from_magpies(nuee.to_magpies() + [Magpie(pos=[20, 20], vel=[0, -3])])
+        for etape in range(300):
+            nuee.update(8, 800, 600, 32)
+            if etape % 5 == 0:
+                nuee.check_hit(*clics[etape // 5], 32)
+            self.assertEqual(self._etats(nuee.to_magpies()), historique[etape])
+
+    def test_swarm_visible_and_hit(self):
+        # Vérifie visible() et qu'un clic ne fait s'envoler que la première pie touchée
+        nuee = MagpieSwarm.from_magpies([
+            Magpie(pos=[100.7, 100.2], vel=[-1, 0]),
+            Magpie(pos=[101, 101], vel=[1, 0]),
+        ])
+        self.assertEqual(nuee.visible(), [(100, 100, True), (101, 101, False)])
+        self.assertEqual(nuee.position(0), MagpieFlock(nuee.to_magpies()).position(0))
+        self.assertTrue(nuee.check_hit(100, 100, 32))
+        self.assertEqual(nuee.flying_away.tolist(), [True, False])
+        self.assertEqual(nuee.visible(), [(101, 101, False)])
+        self.assertFalse(nuee.check_hit(400, 400, 32))
+
+class TestSpatialGrid(unittest.TestCase):
+    def test_query_point_closest_first(self):
+        # Vérifie les pies contenant un point, triées par distance au centre puis par indice
+        grille = SpatialGrid(32)
+        positions = np.array([[100.0, 100.0], [120.0, 100.0], [90.0, 100.0], [400.0, 400.0]])
+        grille.sync(positions, np.array([True, True, True, True]))
+        self.assertEqual(grille.query_point(105, 100), [0, 1, 2])
+        self.assertEqual(grille.query_point(104, 100), [0, 2, 1])
+        self.assertEqual(grille.query_point(400, 431), [3])
+        self.assertEqual(grille.query_point(400, 433), [])
+
+    def test_incremental_sync(self):
+        # Vérifie que seuls les identifiants qui changent de cellule ou d'état sont déplacés
+        grille = SpatialGrid(10, cell_size=50)
+        positions = np.array([[10.0, 10.0], [60.0, 10.0], [200.0, 200.0]])
+        self.assertEqual(grille.sync(positions, np.array([True, True, True])), 3)
+        positions[0] += 5
+        positions[1] += 50
+        self.assertEqual(grille.sync(positions, np.array([True, True, False])), 2)
+        self.assertEqual(len(grille), 2)
+        self.assertEqual(grille.query_point(200, 200), [])
+        self.assertEqual(grille.query_point(110, 60), [1])
+
+    def test_query_radius_matches_brute_force(self):
+        # Vérifie la requête par rayon contre un parcours exhaustif
+        rng = np.random.default_rng(3)
+        positions = rng.uniform(0, 800, size=(500, 2))
+        actives = rng.random(500) < 0.8
+        grille = SpatialGrid(32)
+        grille.sync(positions, actives)
+        for x, y, rayon in [(400, 300, 0), (10, 10, 80), (790, 500, 150)]:
+            d2 = ((positions - (x, y)) ** 2).sum(axis=1)
+            attendus = [i for i in sorted(range(500), key=lambda i: (d2[i], i))
+                        if actives[i] and d2[i] <= (rayon + 32) ** 2]
+            self.assertEqual(grille.query_radius(x, y, rayon), attendus)
+
+    def test_swarm_area_hit(self):
+        # Vérifie le tir de zone sur la nuée et la resynchronisation après envol
+        nuee = MagpieSwarm.from_magpies([Magpie(pos=[100, 100]), Magpie(pos=[300, 100]), Magpie(pos=[150, 100])])
+        self.assertEqual(nuee.within(100, 100, 30, 32), [0, 2])
+        nuee.fly_away([0])
+        self.assertEqual(nuee.hits_at(110, 100, 32), [])
+        self.assertEqual(nuee.within(100, 100, 30, 32), [2])
+
+    def test_neighbor_pairs_match_brute_force(self):
+        # Vérifie les couples de voisines trouvés par grille contre toutes les comparaisons deux à deux
+        rng = np.random.default_rng(5)
+        positions = rng.uniform(-50, 600, size=(300, 2))
+        actives = rng.random(300) < 0.85
+        premieres, secondes = neighbor_pairs(positions, actives, 45)
+        proches = ((positions[:, None] - positions[None]) ** 2).sum(axis=2) <= 45 ** 2
+        np.fill_diagonal(proches, False)
+        proches &= actives[:, None] & actives[None, :]
+        attendus = sorted(zip(*(indices.tolist() for indices in np.nonzero(proches))))
+        self.assertEqual(sorted(zip(premieres.tolist(), secondes.tolist())), attendus)
+        self.assertEqual(len(neighbor_pairs(positions[:1], actives[:1], 45)[0]), 0)
+
+class TestFlocking(unittest.TestCase):
+    def _avancer(self, nuee, pas, graine=2):
+        rng = random.Random(graine)
+        for _ in range(pas):
+            nuee.update(6, 800, 600, 32, rng)
+
+    def test_list_and_arrays_agree(self):
+        # Vérifie que le vol en nuée scalaire (liste) et vectorisé (grille) donnent les mêmes trajectoires
+        pies = MagpieFlock.create_random(12, 6, 600, 32, random.Random(3))
+        nuee = MagpieSwarm.from_magpies([Magpie(pos=m.pos, vel=m.vel) for m in pies.to_magpies()])
+        pies.flocking = nuee.flocking = FlockingRules()
+        self._avancer(pies, 100)
+        self._avancer(nuee, 100)
+        np.testing.assert_allclose([m.pos for m in pies.to_magpies()], nuee.pos, atol=1e-6)
+
+    def test_separation_and_speed_limits(self):
+        # Vérifie que deux pies trop proches s'écartent et que la vitesse reste dans ses bornes
+        regles = FlockingRules(obstacles=())
+        pies = [Magpie(pos=(400, 200), vel=(6, 0)), Magpie(pos=(420, 200), vel=(6, 0))]
+        regles.steer_magpies(pies, 6)
+        self.assertLess(pies[0].vx, pies[1].vx)
+        pies[0].vel = (50, 0)
+        pies[1].vel = (0.1, 0)
+        pies[1].pos = (700, 200)
+        regles.steer_magpies(pies, 6)
+        self.assertAlmostEqual(math.hypot(*pies[0].vel), regles.max_speed * 6)
+        self.assertAlmostEqual(math.hypot(*pies[1].vel), regles.min_speed * 6)
+
+    def test_trees_are_avoided(self):
+        # Vérifie qu'une pie lancée vers un arbre le contourne
+        x, y, rayon = 300, 400, 60
+        nuee = MagpieFlock([Magpie(pos=(x - rayon - 60, y), vel=(6, 0))])
+        nuee.flocking = FlockingRules(obstacles=((x, y, rayon),))
+        plus_pres = float("inf")
+        for _ in range(60):
+            nuee.update(6, 800, 1200, 32)
+            m = nuee.magpies[0]
+            plus_pres = min(plus_pres, math.hypot(m.x - x, m.y - y))
+        self.assertGreater(plus_pres, rayon)
+
+    def test_session_uses_difficulty_setting(self):
+        # Vérifie que la clé "flocking" du préréglage active le vol en nuée (désactivé par défaut partout)
+        for niveau in DIFFICULTY_SETTINGS:
+            self.assertIsNone(GameSession(niveau, 1, DOG_POS, DOG_SIZE).flocking)
+        settings = dict(DIFFICULTY_SETTINGS["Difficile"], flocking=True)
+        session = GameSession("Difficile", 1, DOG_POS, DOG_SIZE, settings=settings)
+        session.click(DOG_POS[0] + 10, DOG_POS[1] + 10)
+        session.run(120)
+        self.assertIsInstance(session.magpies.flocking, FlockingRules)
+        reglee = GameSession("Facile", 1, DOG_POS, DOG_SIZE, settings=dict(DIFFICULTY_SETTINGS["Facile"], flocking={"radius": 80.0}))
+        self.assertEqual(reglee.flocking.radius, 80.0)
+
+class TestParticleSystem(unittest.TestCase):
+
+    def test_free_list_and_overflow(self):
+        # Vérifie que les emplacements sont réutilisés sans réallocation et que le dépassement est compté
+        particules = ParticleSystem(capacity=16, seed=0)
+        tableaux = (particules.x, particules.vy, particules.alive)
+        self.assertEqual(particules.emit(KIND_FLASH, 5, 5, 10, speed=(10, 20), life=(0.5, 0.5)), 10)
+        self.assertEqual(particules.feather_burst(5, 5, 10), 6)
+        self.assertEqual(particules.stats(), {"capacity": 16, "alive": 16, "peak": 16, "emitted": 16, "overflow": 4})
+        particules.update(0.6)
+        self.assertEqual(len(particules), 6)
+        particules.update(2.0)
+        self.assertEqual(len(particules), 0)
+        self.assertEqual(particules.emit(KIND_FLASH, 0, 0, 16, speed=(0, 0), life=(1, 1)), 16)
+        self.assertEqual(sorted(np.flatnonzero(particules.alive).tolist()), list(range(16)))
+        self.assertTrue(all(a is b for a, b in zip(tableaux, (particules.x, particules.vy, particules.alive))))
+        particules.clear()
+        self.assertEqual(len(particules), 0)
+        self.assertEqual(particules.stats()["emitted"], 32)
+
+    def test_motion_and_fade(self):
+        # Vérifie le déplacement vectorisé et le niveau d'estompage selon l'âge
+        particules = ParticleSystem(capacity=4, seed=0)
+        particules.score_popup(100, 200)
+        codes, xs, ys = particules.visible()
+        self.assertEqual(codes.tolist(), [sprite_code(KIND_POPUP, 0)])
+        particules.update(0.5)
+        codes, xs, ys = particules.visible()
+        self.assertAlmostEqual(xs[0], 100)
+        self.assertLess(ys[0], 200)
+        self.assertEqual(codes.tolist(), [sprite_code(KIND_POPUP, FADE_LEVELS * 5 // 8)])
+        # La gravité fait retomber les plumes
+        particules.clear()
+        particules.emit(KIND_FLASH, 0, 0, 1, speed=(0, 0), life=(10, 10), gravity=100.0)
+        for _ in range(10):
+            particules.update(0.1)
+        self.assertGreater(particules.visible()[2][0], 0)
+
+    def test_visible_matches_alive(self):
+        # Vérifie que visible() ne rend que les particules vivantes, dans des copies indépendantes de l'état
+        particules = ParticleSystem(capacity=64, seed=0)
+        particules.feather_burst(10, 10, 40)
+        particules.emit(KIND_FLASH, 0, 0, 10, speed=(0, 0), life=(0.05, 0.05))
+        self.assertEqual(len(particules.visible()[0]), 50)
+        particules.update(0.1)
+        codes, xs, ys = particules.visible()
+        self.assertEqual(len(codes), 40)
+        self.assertTrue(all(code // FADE_LEVELS != KIND_FLASH for code in codes.tolist()))
+        for tableau in (xs, ys):
+            self.assertFalse(np.shares_memory(tableau, particules.x) or np.shares_memory(tableau, particules.y))
+        # Les positions rendues sont celles des emplacements vivants, et les tampons sont réutilisés
+        vivants = np.flatnonzero(particules.alive)
+        self.assertEqual(sorted(xs.tolist()), sorted(particules.x[vivants].tolist()))
+        particules.update(1.0)
+        particules.muzzle_flash(0, 0)
+        suivants = particules.visible()
+        self.assertEqual(len(suivants[0]), len(particules))
+        for avant, apres in zip((codes, xs, ys), suivants):
+            self.assertTrue(np.shares_memory(avant, apres))
+
+    def test_expiry_order(self):
+        # Vérifie que les particules expirent à leur date de fin de vie, quel que soit l'ordre d'émission
+        particules = ParticleSystem(capacity=8, seed=0)
+        particules.emit(KIND_FLASH, 0, 0, 2, speed=(0, 0), life=(1.0, 1.0))
+        particules.update(0.25)
+        particules.emit(KIND_POPUP, 0, 0, 2, speed=(0, 0), life=(0.5, 0.5))
+        particules.emit(KIND_FLASH, 0, 0, 1, speed=(0, 0), life=(2.0, 2.0))
+        vivants = []
+        for _ in range(10):
+            particules.update(0.25)
+            vivants.append(len(particules))
+            self.assertEqual(int(particules.alive.sum()), len(particules))
+        self.assertEqual(vivants, [5, 3, 1, 1, 1, 1, 1, 0, 0, 0])
+
 class TestDog(unittest.TestCase):
     def test_start_jump_and_update(self):
         # Vérifie que le saut démarre et se termine correctement
@@ -170,6 +436,37 @@ class TestUIFunctions(unittest.TestCase):
         font = load_font("Consolas", 20)
         dessiner_texte_avec_contour(surf, "Test", font, (0,0), (255,255,255))
 
+    def test_outlined_text_cache(self):
+        # Vérifie que le composite est réutilisé d'un appel à l'autre
+        import pygame
+        pygame.init()
+        font = load_font("Consolas", 20)
+        surf1, decalage = rendre_texte_avec_contour("Cache", font, (10, 20, 30))
+        surf2, _ = rendre_texte_avec_contour("Cache", font, (10, 20, 30))
+        self.assertIs(surf1, surf2)
+        self.assertEqual(decalage, (-2, -2))
+        self.assertEqual(surf1.get_width(), font.size("Cache")[0] + 6)
+
+    def test_outlined_text_cache_eviction(self):
+        # Vérifie l'éviction LRU et les compteurs du cache
+        cache = CacheTexteContour(max_entrees=2)
+        cache.obtenir("a", lambda: 1)
+        cache.obtenir("b", lambda: 2)
+        cache.obtenir("a", lambda: 1)
+        cache.obtenir("c", lambda: 3)
+        self.assertEqual(cache.stats(), {"entrees": 2, "max_entrees": 2, "hits": 1, "misses": 3, "evictions": 1})
+        self.assertEqual(cache.obtenir("b", lambda: "nouveau"), "nouveau")
+
+    def test_gradient_title(self):
+        # Vérifie que le titre en dégradé est composé en une seule surface
+        import pygame
+        pygame.init()
+        font = load_font("Consolas", 20)
+        titre, decalage, largeur = rendre_titre_degrade("Titre", font, ((255, 0, 0), (0, 0, 255)))
+        self.assertEqual(largeur, sum(font.size(ch)[0] for ch in "Titre"))
+        self.assertGreaterEqual(titre.get_width(), largeur)
+        self.assertIs(rendre_titre_degrade("Titre", font, ((255, 0, 0), (0, 0, 255)))[0], titre)
+
     def test_get_panel_surface(self):
         surf, shadow = obtenir_surface_panneau(100, 40)
         self.assertIsNotNone(surf)
@@ -187,12 +484,199 @@ class TestUIFunctions(unittest.TestCase):
             stat_font, font, obtenir_surface_panneau
         )
 
+    def test_status_panel_redraws_only_on_change(self):
+        # Vérifie que le panneau retenu n'est recomposé que si une valeur change
+        import pygame
+        pygame.init()
+        surf = pygame.Surface((400, 80))
+        font = load_font("Consolas", 20)
+        panneau = PanneauEtat(None, None, None, font, font)
+        self.assertTrue(panneau.dessiner(surf, 0, 0, "Test", 1, 2, 3, 4))
+        compose = panneau.surface
+        self.assertFalse(panneau.dessiner(surf, 0, 0, "Test", 1, 2, 3, 4))
+        self.assertIs(panneau.surface, compose)
+        glyphe_niveau = panneau.glyphes[0]
+        self.assertTrue(panneau.dessiner(surf, 0, 0, "Test", 1, 2, 3, 3))
+        self.assertIs(panneau.glyphes[0], glyphe_niveau)
+        self.assertTrue(panneau.rect.colliderect(pygame.Rect(0, 0, 10, 10)))
+
+    def test_crosshair_is_cached(self):
+        # Vérifie que le viseur est rendu une seule fois et centré sur la position
+        import pygame
+        surf = pygame.Surface((100, 100))
+        self.assertIs(obtenir_surface_viseur(), obtenir_surface_viseur())
+        rect = dessiner_viseur(surf, (50, 50))
+        self.assertEqual(rect.center, (50, 50))
+
+    def test_prerendered_button_matches_draw(self):
+        # Vérifie que les états pré-rendus correspondent au dessin direct du bouton
+        import pygame
+        pygame.init()
+        font = load_font("Consolas", 20)
+        rect = pygame.Rect(10, 5, 120, 40)
+        bouton = BoutonPrerendu(rect, "Moyen", font, (220, 200, 80))
+        for survol in (False, True):
+            attendu = pygame.Surface((150, 60))
+            obtenu = pygame.Surface((150, 60))
+            dessiner_bouton(attendu, rect, "Moyen", font, (220, 200, 80), survol)
+            self.assertEqual(bouton.dessiner(obtenu, survol), rect)
+            self.assertEqual(pygame.image.tobytes(attendu, "RGB"), pygame.image.tobytes(obtenu, "RGB"))
+
+    def test_scaled_button_and_panel(self):
+        # Vérifie qu'à l'échelle 0.5 le bouton garde son rectangle du jeu et que le panneau est réduit
+        import pygame
+        pygame.init()
+        font = load_font("Consolas", 20)
+        bouton = BoutonPrerendu(pygame.Rect(100, 40, 120, 40), "Moyen", font, (220, 200, 80), echelle=0.5)
+        self.assertEqual(bouton.rect, pygame.Rect(100, 40, 120, 40))
+        self.assertEqual(bouton.dessiner(pygame.Surface((200, 100))), pygame.Rect(50, 20, 60, 20))
+        plein = PanneauEtat(None, None, None, font, font)
+        reduit = PanneauEtat(None, None, None, font, font, echelle=0.5)
+        plein.dessiner(pygame.Surface((400, 80)), 10, 10, "Test", 1, 2, 3, 4)
+        reduit.dessiner(pygame.Surface((200, 40)), 10, 10, "Test", 1, 2, 3, 4)
+        self.assertEqual(reduit.surface.get_width(), plein.surface.get_width() // 2)
+        self.assertEqual(reduit.rect.topleft, (5, 5))
+
     def test_draw_landfill_background(self):
         import pygame
         pygame.init()
         surf = pygame.Surface((100, 40))
         dessiner_fond(surf, None)
 
+    def test_draw_magpie_sprite_matches_primitives(self):
+        # Vérifie que le sprite en cache reproduit exactement le tracé primitif
+        import pygame
+        attendu = pygame.Surface((300, 120), pygame.SRCALPHA)
+        obtenu = attendu.copy()
+        _rasteriser_pie(attendu, (150, 60))
+        rect = dessiner_pie(obtenu, (150, 60))
+        self.assertEqual(pygame.image.tobytes(attendu, "RGBA"), pygame.image.tobytes(obtenu, "RGBA"))
+        self.assertTrue(rect.contains(attendu.get_bounding_rect()))
+
+    def test_magpie_sprite_cache_and_mirror(self):
+        # Vérifie que le sprite est mis en cache et que la variante miroir regarde à gauche
+        import pygame
+        self.assertIs(obtenir_sprite_pie(), obtenir_sprite_pie())
+        droite = pygame.Surface((300, 120), pygame.SRCALPHA)
+        gauche = droite.copy()
+        dessiner_pie(droite, (150, 60))
+        dessiner_pie(gauche, (149, 60), vers_gauche=True)
+        self.assertEqual(pygame.image.tobytes(pygame.transform.flip(droite, True, False), "RGBA"),
+                         pygame.image.tobytes(gauche, "RGBA"))
+
+# === Tests rendering.py ===
+class TestRendering(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        import pygame
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pygame.display.init()
+        cls.ecran = pygame.display.set_mode((64, 48))
+
+    def test_static_layer(self):
+        # Vérifie la composition du calque statique
+        import pygame
+        arbre = pygame.Surface((4, 4))
+        arbre.fill((0, 255, 0))
+        calque = composer_calque_statique((64, 48), None, ((arbre, (10, 10)), (None, (0, 0))))
+        self.assertEqual(calque.get_at((11, 11))[:3], (0, 255, 0))
+        self.assertEqual(calque.get_at((0, 0))[:3], (100, 180, 255))
+
+    def test_dirty_rects_restore_and_update(self):
+        # Vérifie que seules les zones modifiées sont restaurées et envoyées
+        import pygame
+        calque = composer_calque_statique((64, 48))
+        zones = ZonesSales(calque)
+        sprite = pygame.Surface((8, 8))
+        sprite.fill((255, 0, 0))
+        zones.commencer(self.ecran)
+        fixe = self.ecran.blit(sprite, (50, 30))
+        zones.ajouter(self.ecran.blit(sprite, (0, 0)))
+        zones.ajouter(fixe, modifie=False)
+        zones.presenter()
+        zones.commencer(self.ecran)
+        self.assertEqual(self.ecran.get_at((1, 1))[:3], (100, 180, 255))
+        zones.ajouter(self.ecran.blit(sprite, (20, 0)))
+        zones.ajouter(self.ecran.blit(sprite, (50, 30)), modifie=False)
+        self.assertEqual(zones.rectangles_a_envoyer(), [pygame.Rect(0, 0, 8, 8), pygame.Rect(20, 0, 8, 8)])
+        zones.presenter()
+
+    def test_texture_atlas_batched_draw(self):
+        # Vérifie que le dessin par lot depuis l'atlas équivaut aux blits individuels
+        import pygame
+        rouge = pygame.Surface((10, 6), pygame.SRCALPHA)
+        rouge.fill((255, 0, 0, 128))
+        bleu = pygame.Surface((4, 12), pygame.SRCALPHA)
+        bleu.fill((0, 0, 255, 255))
+        atlas = AtlasTextures(taille_page=12)
+        atlas.ajouter("rouge", rouge, ancre=(5, 3))
+        atlas.ajouter("bleu", bleu)
+        atlas.construire()
+        self.assertEqual(len(atlas.pages), 2)
+        attendu = pygame.Surface((40, 30))
+        obtenu = pygame.Surface((40, 30))
+        attendu.blit(bleu, (2, 2))
+        attendu.blit(rouge, (15, 17))
+        rects = atlas.dessiner(obtenu, [("bleu", (2, 2)), ("rouge", (20, 20))], retour_rects=True)
+        self.assertEqual(rects, [pygame.Rect(2, 2, 4, 12), pygame.Rect(15, 17, 10, 6)])
+        self.assertEqual(pygame.image.tobytes(attendu, "RGB"), pygame.image.tobytes(obtenu, "RGB"))
+        self.assertEqual(atlas.sous_surface("rouge").get_at((0, 0)), (255, 0, 0, 128))
+
+    def test_render_scale_mapping(self):
+        # Vérifie la conversion des positions dans les deux sens et la réduction des surfaces
+        import pygame
+        identite = EchelleRendu((800, 600))
+        self.assertFalse(identite.active)
+        self.assertEqual(identite.point(12.5, 7), (12.5, 7))
+        self.assertEqual(identite.rect_fenetre((3, 4, 5, 6)), pygame.Rect(3, 4, 5, 6))
+        surface = pygame.Surface((40, 20))
+        self.assertIs(identite.reduire(surface), surface)
+        moitie = EchelleRendu((800, 600), 0.5)
+        self.assertEqual(moitie.taille, (400, 300))
+        self.assertEqual(moitie.point(401, 299.9), (200, 149))
+        self.assertEqual(moitie.rect((100, 50, 240, 60)), pygame.Rect(50, 25, 120, 30))
+        # Chaque pixel rendu couvre deux pixels de la fenêtre
+        self.assertEqual(moitie.rect_fenetre((200, 115, 3, 1)), pygame.Rect(400, 230, 6, 2))
+        self.assertEqual(EchelleRendu((800, 600), 0.75).rect_fenetre((1, 1, 1, 1)), pygame.Rect(1, 1, 2, 2))
+        self.assertEqual(moitie.reduire(surface).get_size(), (20, 10))
+        fixe = moitie.surface_fixe("texte", lambda: surface)
+        self.assertIs(moitie.surface_fixe("texte", lambda: None), fixe)
+
+    def test_render_scale_window(self):
+        # Vérifie que la fenêtre garde la taille du jeu et que l'image rendue y est agrandie
+        import pygame
+        self.assertIs(EchelleRendu((64, 48)).preparer(self.ecran), self.ecran)
+        moitie = EchelleRendu((64, 48), 0.5)
+        image = moitie.preparer(self.ecran)
+        self.assertEqual(image.get_size(), (32, 24))
+        image.fill((0, 0, 255))
+        image.fill((255, 0, 0), pygame.Rect(1, 1, 1, 1))
+        zones = ZonesSales(composer_calque_statique((32, 24)), echelle=moitie)
+        zones.presenter()
+        self.assertEqual(self.ecran.get_size(), (64, 48))
+        self.assertEqual([self.ecran.get_at(p)[:3] for p in ((2, 2), (3, 3), (4, 4))],
+                         [(255, 0, 0), (255, 0, 0), (0, 0, 255)])
+
+    def test_particle_sprites_batched_draw(self):
+        # Vérifie le dessin des particules depuis l'atlas et le rectangle englobant limité à l'écran
+        import pygame
+        atlas = AtlasTextures()
+        for code in range(KIND_COUNT * FADE_LEVELS):
+            sprite = pygame.Surface((4, 4), pygame.SRCALPHA)
+            sprite.fill((255, 0, 0, 255))
+            atlas.ajouter(("particule", code), sprite, ancre=(2, 2))
+        atlas.construire()
+        sprites = SpritesParticules(atlas, KIND_COUNT * FADE_LEVELS)
+        particules = ParticleSystem(capacity=4, seed=0)
+        self.assertIsNone(sprites.dessiner(self.ecran, particules, retour_rect=True))
+        particules.emit(KIND_FLASH, 10, 10, 1, speed=(0, 0), life=(1, 1))
+        particules.emit(KIND_FLASH, 62, 20, 1, speed=(0, 0), life=(1, 1))
+        self.ecran.fill((0, 0, 0))
+        rect = sprites.dessiner(self.ecran, particules, retour_rect=True)
+        self.assertEqual(rect, pygame.Rect(8, 8, 56, 14))
+        self.assertEqual(self.ecran.get_at((10, 10))[:3], (255, 0, 0))
+        self.assertEqual(self.ecran.get_at((30, 10))[:3], (0, 0, 0))
+
 # === Tests resources.py ===
 class TestResourcesFunctions(unittest.TestCase):
     @classmethod
@@ -216,6 +700,133 @@ class TestResourcesFunctions(unittest.TestCase):
         font = load_font("notfoundfont", 20)
         self.assertIsNotNone(font)
 
+    def test_image_disk_cache(self):
+        # Vérifie que l'image redimensionnée est relue depuis le cache disque à l'identique
+        import pygame
+        import tempfile
+        from unittest import mock
+        from settings import BIRD_IMG_PATH
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pygame.display.set_mode((64, 48))
+        with tempfile.TemporaryDirectory() as dossier, \
+                mock.patch.object(resources, "IMAGE_CACHE_DIR", dossier), \
+                mock.patch.object(resources, "CACHE", resources.ResourceCache()):
+            original = resources.load_image(BIRD_IMG_PATH, (40, 30))
+            self.assertEqual(len(os.listdir(dossier)), 1)
+            resources.CACHE.clear()
+            with mock.patch("pygame.image.load") as image_load:
+                relue = resources.load_image(BIRD_IMG_PATH, (40, 30))
+                image_load.assert_not_called()
+            self.assertEqual(relue.get_size(), (40, 30))
+            self.assertEqual(pygame.image.tobytes(original, "RGBA"), pygame.image.tobytes(relue, "RGBA"))
+            # Les pixels relus appartiennent à la surface : on peut y dessiner
+            pixels, _, _ = resources._read_pixel_file(BIRD_IMG_PATH, (40, 30), resources._display_pixel_format())
+            self.assertIsInstance(pixels, bytearray)
+            relue.fill((1, 2, 3))
+            self.assertEqual(relue.get_at((0, 0))[:3], (1, 2, 3))
+
+    def test_asset_loader(self):
+        # Vérifie le chargement en arrière-plan et la finalisation sur le thread principal
+        import time
+        import tempfile
+        import pygame
+        from unittest import mock
+        from settings import TREE_IMG_PATH
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pygame.display.set_mode((64, 48))
+        with tempfile.TemporaryDirectory() as dossier, \
+                mock.patch.object(resources, "IMAGE_CACHE_DIR", dossier), \
+                mock.patch.object(resources, "CACHE", resources.ResourceCache()):
+            loader = resources.AssetLoader(max_workers=2)
+            loader.load_image("arbre", TREE_IMG_PATH, (30, 48))
+            loader.load_icon("absente", "notfoundicon.png")
+            loader.load_sound("son", "notfoundsound.mp3", critical=False)
+            self.assertEqual(loader.progress(), 0.0)
+            limite = time.time() + 10
+            while not loader.ready(critical_only=False) and time.time() < limite:
+                loader.poll()
+                time.sleep(0.01)
+            loader.shutdown()
+            self.assertEqual(loader.get("arbre").get_size(), (30, 48))
+            self.assertIs(resources.load_image(TREE_IMG_PATH, (30, 48)), loader.get("arbre"))
+            self.assertEqual(loader.get("absente").get_size(), (32, 32))
+            self.assertIsNone(loader.get("son"))
+            self.assertIn("son", loader.errors)
+            # Des pixels du cache refusés à la finalisation sont un défaut de cache : jamais de None en cache
+            resources.CACHE.clear(include_pinned=True)
+            loader = resources.AssetLoader(max_workers=1)
+            with mock.patch.object(resources, "_surface_from_pixels", return_value=None) as refus:
+                loader.load_image("arbre", TREE_IMG_PATH, (30, 48))
+                limite = time.time() + 10
+                while not loader.ready() and time.time() < limite:
+                    loader.poll()
+                    time.sleep(0.01)
+            loader.shutdown()
+            refus.assert_called_once()
+            self.assertEqual(loader.get("arbre").get_size(), (30, 48))
+            self.assertIs(resources.CACHE.get(("image", resources._asset_path(TREE_IMG_PATH), (30, 48))), loader.get("arbre"))
+
+    def test_resource_cache_budget_and_stats(self):
+        # Vérifie la comptabilité en octets, l'éviction LRU et l'épinglage
+        import pygame
+        cache = resources.ResourceCache(budget_bytes=3000)
+        petit = pygame.Surface((10, 10), pygame.SRCALPHA)
+        self.assertEqual(resources.estimate_bytes(petit), petit.get_pitch() * 10)
+        cache.put(("image", "a"), petit, nbytes=1000, pin=True)
+        cache.put(("image", "b"), petit, nbytes=1000)
+        cache.put(("image", "c"), petit, nbytes=1000)
+        self.assertIs(cache.get(("image", "b")), petit)
+        cache.put(("sound", "d"), None, nbytes=1000)
+        self.assertIn(("image", "a"), cache)
+        self.assertNotIn(("image", "c"), cache)
+        self.assertIsNone(cache.get(("image", "c")))
+        stats = cache.stats()
+        self.assertEqual(stats["total_bytes"], 3000)
+        self.assertEqual(stats["kinds"]["image"], {"entries": 2, "bytes": 2000, "hits": 1, "misses": 1, "evictions": 1})
+        cache.clear()
+        self.assertEqual(cache.stats()["entries"], 1)
+        cache.clear(include_pinned=True)
+        self.assertEqual(cache.total_bytes, 0)
+
+    def test_image_and_icon_share_cache_entry(self):
+        # Vérifie que load_image et load_icon partagent la même entrée pour un fichier
+        import pygame
+        from unittest import mock
+        from settings import AMMO_IMG_PATH
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pygame.display.set_mode((64, 48))
+        with mock.patch.object(resources, "CACHE", resources.ResourceCache()):
+            self.assertIs(resources.load_icon(AMMO_IMG_PATH), resources.load_image(AMMO_IMG_PATH))
+            self.assertEqual(resources.CACHE.stats()["kinds"]["image"]["entries"], 1)
+
+    def test_font_registry(self):
+        # Vérifie que chaque rôle est résolu une seule fois et que le repli est signalé
+        import tempfile
+        specs = {"petit": ("notfoundfont", 18, False), "gras": (None, 18, True)}
+        with tempfile.TemporaryDirectory() as dossier:
+            index_path = os.path.join(dossier, "fonts.json")
+            registre = init_fonts(specs, index_path)
+            self.assertTrue(os.path.exists(index_path))
+        self.assertIs(get_font("petit"), registre["petit"])
+        self.assertIs(get_font("petit"), load_font("notfoundfont", 18))
+        self.assertTrue(get_font("gras").bold)
+        self.assertIsNone(font_report()["notfoundfont"])
+
+    def test_font_index_persisted(self):
+        # Vérifie que l'index sauvegardé est relu sans nouveau balayage des polices
+        import tempfile
+        from unittest import mock
+        load_font("notfoundfont", 19)
+        with tempfile.TemporaryDirectory() as dossier:
+            index_path = os.path.join(dossier, "fonts.json")
+            resources._FONT_INDEX_DIRTY = True
+            self.assertTrue(save_font_index(index_path))
+            with mock.patch.object(resources, "FONT_INDEX_PATH", index_path), \
+                    mock.patch.object(resources, "_FONT_INDEX", None), \
+                    mock.patch("pygame.font.match_font") as match_font:
+                self.assertEqual(resources._resolve_system_font("notfoundfont"), (None, False))
+                match_font.assert_not_called()
+
 # === Tests utils.py (logique métier) ===
 class TestGameLogic(unittest.TestCase):
     def test_calcule_score(self):
@@ -238,5 +849,484 @@ class TestGameLogic(unittest.TestCase):
         self.assertTrue(verifie_defaite(0, 0))
         self.assertFalse(verifie_defaite(5, 10))
 
+class TestFixedTimestep(unittest.TestCase):
+    def _simuler(self, frequence_rendu, duree=2.0):
+        # Compte les pas de simulation exécutés pour une cadence d'affichage donnée
+        pas = PasDeTempsFixe(1.0 / 60, max_pas=5)
+        total = 0
+        for _ in range(int(round(duree * frequence_rendu))):
+            total += pas.avancer(1.0 / frequence_rendu)
+        return total, pas.alpha
+
+    def test_same_steps_at_any_frame_rate(self):
+        # Vérifie que 30, 60 et 144 Hz donnent le même nombre de pas de simulation
+        for frequence in (30, 60, 144):
+            total, alpha = self._simuler(frequence)
+            self.assertIn(total, (119, 120))
+            self.assertTrue(0.0 <= alpha <= 1.0)
+        self.assertEqual(secondes_simulees(120, 60), 2)
+
+    def test_max_steps_drops_backlog(self):
+        # Vérifie qu'un long blocage ne déclenche que max_pas pas et vide l'accumulateur
+        pas = PasDeTempsFixe(1.0 / 60, max_pas=5)
+        self.assertEqual(pas.avancer(1.0), 5)
+        self.assertEqual(pas.alpha, 0.0)
+
+    def test_swarm_interpolation(self):
+        # Vérifie l'interpolation des pies et l'absence d'interpolation après une réapparition
+        nuee = MagpieSwarm.from_magpies([Magpie(pos=[100, 100], vel=[10, 4])])
+        nuee.update(3, 800, 600, 32)
+        self.assertEqual(nuee.visible(0.0), [(100, 100, False)])
+        self.assertEqual(nuee.visible(0.5), [(105, 102, False)])
+        self.assertEqual(nuee.visible(), [(110, 104, False)])
+        nuee.fly_away([0])
+        nuee.fly_away_timer[0] = 1
+        nuee.update(3, 800, 600, 32)
+        self.assertEqual(nuee.visible(0.0), nuee.visible())
+
+    def test_dog_jump_interpolation(self):
+        # Vérifie l'interpolation de la hauteur du chien pendant le saut
+        dog = Dog(x=0, y=100)
+        dog.start_jump()
+        for _ in range(10):
+            dog.update_jump()
+        self.assertEqual(dog.get_jump_y(0.0), 100 - int(30 * abs(math.sin(dog.prev_jump_phase))))
+        self.assertEqual(dog.get_jump_y(), 100 - int(30 * abs(math.sin(dog.jump_phase))))
+
+    def test_window_state(self):
+        # Vérifie le suivi du focus et de la réduction de la fenêtre
+        import pygame
+        fenetre = EtatFenetre()
+        self.assertTrue(fenetre.active)
+        self.assertFalse(fenetre.traiter(pygame.event.Event(pygame.WINDOWFOCUSLOST)))
+        self.assertFalse(fenetre.active)
+        self.assertTrue(fenetre.traiter(pygame.event.Event(pygame.WINDOWFOCUSGAINED)))
+        fenetre.traiter(pygame.event.Event(pygame.WINDOWMINIMIZED))
+        self.assertFalse(fenetre.active)
+        self.assertTrue(fenetre.traiter(pygame.event.Event(pygame.WINDOWRESTORED)))
+        self.assertTrue(fenetre.active)
+        self.assertFalse(fenetre.traiter(pygame.event.Event(pygame.MOUSEMOTION, pos=(0, 0))))
+
+    def test_wait_for_events(self):
+        # Vérifie l'attente bloquante : délai écoulé sans événement, puis réveil par un événement
+        import pygame
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pygame.display.init()
+        pygame.display.set_mode((64, 48))
+        pygame.event.clear()
+        self.assertEqual(attendre_evenements(10), [])
+        pygame.event.post(pygame.event.Event(pygame.USEREVENT, code=1))
+        pygame.event.post(pygame.event.Event(pygame.USEREVENT, code=2))
+        self.assertEqual([e.code for e in attendre_evenements(1000) if e.type == pygame.USEREVENT], [1, 2])
+
+# === Tests session.py et replay.py ===
+class TestGameSession(unittest.TestCase):
+    def test_phases(self):
+        # Vérifie l'enchaînement des phases d'une manche avec des entrées explicites
+        session = GameSession("Facile", 1, DOG_POS, DOG_SIZE)
+        self.assertEqual(session.phase, PHASE_WAITING)
+        self.assertIsNone(session.click(5, 5))
+        self.assertEqual(session.click(DOG_POS[0] + 1, DOG_POS[1] + 1), "dog")
+        self.assertEqual(session.phase, PHASE_JUMPING)
+        session.run(45)
+        self.assertEqual(session.phase, PHASE_PLAYING)
+        self.assertIsInstance(session.magpies, MagpieFlock)
+        self.assertEqual(session.time_left, 30)
+        session.run(30 * 60)
+        self.assertEqual(session.phase, PHASE_OVER)
+        self.assertEqual(session.time_left, 0)
+        self.assertFalse(session.win)
+        self.assertEqual(session.click(0, 0), "menu")
+        self.assertEqual(session.phase, PHASE_FINISHED)
+
+    def test_shots_and_win(self):
+        # Vérifie munitions, score et victoire quand chaque tir vise une pie
+        session = GameSession("Facile", 2, DOG_POS, DOG_SIZE)
+        session.click(DOG_POS[0] + 1, DOG_POS[1] + 1)
+        session.run(45)
+        while not session.game_over:
+            x, y = session.snapshot()["magpies"][0][:2] if session.snapshot()["magpies"] else (0, 0)
+            session.click(x, y)
+            session.run(40)
+        self.assertTrue(session.win)
+        self.assertEqual(session.score, session.goal)
+        self.assertEqual(session.ammo, 10 - session.goal)
+        self.assertIsNotNone(session.frozen_time_left)
+
+    def test_hit_reports_magpie_position(self):
+        # Vérifie qu'un tir réussi expose la position de la pie touchée, pas celle du clic
+        session = GameSession("Facile", 2, DOG_POS, DOG_SIZE)
+        session.click(DOG_POS[0] + 1, DOG_POS[1] + 1)
+        session.run(45)
+        self.assertIsNone(session.last_hit)
+        x, y = session.snapshot()["magpies"][0][:2]
+        pie = session.magpies.position(session.magpies.hits_at(x + 10, y - 10, MAGPIE_BODY_RADIUS)[0])
+        self.assertEqual(session.click(x + 10, y - 10), "hit")
+        self.assertEqual(session.last_hit, pie)
+        self.assertNotEqual(session.last_hit, (x + 10, y - 10))
+
+    def test_pause_freezes_round(self):
+        # Vérifie qu'en pause la minuterie est figée, que les clics sont ignorés et que la reprise ne rattrape rien
+        session = GameSession("Facile", 4, DOG_POS, DOG_SIZE)
+        session.click(DOG_POS[0] + 1, DOG_POS[1] + 1)
+        session.run(45 + 120)
+        session.set_paused(True)
+        self.assertEqual(session.phase, PHASE_PAUSED)
+        etat = (session.sim_ticks, session.time_left, len(session.inputs))
+        self.assertEqual(session.tick(10.0), 0)
+        self.assertIsNone(session.click(400, 300))
+        self.assertEqual((session.sim_ticks, session.time_left, len(session.inputs)), etat)
+        session.set_paused(False)
+        self.assertEqual(session.phase, PHASE_PLAYING)
+        self.assertEqual(session.tick(1.5 / 60), 1)
+
+    def test_scene_freezes_at_game_over(self):
+        # Vérifie que les pies ne bougent plus sur l'écran de fin de partie
+        session = GameSession("Moyen", 5, DOG_POS, DOG_SIZE)
+        session.click(DOG_POS[0] + 1, DOG_POS[1] + 1)
+        session.run(45 + 30 * 60)
+        self.assertEqual(session.phase, PHASE_OVER)
+        pies = session.snapshot()["magpies"]
+        session.run(120)
+        self.assertEqual(session.snapshot()["magpies"], pies)
+
+    def test_tick_uses_fixed_steps(self):
+        # Vérifie que tick(dt) avance d'un nombre de pas fixe quel que soit le découpage du temps
+        a = GameSession("Moyen", 3, DOG_POS, DOG_SIZE)
+        b = GameSession("Moyen", 3, DOG_POS, DOG_SIZE)
+        for session in (a, b):
+            session.click(DOG_POS[0] + 1, DOG_POS[1] + 1)
+        for _ in range(60):
+            a.tick(1 / 30)
+        for _ in range(288):
+            b.tick(1 / 144)
+        self.assertIn(a.sim_ticks, (119, 120))
+        b.run(a.sim_ticks - b.sim_ticks)
+        self.assertEqual(a.snapshot(), b.snapshot())
+
+    def test_untimed_session(self):
+        # Vérifie que sans minuterie la manche ne se perd pas au temps et que les pies continuent de voler
+        session = GameSession("Moyen", 8, DOG_POS, DOG_SIZE, timed=False)
+        session.click(DOG_POS[0] + 1, DOG_POS[1] + 1)
+        session.run(45 + 120 * 60)
+        self.assertEqual(session.phase, PHASE_PLAYING)
+        self.assertEqual(session.time_left, session.round_time)
+        pies = session.snapshot()["magpies"]
+        session.run(10)
+        self.assertNotEqual(session.snapshot()["magpies"], pies)
+
+    def _grande_manche(self, nombre, graine=6):
+        # Joue une manche de nombre pies en visant des pies à intervalles réguliers
+        settings = dict(DIFFICULTY_SETTINGS["Moyen"], magpie_count=nombre, ammo=40, goal=30)
+        session = GameSession("Moyen", graine, DOG_POS, DOG_SIZE, settings=settings)
+        session.click(DOG_POS[0] + 1, DOG_POS[1] + 1)
+        session.run(45)
+        for tir in range(20):
+            x, y = session.magpies.position((tir * 7) % nombre)
+            session.click(x + 5, y - 5)
+            session.run(3)
+        return session
+
+    def test_large_flock_uses_swarm(self):
+        # Vérifie qu'une grande nuée passe en tableaux NumPy (grille spatiale pour les tirs)
+        # et qu'elle joue exactement comme la liste de Magpie
+        from unittest import mock
+        grande = self._grande_manche(2000)
+        self.assertIsInstance(grande.magpies, MagpieSwarm)
+        self.assertIsNotNone(grande.magpies._grid)
+        self.assertGreater(grande.score, 0)
+        self.assertEqual(grande.ammo, 20)
+        nuee = self._grande_manche(64)
+        self.assertIsInstance(nuee.magpies, MagpieSwarm)
+        with mock.patch("session.SWARM_MIN_COUNT", 10 ** 9):
+            liste = self._grande_manche(64)
+        self.assertIsInstance(liste.magpies, MagpieFlock)
+        self.assertEqual(nuee.snapshot(), liste.snapshot())
+        self.assertEqual(nuee.rng.getstate(), liste.rng.getstate())
+
+    def test_simulation_sans_pygame(self):
+        # Vérifie que la simulation (session, relectures, équilibrage) s'importe sans pygame
+        import subprocess
+        dossier = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        code = "import sys, session, replay, balance; print('pygame' in sys.modules)"
+        sortie = subprocess.run([sys.executable, "-c", code], cwd=dossier, capture_output=True, text=True, check=True)
+        self.assertEqual(sortie.stdout.strip(), "False")
+
+class TestReplay(unittest.TestCase):
+    def _jouer(self, graine):
+        # Joue une manche avec des clics pseudo-aléatoires à des pas variés
+        session = GameSession("Difficile", graine, DOG_POS, DOG_SIZE)
+        clics = random.Random(graine + 1)
+        session.click(DOG_POS[0] + 10, DOG_POS[1] + 10)
+        while not session.finished and session.sim_ticks < 5000:
+            for _ in range(clics.randint(0, 20)):
+                session.step()
+            if session.magpies is not None and clics.random() < 0.7:
+                x, y = session.magpies.to_magpies()[clics.randrange(len(session.magpies))].pos
+                session.click(int(x) + clics.randint(-20, 20), int(y) + clics.randint(-20, 20))
+            else:
+                session.click(clics.randint(0, 799), clics.randint(0, 599))
+        return session
+
+    def test_seeded_session_is_deterministic(self):
+        # Vérifie que deux manches de même graine et mêmes clics sont identiques
+        a, b = self._jouer(7), self._jouer(7)
+        self.assertTrue(a.finished)
+        self.assertEqual((a.score, a.ammo, a.sim_ticks, a.inputs), (b.score, b.ammo, b.sim_ticks, b.inputs))
+        self.assertEqual(a.snapshot(), b.snapshot())
+
+    def test_binary_round_trip(self):
+        # Vérifie l'aller-retour du format binaire
+        replay = Replay.from_session(self._jouer(11))
+        data = replay.to_bytes()
+        self.assertEqual(data[:6], b"CERPL1")
+        self.assertEqual(Replay.from_bytes(data), replay)
+        with self.assertRaises(ValueError):
+            Replay.from_bytes(data[:-1])
+        with self.assertRaises(ValueError):
+            Replay.from_bytes(b"XXXXXX" + data[6:])
+
+    def test_fast_forward_is_bit_exact(self):
+        # Vérifie que la relecture accélérée reproduit exactement la manche enregistrée
+        for graine in (3, 5, 9):
+            originale = self._jouer(graine)
+            rejouee = rejouer(Replay.from_bytes(Replay.from_session(originale).to_bytes()), DOG_POS, DOG_SIZE)
+            self.assertEqual(
+                (rejouee.score, rejouee.ammo, rejouee.win, rejouee.time_left, rejouee.sim_ticks, rejouee.inputs),
+                (originale.score, originale.ammo, originale.win, originale.time_left, originale.sim_ticks, originale.inputs)
+            )
+            self.assertEqual(rejouee.rng.getstate(), originale.rng.getstate())
+            self.assertEqual(rejouee.snapshot(), originale.snapshot())
+            self.assertEqual([m.pos for m in rejouee.magpies.to_magpies()], [m.pos for m in originale.magpies.to_magpies()])
+
+    def test_step_by_step_playback(self):
+        # Vérifie que la relecture par petits paquets de pas (temps réel) donne le même résultat
+        originale = self._jouer(4)
+        relecteur = Relecteur(Replay.from_session(originale), DOG_POS, DOG_SIZE)
+        paquets = random.Random(4)
+        while not relecteur.termine:
+            relecteur.avancer(paquets.randint(0, 3))
+        self.assertEqual(relecteur.session.inputs, originale.inputs)
+        self.assertEqual(relecteur.session.score, originale.score)
+
+class TestBalance(unittest.TestCase):
+
+    def test_settings_override(self):
+        # Vérifie que des réglages explicites remplacent le préréglage nommé
+        settings = dict(DIFFICULTY_SETTINGS["Facile"], ammo=3, goal=2)
+        session = GameSession("Facile", 1, DOG_POS, DOG_SIZE, settings=settings)
+        self.assertEqual((session.ammo, session.goal), (3, 2))
+
+    def test_bot_round_is_deterministic(self):
+        # Vérifie qu'une manche automatique dépend seulement de sa graine
+        settings = DIFFICULTY_SETTINGS["Facile"]
+        precis = Tireur(reaction=0.2, erreur=0.0)
+        resultat = jouer_manche_auto("Facile", settings, precis, 7)
+        self.assertEqual(resultat, jouer_manche_auto("Facile", settings, precis, 7))
+        victoire, tirs, duree = resultat
+        self.assertTrue(victoire)
+        self.assertGreaterEqual(tirs, settings["goal"])
+        self.assertGreater(duree, 0)
+        # Un tireur très lent et imprécis ne doit pas faire mieux
+        victoire_lent, _, _ = jouer_manche_auto("Facile", settings, Tireur(reaction=2.0, erreur=200.0), 7)
+        self.assertFalse(victoire_lent)
+
+    def test_results_independent_of_pool(self):
+        # Vérifie que le découpage en lots et le pool de processus ne changent pas les statistiques
+        from unittest import mock
+        with mock.patch("balance.TAILLE_LOT", 3):
+            sequentiel = equilibrer(["Facile"], [0.2, 0.4], [5.0], {"speed": [3, 5]}, 7, processus=1)
+            parallele = equilibrer(["Facile"], [0.2, 0.4], [5.0], {"speed": [3, 5]}, 7, processus=2)
+        self.assertEqual(sequentiel, parallele)
+        self.assertEqual(len(sequentiel), 4)
+        for resume in sequentiel.values():
+            self.assertEqual(resume["manches"], 7)
+            self.assertEqual(sum(resume["tirs_jusqu_objectif"].values()), round(resume["taux_victoire"] * 7))
+
+    def test_regle_values(self):
+        # Vérifie que les valeurs balayées gardent leur type : entiers, réels et booléens
+        import argparse
+        from balance import _regle
+        self.assertEqual(_regle("ammo=8,12"), ("ammo", [8, 12]))
+        self.assertEqual(_regle("speed=4,5.5"), ("speed", [4, 5.5]))
+        nom, valeurs = _regle("flocking=oui,False")
+        self.assertEqual((nom, valeurs), ("flocking", [True, False]))
+        self.assertTrue(all(isinstance(valeur, bool) for valeur in valeurs))
+        for invalide in ("speed", "speed=vite"):
+            with self.assertRaises(argparse.ArgumentTypeError):
+                _regle(invalide)
+        resultats = equilibrer(["Moyen"], [0.3], [10.0], dict([_regle("flocking=oui,non")]), 2, processus=1)
+        self.assertEqual([dict(regles)["flocking"] for _, regles, _, _ in resultats], [True, False])
+
+    def test_centile(self):
+        # Vérifie le centile par rang le plus proche
+        self.assertIsNone(centile([], 50))
+        self.assertEqual(centile([4, 1, 3, 2], 50), 2)
+        self.assertEqual(centile([4, 1, 3, 2], 90), 4)
+
+class TestBenchmarkSuite(unittest.TestCase):
+
+    def test_comparer(self):
+        # Vérifie le rapport des médianes, le seuil et les cas absents de la référence
+        reference = {"a": {"p50_us": 10.0}, "b": {"p50_us": 10.0}, "nul": {"p50_us": 0.0}}
+        resultats = {"a": {"p50_us": 12.5}, "b": {"p50_us": 12.6}, "nul": {"p50_us": 1.0}, "nouveau": {"p50_us": 1.0}}
+        comparaison = comparer(resultats, reference, 0.25)
+        self.assertEqual(sorted(comparaison), ["a", "b"])
+        self.assertAlmostEqual(comparaison["a"]["rapport"], 1.25)
+        self.assertFalse(comparaison["a"]["regression"])
+        self.assertTrue(comparaison["b"]["regression"])
+        self.assertEqual(comparer(resultats, {}, 0.25), {})
+
+    def test_remesurer_keeps_best_measure(self):
+        # Vérifie que seuls les cas en régression sont remesurés et que la meilleure mesure est gardée
+        reference = {"lent": {"p50_us": 10.0}, "bruit": {"p50_us": 10.0}, "stable": {"p50_us": 10.0}}
+        resultats = {"lent": {"p50_us": 20.0}, "bruit": {"p50_us": 20.0}, "stable": {"p50_us": 11.0}}
+        demandes = []
+
+        def mesurer(noms):
+            demandes.append(set(noms))
+            return {"lent": {"p50_us": 25.0}, "bruit": {"p50_us": 10.5}}
+
+        comparaison = remesurer(resultats, reference, 0.25, mesurer)
+        self.assertEqual(demandes, [{"lent", "bruit"}])
+        self.assertEqual(resultats["lent"]["p50_us"], 20.0)
+        self.assertEqual(resultats["bruit"]["p50_us"], 10.5)
+        self.assertEqual([nom for nom, ecart in comparaison.items() if ecart["regression"]], ["lent"])
+        # Sans régression, rien n'est remesuré
+        demandes.clear()
+        remesurer({"stable": {"p50_us": 11.0}}, reference, 0.25, mesurer)
+        self.assertEqual(demandes, [])
+
+class TestProfiler(unittest.TestCase):
+
+    def _image(self, profileur, durees, ecran="manche"):
+        # Enregistre une image dont les phases durent exactement durees (secondes)
+        from unittest import mock
+        instants = [1.0]
+        for duree in durees:
+            instants.append(instants[-1] + duree)
+        instants.append(instants[-1])
+        with mock.patch("profiler.time.perf_counter", side_effect=instants):
+            profileur.debut_image()
+            for phase in profileur.phases[:len(durees)]:
+                profileur.marquer(phase)
+            profileur.fin_image(ecran)
+
+    def test_disabled_records_nothing(self):
+        # Vérifie qu'un profileur inactif n'enregistre rien
+        profileur = ProfileurImages(("a", "b"), capacite=4)
+        self._image(profileur, [0.001, 0.002])
+        self.assertEqual(profileur.nombre, 0)
+        self.assertEqual(profileur.statistiques()["images"], 0)
+
+    def test_ring_buffer_keeps_latest_frames(self):
+        # Vérifie que le tampon circulaire garde les dernières images, dans l'ordre
+        profileur = ProfileurImages(("a", "b"), capacite=3, actif=True)
+        for n in range(5):
+            self._image(profileur, [0.001 * (n + 1), 0.002])
+        self.assertEqual((profileur.nombre, profileur.images), (3, 5))
+        images = profileur.echantillons()
+        self.assertEqual([image["image"] for image in images], [2, 3, 4])
+        self.assertEqual([image["a_ms"] for image in images], [3.0, 4.0, 5.0])
+        self.assertEqual(images[-1]["total_ms"], 7.0)
+
+    def test_statistics(self):
+        # Vérifie moyenne, centile, maximum et pire image
+        profileur = ProfileurImages(("a", "b"), capacite=10, actif=True)
+        for n in range(9):
+            self._image(profileur, [0.001, 0.001])
+        self._image(profileur, [0.001, 0.011], ecran="menu")
+        stats = profileur.statistiques()
+        self.assertEqual(stats["images"], 10)
+        self.assertAlmostEqual(stats["phases"]["a"]["moyenne"], 1.0)
+        self.assertAlmostEqual(stats["phases"]["b"]["max"], 11.0)
+        self.assertAlmostEqual(stats["total"]["moyenne"], 3.0)
+        self.assertEqual(stats["pire"]["phase"], "b")
+        self.assertEqual(stats["pire"]["ecran"], "menu")
+        # Les statistiques glissantes ne portent que sur les dernières images
+        self.assertAlmostEqual(profileur.statistiques(2)["total"]["moyenne"], 7.0)
+
+    def test_export_csv_json(self):
+        # Vérifie que les deux exports contiennent une entrée par image
+        import csv
+        import json
+        import tempfile
+        profileur = ProfileurImages(("a", "b"), capacite=8, actif=True)
+        for _ in range(3):
+            self._image(profileur, [0.001, 0.002])
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin_csv, chemin_json = profileur.exporter(dossier)
+            with open(chemin_csv, newline="", encoding="utf-8") as f:
+                lignes = list(csv.DictReader(f))
+            with open(chemin_json, encoding="utf-8") as f:
+                donnees = json.load(f)
+        self.assertEqual(len(lignes), 3)
+        self.assertEqual(float(lignes[0]["b_ms"]), 2.0)
+        self.assertEqual(donnees["phases"], ["a", "b"])
+        self.assertEqual(len(donnees["images"]), 3)
+        self.assertEqual(donnees["resume"]["images"], 3)
+
+    def test_overlay_toggle(self):
+        # Vérifie que la superposition active l'enregistrement et n'est recomposée que périodiquement
+        import pygame
+        pygame.font.init()
+        profileur = ProfileurImages(("a", "b"), capacite=8)
+        superposition = SuperpositionProfil(profileur, periode=60.0)
+        cible = pygame.Surface((800, 600))
+        self.assertEqual(superposition.dessiner(cible), (None, False))
+        superposition.basculer()
+        self.assertTrue(profileur.actif)
+        self._image(profileur, [0.001, 0.002])
+        rect, recomposee = superposition.dessiner(cible)
+        self.assertTrue(recomposee)
+        self.assertTrue(cible.get_rect().contains(rect))
+        self.assertEqual(superposition.dessiner(cible), (rect, False))
+        # À une résolution interne réduite, le tableau est recomposé à l'échelle de la cible
+        reduite = pygame.Surface((400, 300))
+        petit, recomposee = superposition.dessiner(reduite)
+        self.assertTrue(recomposee)
+        self.assertTrue(reduite.get_rect().contains(petit))
+        self.assertEqual(petit.width, rect.width // 2)
+        self.assertLess(petit.height, rect.height * 0.6)
+
+# === Tests startup.py et démarrage différé ===
+class TestStartup(unittest.TestCase):
+    def test_profil_demarrage(self):
+        # Vérifie le découpage en étapes, la clôture et le rapport
+        profil = ProfilDemarrage()
+        profil.marquer("imports")
+        profil.marquer("fenêtre")
+        total = profil.terminer("menu")
+        self.assertTrue(profil.termine)
+        self.assertEqual([etape for etape, _ in profil.etapes], ["imports", "fenêtre", "menu"])
+        self.assertAlmostEqual(total, sum(duree for _, duree in profil.etapes) * 1e3, places=6)
+        profil.marquer("après coup")
+        self.assertEqual(len(profil.etapes), 3)
+        self.assertEqual(len(profil.rapport().splitlines()), 4)
+
+    def test_demarrer_audio_sans_peripherique(self):
+        # Vérifie que l'absence de périphérique audio désactive le son sans interrompre le jeu
+        import pygame
+        from unittest import mock
+        import chasse_express
+        scene = mock.Mock()
+        with mock.patch("pygame.mixer.get_init", return_value=None), \
+                mock.patch("pygame.mixer.init", side_effect=pygame.error("pas de son")), \
+                mock.patch("builtins.print"):
+            chasse_express.demarrer_audio(scene)
+        scene.loader.load_sound.assert_not_called()
+        with mock.patch("pygame.mixer.get_init", return_value=(44100, -16, 2)):
+            chasse_express.demarrer_audio(scene)
+        scene.loader.load_sound.assert_called_once()
+
+    def test_asset_loader_wait(self):
+        # Vérifie que l'attente rend la main immédiatement sans décodage en cours
+        import time
+        loader = resources.AssetLoader(max_workers=1)
+        debut = time.perf_counter()
+        loader.wait(5.0)
+        self.assertLess(time.perf_counter() - debut, 1.0)
+        loader.shutdown()
+
 if __name__ == '__main__':
     unittest.main()
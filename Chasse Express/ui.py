@@ -3,13 +3,113 @@
 # ===================================================================
 
 import pygame
+from collections import OrderedDict
 from typing import Optional
 from settings import OUTLINE_W, MAGPIE_BLACK, MAGPIE_WHITE, MAGPIE_BLUE, MAGPIE_BEAK
+from particles import (
+    KIND_FEATHER_BLACK, KIND_FEATHER_WHITE, KIND_FEATHER_BLUE, KIND_FLASH, KIND_POPUP, KIND_COUNT,
+    FADE_LEVELS, sprite_code
+)
 
 # =========================================
 # Fonctions de dessin de texte et d'icônes
 # =========================================
 
+class CacheTexteContour:
+    """
+    Cache LRU borné des textes avec contour et ombre déjà composés sur une seule surface.
+    """
+
+    def __init__(self, max_entrees: int = 256) -> None:
+        self.max_entrees = max_entrees
+        self._entrees = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def obtenir(self, cle: tuple, construire) -> tuple:
+        """
+        Retourne l'entrée associée à la clé, en la construisant avec construire() si absente.
+        """
+        entree = self._entrees.get(cle)
+        if entree is not None:
+            self._entrees.move_to_end(cle)
+            self.hits += 1
+            return entree
+        self.misses += 1
+        entree = construire()
+        self._entrees[cle] = entree
+        while len(self._entrees) > self.max_entrees:
+            self._entrees.popitem(last=False)
+            self.evictions += 1
+        return entree
+
+    def vider(self) -> None:
+        """
+        Vide le cache sans remettre les compteurs à zéro.
+        """
+        self._entrees.clear()
+
+    def stats(self) -> dict:
+        """
+        Retourne les compteurs du cache.
+        """
+        return {"entrees": len(self._entrees), "max_entrees": self.max_entrees,
+                "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def __len__(self) -> int:
+        return len(self._entrees)
+
+# Cache partagé des textes avec contour (menus, titres, messages)
+CACHE_TEXTE_CONTOUR = CacheTexteContour()
+
+def _composer_texte_avec_contour(
+    texte: str,
+    police: "pygame.font.Font",
+    couleur_principale: tuple,
+    couleur_contour: tuple,
+    couleur_ombre: tuple,
+    decalage_contour: int,
+    decalage_ombre: int
+) -> tuple:
+    """
+    Compose ombre, contour et texte principal sur une surface SRCALPHA.
+    Retourne (surface, décalage) où décalage est la position du coin de la surface
+    par rapport à la position du texte.
+    """
+    principal = police.render(texte, True, couleur_principale)
+    contour = police.render(texte, True, couleur_contour)
+    ombre = police.render(texte, True, couleur_ombre)
+    min_x = min(0, -decalage_contour, decalage_ombre)
+    max_x = max(0, decalage_contour, decalage_ombre)
+    largeur = principal.get_width() + max_x - min_x
+    hauteur = principal.get_height() + max_x - min_x
+    composite = pygame.Surface((largeur, hauteur), pygame.SRCALPHA)
+    composite.blit(ombre, (decalage_ombre - min_x, decalage_ombre - min_x))
+    for dx in [-decalage_contour, 0, decalage_contour]:
+        for dy in [-decalage_contour, 0, decalage_contour]:
+            if dx != 0 or dy != 0:
+                composite.blit(contour, (dx - min_x, dy - min_x))
+    composite.blit(principal, (-min_x, -min_x))
+    return composite, (min_x, min_x)
+
+def rendre_texte_avec_contour(
+    texte: str,
+    police: "pygame.font.Font",
+    couleur_principale: tuple,
+    couleur_contour: tuple = (255,255,255),
+    couleur_ombre: tuple = (0,0,0),
+    decalage_contour: int = 2,
+    decalage_ombre: int = 4
+) -> tuple:
+    """
+    Retourne (surface, décalage) du texte avec contour et ombre, depuis le cache.
+    """
+    cle = ("texte", texte, police, tuple(couleur_principale), tuple(couleur_contour),
+           tuple(couleur_ombre), decalage_contour, decalage_ombre)
+    return CACHE_TEXTE_CONTOUR.obtenir(cle, lambda: _composer_texte_avec_contour(
+        texte, police, couleur_principale, couleur_contour, couleur_ombre, decalage_contour, decalage_ombre))
+
 def dessiner_texte_avec_contour(
     surface: "pygame.Surface",
     texte: str,
@@ -20,20 +120,54 @@ def dessiner_texte_avec_contour(
     couleur_ombre: tuple = (0,0,0),
     decalage_contour: int = 2,
     decalage_ombre: int = 4
-) -> None:
+) -> "pygame.Rect":
     """
     Dessine un texte avec contour et ombre sur la surface.
     """
-    x, y = position
-    ombre = police.render(texte, True, couleur_ombre)
-    surface.blit(ombre, (x+decalage_ombre, y+decalage_ombre))
-    for dx in [-decalage_contour, 0, decalage_contour]:
-        for dy in [-decalage_contour, 0, decalage_contour]:
-            if dx != 0 or dy != 0:
-                contour = police.render(texte, True, couleur_contour)
-                surface.blit(contour, (x+dx, y+dy))
-    principal = police.render(texte, True, couleur_principale)
-    surface.blit(principal, (x, y))
+    composite, (dx, dy) = rendre_texte_avec_contour(
+        texte, police, couleur_principale, couleur_contour, couleur_ombre, decalage_contour, decalage_ombre)
+    return surface.blit(composite, (position[0] + dx, position[1] + dy))
+
+def calculer_degrade(n: int, couleurs: list) -> list:
+    """
+    Retourne n couleurs interpolées linéairement le long de la liste de couleurs.
+    """
+    etapes = []
+    for i in range(n):
+        grad_pos = i / max(n-1, 1)
+        grad_idx = grad_pos * (len(couleurs)-1)
+        idx0 = int(grad_idx)
+        idx1 = min(idx0+1, len(couleurs)-1)
+        t = grad_idx - idx0
+        c1, c2 = couleurs[idx0], couleurs[idx1]
+        etapes.append(tuple(int(c1[j] + (c2[j] - c1[j]) * t) for j in range(3)))
+    return etapes
+
+def _composer_titre_degrade(texte: str, police: "pygame.font.Font", couleurs_degrade: tuple) -> tuple:
+    """
+    Compose un titre dont chaque caractère a sa couleur de dégradé, avec contour et ombre.
+    """
+    couleurs = calculer_degrade(len(texte), couleurs_degrade)
+    morceaux = []
+    x = 0
+    for ch, couleur in zip(texte, couleurs):
+        morceaux.append((rendre_texte_avec_contour(ch, police, couleur), x))
+        x += police.size(ch)[0]
+    min_x = min([x_ch + dx for (surf, (dx, dy)), x_ch in morceaux] + [0])
+    min_y = min([dy for (surf, (dx, dy)), x_ch in morceaux] + [0])
+    largeur = max([x_ch + dx + surf.get_width() for (surf, (dx, dy)), x_ch in morceaux] + [x]) - min_x
+    hauteur = max([dy + surf.get_height() for (surf, (dx, dy)), x_ch in morceaux] + [police.get_height()]) - min_y
+    titre = pygame.Surface((largeur, hauteur), pygame.SRCALPHA)
+    for (surf, (dx, dy)), x_ch in morceaux:
+        titre.blit(surf, (x_ch + dx - min_x, dy - min_y))
+    return titre, (min_x, min_y), x
+
+def rendre_titre_degrade(texte: str, police: "pygame.font.Font", couleurs_degrade: tuple) -> tuple:
+    """
+    Retourne (surface, décalage, largeur du texte) du titre en dégradé, depuis le cache.
+    """
+    cle = ("titre", texte, police, tuple(tuple(c) for c in couleurs_degrade))
+    return CACHE_TEXTE_CONTOUR.obtenir(cle, lambda: _composer_titre_degrade(texte, police, couleurs_degrade))
 
 def dessiner_icone_texte(
     surface: "pygame.Surface",
@@ -70,6 +204,110 @@ def obtenir_surface_panneau(largeur: int, hauteur: int, rayon_bord: int = 24) ->
     pygame.draw.rect(panneau, (200,200,220,180), (0,0,largeur,hauteur), 2, border_radius=rayon_bord)
     return panneau, ombre
 
+def redimensionner_icone(icone: Optional["pygame.Surface"], taille: int) -> Optional["pygame.Surface"]:
+    """
+    Retourne l'icône à la taille voulue ; une icône déjà à la bonne taille est réutilisée telle quelle.
+    """
+    if icone is None or icone.get_size() == (taille, taille):
+        return icone
+    return pygame.transform.smoothscale(icone, (taille, taille))
+
+class PanneauEtat:
+    """
+    Panneau d'état en mode retenu (niveau, score, munitions, temps).
+    Les icônes sont redimensionnées une seule fois, chaque champ garde son texte rendu
+    et le panneau n'est recomposé que lorsqu'une valeur affichée change.
+    Avec une echelle inférieure à 1, il est composé en coordonnées du jeu puis réduit
+    à chaque recomposition, et dessiné à la position convertie.
+    """
+
+    def __init__(
+        self,
+        icone_oiseau: Optional["pygame.Surface"], icone_munition: Optional["pygame.Surface"], icone_timer: Optional["pygame.Surface"],
+        police_stat: "pygame.font.Font", police_niveau: "pygame.font.Font", obtenir_surface_panneau_func=obtenir_surface_panneau,
+        marge_x: int = 24, marge_y: int = 14, espace_section: int = 32, espace_icone_texte: int = 10,
+        echelle: float = 1.0
+    ) -> None:
+        self.echelle = echelle
+        self.taille_icone = police_stat.get_height()
+        self.hauteur = self.taille_icone + 2 * marge_y
+        self.polices = (police_niveau, police_stat, police_stat, police_stat)
+        self.couleurs = ((0,0,0), (30,30,30), (30,30,30), (30,30,30))
+        self.icones = [None] + [
+            redimensionner_icone(icone, self.taille_icone) for icone in (icone_oiseau, icone_munition, icone_timer)
+        ]
+        self.obtenir_surface_panneau_func = obtenir_surface_panneau_func
+        self.marge_x = marge_x
+        self.espace_section = espace_section
+        self.espace_icone_texte = espace_icone_texte
+        self.textes = [None] * 4
+        self.glyphes = [None] * 4
+        self.surface = None
+        self.ombre = None
+        self._fond = None
+        self.rect = pygame.Rect(0, 0, 0, 0)
+
+    def mettre_a_jour(self, niveau: str, score: int, objectif: int, munitions: int, temps_restant: int) -> bool:
+        """
+        Met à jour les champs et recompose le panneau si nécessaire.
+        Retourne True si le panneau a été recomposé.
+        """
+        textes = [f"Niveau : {niveau}", f"{score}/{objectif}", f"{munitions}", f"{temps_restant}s"]
+        if textes == self.textes:
+            return False
+        for i, texte in enumerate(textes):
+            if texte != self.textes[i]:
+                self.glyphes[i] = self.polices[i].render(texte, True, self.couleurs[i])
+        self.textes = textes
+        self._composer()
+        return True
+
+    def _composer(self) -> None:
+        """
+        Recompose le panneau à partir des glyphes et icônes en cache.
+        """
+        largeurs_groupes = []
+        for icone, glyphe in zip(self.icones, self.glyphes):
+            w = 0
+            if icone:
+                w += self.taille_icone + self.espace_icone_texte
+            w += glyphe.get_width()
+            largeurs_groupes.append(w)
+        largeur_panneau = sum(largeurs_groupes) + self.espace_section * (len(self.glyphes)-1) + 2 * self.marge_x
+        if self._fond is None or self._fond.get_width() != largeur_panneau:
+            self._fond, self.ombre = self.obtenir_surface_panneau_func(largeur_panneau, self.hauteur)
+            if self.echelle != 1.0:
+                self.ombre = pygame.transform.smoothscale_by(self.ombre, self.echelle)
+        self.surface = self._fond.copy()
+        dessiner_x = self.marge_x
+        centre_y = self.hauteur // 2
+        for idx, (icone, glyphe) in enumerate(zip(self.icones, self.glyphes)):
+            icone_y = centre_y - self.taille_icone // 2
+            if icone:
+                self.surface.blit(icone, (dessiner_x, icone_y))
+                dessiner_x += self.taille_icone + self.espace_icone_texte
+            texte_y = centre_y - glyphe.get_height() // 2
+            self.surface.blit(glyphe, (dessiner_x, texte_y))
+            dessiner_x += glyphe.get_width()
+            if idx < len(self.glyphes) - 1:
+                dessiner_x += self.espace_section
+        if self.echelle != 1.0:
+            self.surface = pygame.transform.smoothscale_by(self.surface, self.echelle)
+
+    def dessiner(
+        self, surface: "pygame.Surface", x: int, y: int,
+        niveau: str, score: int, objectif: int, munitions: int, temps_restant: int
+    ) -> bool:
+        """
+        Dessine le panneau sur la surface. Retourne True s'il a été recomposé ;
+        self.rect contient alors la zone couverte (ombre comprise).
+        """
+        redessine = self.mettre_a_jour(niveau, score, objectif, munitions, temps_restant)
+        e = self.echelle
+        rect_ombre = surface.blit(self.ombre, (int((x+2) * e), int((y+10) * e)))
+        self.rect = rect_ombre.union(surface.blit(self.surface, (int(x * e), int(y * e))))
+        return redessine
+
 def dessiner_panneau_etat(
     surface: "pygame.Surface",
     x: int, y: int, niveau: str, score: int, objectif: int, munitions: int, temps_restant: int,
@@ -79,44 +317,13 @@ def dessiner_panneau_etat(
 ) -> None:
     """
     Dessine le panneau d'état du jeu (score, niveau, munitions, temps).
+    Version immédiate : pour un affichage à chaque image, préférer PanneauEtat.
     """
-    taille_icone = police_stat.get_height()
-    hauteur_panneau = taille_icone + 2 * marge_y
-    groupes = []
-    texte_niveau = police_niveau.render(f"Niveau : {niveau}", True, (0,0,0))
-    groupes.append({'icone': None, 'texte_surf': texte_niveau})
-    texte_oiseau = police_stat.render(f"{score}/{objectif}", True, (30,30,30))
-    icone_oiseau = pygame.transform.smoothscale(icone_oiseau, (taille_icone, taille_icone)) if icone_oiseau else None
-    groupes.append({'icone': icone_oiseau, 'texte_surf': texte_oiseau})
-    texte_munition = police_stat.render(f"{munitions}", True, (30,30,30))
-    icone_munition = pygame.transform.smoothscale(icone_munition, (taille_icone, taille_icone)) if icone_munition else None
-    groupes.append({'icone': icone_munition, 'texte_surf': texte_munition})
-    texte_timer = police_stat.render(f"{temps_restant}s", True, (30,30,30))
-    icone_timer = pygame.transform.smoothscale(icone_timer, (taille_icone, taille_icone)) if icone_timer else None
-    groupes.append({'icone': icone_timer, 'texte_surf': texte_timer})
-    largeurs_groupes = []
-    for g in groupes:
-        w = 0
-        if g['icone']:
-            w += taille_icone + espace_icone_texte
-        w += g['texte_surf'].get_width()
-        largeurs_groupes.append(w)
-    largeur_panneau = sum(largeurs_groupes) + espace_section * (len(groupes)-1) + 2 * marge_x
-    panneau, ombre = obtenir_surface_panneau_func(largeur_panneau, hauteur_panneau)
-    surface.blit(ombre, (x+2, y+10))
-    dessiner_x = marge_x
-    centre_y = hauteur_panneau // 2
-    for idx, g in enumerate(groupes):
-        icone_y = centre_y - taille_icone // 2
-        if g['icone']:
-            panneau.blit(g['icone'], (dessiner_x, icone_y))
-            dessiner_x += taille_icone + espace_icone_texte
-        texte_y = centre_y - g['texte_surf'].get_height() // 2
-        panneau.blit(g['texte_surf'], (dessiner_x, texte_y))
-        dessiner_x += g['texte_surf'].get_width()
-        if idx < len(groupes) - 1:
-            dessiner_x += espace_section
-    surface.blit(panneau, (x, y))
+    panneau = PanneauEtat(
+        icone_oiseau, icone_munition, icone_timer, police_stat, police_niveau, obtenir_surface_panneau_func,
+        marge_x, marge_y, espace_section, espace_icone_texte
+    )
+    panneau.dessiner(surface, x, y, niveau, score, objectif, munitions, temps_restant)
 
 # ========================================
 # Fonctions de dessin des éléments du jeu
@@ -131,44 +338,189 @@ def dessiner_fond(surface: "pygame.Surface", image_fond: Optional["pygame.Surfac
     else:
         surface.fill((100, 180, 255))
 
+def dessiner_barre_progression(
+    surface: "pygame.Surface",
+    rect: "pygame.Rect",
+    fraction: float,
+    couleur: tuple = (255, 255, 255)
+) -> "pygame.Rect":
+    """
+    Dessine une barre de progression (fraction entre 0 et 1) avec bord arrondi.
+    """
+    fraction = max(0.0, min(1.0, fraction))
+    pygame.draw.rect(surface, (0, 0, 0), rect, border_radius=rect.height // 2)
+    remplie = pygame.Rect(rect.x + 3, rect.y + 3, int((rect.width - 6) * fraction), rect.height - 6)
+    if remplie.width > 0:
+        pygame.draw.rect(surface, couleur, remplie, border_radius=remplie.height // 2)
+    return pygame.Rect(rect)
+
 def dessiner_chien(surface: "pygame.Surface", x: int, y: int, phase_saut: float, image_sheltie: "pygame.Surface") -> None:
     """
     Dessine le chien (sheltie) à la position donnée.
     """
     surface.blit(image_sheltie, (x, y))
 
-def dessiner_pie(surface: "pygame.Surface", pos: tuple) -> None:
+# Palette par défaut de la pie : (noir, blanc, bleu, bec)
+COULEURS_PIE = (MAGPIE_BLACK, MAGPIE_WHITE, MAGPIE_BLUE, MAGPIE_BEAK)
+
+# Cache des sprites de pie pré-rendus, indexé par (couleurs, épaisseur du contour, miroir)
+SPRITE_PIE_CACHE = {}
+
+def _rasteriser_pie(surface: "pygame.Surface", pos: tuple, couleurs: tuple = COULEURS_PIE, epaisseur_contour: int = OUTLINE_W) -> None:
     """
-    Dessine une pie sur la surface.
+    Trace la pie primitive par primitive (13 appels de dessin).
     """
     x, y = pos
-    pygame.draw.ellipse(surface, (0,0,0), (x - 28, y - 12, 56, 24), OUTLINE_W)
-    pygame.draw.ellipse(surface, MAGPIE_BLACK, (x - 28, y - 12, 56, 24))
-    pygame.draw.ellipse(surface, MAGPIE_WHITE, (x - 10, y - 10, 30, 18))
-    pygame.draw.polygon(surface, (0,0,0), [(x - 28, y), (x - 60, y - 6), (x - 55, y + 6)], OUTLINE_W)
-    pygame.draw.polygon(surface, MAGPIE_BLUE, [(x - 28, y), (x - 60, y - 6), (x - 55, y + 6)])
-    pygame.draw.ellipse(surface, (0,0,0), (x - 10, y - 14, 32, 18), OUTLINE_W)
-    pygame.draw.ellipse(surface, MAGPIE_BLUE, (x - 10, y - 14, 32, 18))
-    pygame.draw.circle(surface, (0,0,0), (x + 22, y - 6), 13, OUTLINE_W)
-    pygame.draw.circle(surface, MAGPIE_BLACK, (x + 22, y - 6), 13)
-    pygame.draw.polygon(surface, (0,0,0), [(x + 34, y - 8), (x + 44, y - 12), (x + 36, y - 2)], OUTLINE_W)
-    pygame.draw.polygon(surface, MAGPIE_BEAK, [(x + 34, y - 8), (x + 44, y - 12), (x + 36, y - 2)])
-    pygame.draw.circle(surface, MAGPIE_WHITE, (x + 28, y - 10), 4)
-    pygame.draw.circle(surface, MAGPIE_BLACK, (x + 28, y - 10), 2)
-
-def dessiner_viseur(surface: "pygame.Surface", pos: tuple) -> None:
+    noir, blanc, bleu, bec = couleurs
+    pygame.draw.ellipse(surface, (0,0,0), (x - 28, y - 12, 56, 24), epaisseur_contour)
+    pygame.draw.ellipse(surface, noir, (x - 28, y - 12, 56, 24))
+    pygame.draw.ellipse(surface, blanc, (x - 10, y - 10, 30, 18))
+    pygame.draw.polygon(surface, (0,0,0), [(x - 28, y), (x - 60, y - 6), (x - 55, y + 6)], epaisseur_contour)
+    pygame.draw.polygon(surface, bleu, [(x - 28, y), (x - 60, y - 6), (x - 55, y + 6)])
+    pygame.draw.ellipse(surface, (0,0,0), (x - 10, y - 14, 32, 18), epaisseur_contour)
+    pygame.draw.ellipse(surface, bleu, (x - 10, y - 14, 32, 18))
+    pygame.draw.circle(surface, (0,0,0), (x + 22, y - 6), 13, epaisseur_contour)
+    pygame.draw.circle(surface, noir, (x + 22, y - 6), 13)
+    pygame.draw.polygon(surface, (0,0,0), [(x + 34, y - 8), (x + 44, y - 12), (x + 36, y - 2)], epaisseur_contour)
+    pygame.draw.polygon(surface, bec, [(x + 34, y - 8), (x + 44, y - 12), (x + 36, y - 2)])
+    pygame.draw.circle(surface, blanc, (x + 28, y - 10), 4)
+    pygame.draw.circle(surface, noir, (x + 28, y - 10), 2)
+
+def obtenir_sprite_pie(couleurs: tuple = COULEURS_PIE, epaisseur_contour: int = OUTLINE_W, miroir: bool = False) -> tuple:
+    """
+    Retourne (sprite, ancre) : la pie pré-rendue sur une surface SRCALPHA et
+    la position de son centre dans le sprite. Le rendu n'est fait qu'une fois par clé.
+    """
+    cle = (tuple(couleurs), epaisseur_contour, miroir)
+    if cle in SPRITE_PIE_CACHE:
+        return SPRITE_PIE_CACHE[cle]
+    if miroir:
+        sprite, (ancre_x, ancre_y) = obtenir_sprite_pie(couleurs, epaisseur_contour, False)
+        entree = (pygame.transform.flip(sprite, True, False), (sprite.get_width() - 1 - ancre_x, ancre_y))
+    else:
+        # Boîte englobante du dessin : x de -61 à +45, y de -19 à +11 autour du centre
+        ancre_x, ancre_y = 60 + epaisseur_contour, 19 + epaisseur_contour
+        largeur = ancre_x + 45 + epaisseur_contour + 1
+        hauteur = ancre_y + 11 + epaisseur_contour + 1
+        sprite = pygame.Surface((largeur, hauteur), pygame.SRCALPHA)
+        _rasteriser_pie(sprite, (ancre_x, ancre_y), couleurs, epaisseur_contour)
+        entree = (sprite, (ancre_x, ancre_y))
+    SPRITE_PIE_CACHE[cle] = entree
+    return entree
+
+def dessiner_pie(
+    surface: "pygame.Surface",
+    pos: tuple,
+    vers_gauche: bool = False,
+    couleurs: tuple = COULEURS_PIE,
+    epaisseur_contour: int = OUTLINE_W
+) -> "pygame.Rect":
+    """
+    Dessine une pie sur la surface à partir du sprite en cache.
+    Si vers_gauche est vrai, la pie est retournée pour regarder vers la gauche.
+    """
+    sprite, (ancre_x, ancre_y) = obtenir_sprite_pie(couleurs, epaisseur_contour, vers_gauche)
+    return surface.blit(sprite, (pos[0] - ancre_x, pos[1] - ancre_y))
+
+def _rasteriser_particule(sorte: int, police: "pygame.font.Font") -> tuple:
+    """
+    Dessine le sprite opaque d'une sorte de particule ; retourne (sprite, ancre).
+    """
+    if sorte == KIND_POPUP:
+        sprite, _ = rendre_texte_avec_contour("+1", police, (255, 215, 0), (0, 0, 0), (0, 0, 0), 2, 2)
+        return sprite, (sprite.get_width() // 2, sprite.get_height() // 2)
+    if sorte == KIND_FLASH:
+        sprite = pygame.Surface((12, 12), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, (255, 170, 40, 160), (6, 6), 6)
+        pygame.draw.circle(sprite, (255, 250, 200), (6, 6), 3)
+        return sprite, (6, 6)
+    couleur = {KIND_FEATHER_BLACK: MAGPIE_BLACK, KIND_FEATHER_WHITE: MAGPIE_WHITE, KIND_FEATHER_BLUE: MAGPIE_BLUE}[sorte]
+    sprite = pygame.Surface((11, 6), pygame.SRCALPHA)
+    pygame.draw.ellipse(sprite, MAGPIE_BEAK, sprite.get_rect())
+    pygame.draw.ellipse(sprite, couleur, sprite.get_rect().inflate(-2, -2))
+    return sprite, (5, 3)
+
+def rendre_sprites_particules(police: "pygame.font.Font") -> dict:
+    """
+    Retourne {code: (sprite, ancre)} : chaque sorte de particule à chacun de ses niveaux d'estompage,
+    pré-rendue une seule fois (l'alpha des pixels est multiplié, pas celui de la surface).
+    """
+    sprites = {}
+    for sorte in range(KIND_COUNT):
+        sprite, ancre = _rasteriser_particule(sorte, police)
+        for niveau in range(FADE_LEVELS):
+            estompe = sprite.copy()
+            opacite = round(255 * (FADE_LEVELS - niveau) / FADE_LEVELS)
+            estompe.fill((255, 255, 255, opacite), special_flags=pygame.BLEND_RGBA_MULT)
+            sprites[sprite_code(sorte, niveau)] = (estompe, ancre)
+    return sprites
+
+# Viseur pré-rendu, créé au premier usage
+_surface_viseur = None
+
+def obtenir_surface_viseur() -> "pygame.Surface":
+    """
+    Retourne la surface du viseur (croix rouge), rendue une seule fois.
+    """
+    global _surface_viseur
+    if _surface_viseur is None:
+        viseur = pygame.Surface((44, 44), pygame.SRCALPHA)
+        centre = 22
+        rouge = (255, 0, 0, 140)
+        pygame.draw.circle(viseur, rouge, (centre, centre), 20, 5)
+        pygame.draw.line(viseur, rouge, (centre - 22, centre), (centre + 22, centre), 5)
+        pygame.draw.line(viseur, rouge, (centre, centre - 22), (centre, centre + 22), 5)
+        pygame.draw.circle(viseur, rouge, (centre, centre), 5, 2)
+        _surface_viseur = viseur
+    return _surface_viseur
+
+def dessiner_viseur(surface: "pygame.Surface", pos: tuple) -> "pygame.Rect":
     """
     Dessine le viseur (croix rouge) à la position donnée.
     """
     x, y = pos
-    viseur = pygame.Surface((44, 44), pygame.SRCALPHA)
-    centre = 22
-    rouge = (255, 0, 0, 140)
-    pygame.draw.circle(viseur, rouge, (centre, centre), 20, 5)
-    pygame.draw.line(viseur, rouge, (centre - 22, centre), (centre + 22, centre), 5)
-    pygame.draw.line(viseur, rouge, (centre, centre - 22), (centre, centre + 22), 5)
-    pygame.draw.circle(viseur, rouge, (centre, centre), 5, 2)
-    surface.blit(viseur, (x - centre, y - centre))
+    return surface.blit(obtenir_surface_viseur(), (x - 22, y - 22))
+
+def installer_curseur_viseur() -> bool:
+    """
+    Installe le viseur comme curseur couleur du système (SDL).
+    Le curseur suit alors la souris indépendamment de la fréquence d'images.
+    Retourne False si la plateforme ne gère pas les curseurs couleur.
+    """
+    try:
+        pygame.mouse.set_cursor(pygame.cursors.Cursor((22, 22), obtenir_surface_viseur()))
+    except pygame.error:
+        return False
+    return True
+
+def retablir_curseur_systeme() -> None:
+    """
+    Rétablit la flèche standard du système.
+    """
+    try:
+        pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_ARROW)
+    except pygame.error:
+        pass
+
+def rendre_bouton(
+    taille: tuple,
+    texte: str,
+    police: "pygame.font.Font",
+    couleur: tuple,
+    survol: bool = False
+) -> "pygame.Surface":
+    """
+    Rend un bouton avec texte et effet de survol sur une nouvelle surface.
+    """
+    largeur, hauteur = taille
+    bouton = pygame.Surface((largeur, hauteur), pygame.SRCALPHA)
+    pygame.draw.rect(bouton, (*couleur, 170), (0,0,largeur,hauteur), border_radius=22)
+    pygame.draw.rect(bouton, (200,200,220,120), (0,0,largeur,hauteur), 3, border_radius=22)
+    if survol:
+        pygame.draw.rect(bouton, (255,255,255,180), (0,0,largeur,hauteur), 4, border_radius=22)
+    etiquette = police.render(texte, True, (255,255,255))
+    bouton.blit(etiquette, ((largeur-etiquette.get_width())//2, (hauteur-etiquette.get_height())//2))
+    return bouton
 
 def dessiner_bouton(
     surface: "pygame.Surface",
@@ -177,15 +529,35 @@ def dessiner_bouton(
     police: "pygame.font.Font",
     couleur: tuple,
     survol: bool = False
-) -> None:
+) -> "pygame.Rect":
     """
     Dessine un bouton avec texte et effet de survol.
     """
-    bouton = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-    pygame.draw.rect(bouton, (*couleur, 170), (0,0,rect.width,rect.height), border_radius=22)
-    pygame.draw.rect(bouton, (200,200,220,120), (0,0,rect.width,rect.height), 3, border_radius=22)
-    if survol:
-        pygame.draw.rect(bouton, (255,255,255,180), (0,0,rect.width,rect.height), 4, border_radius=22)
-    etiquette = police.render(texte, True, (255,255,255))
-    bouton.blit(etiquette, ((rect.width-etiquette.get_width())//2, (rect.height-etiquette.get_height())//2))
-    surface.blit(bouton, (rect.x, rect.y))
+    return surface.blit(rendre_bouton((rect.width, rect.height), texte, police, couleur, survol), (rect.x, rect.y))
+
+class BoutonPrerendu:
+    """
+    Bouton dont les états normal et survolé sont rendus une seule fois.
+    rect reste en coordonnées du jeu (test du survol et des clics) ; avec une echelle inférieure à 1,
+    les états sont réduits une fois et dessinés à la position convertie.
+    """
+
+    def __init__(
+        self, rect: "pygame.Rect", texte: str, police: "pygame.font.Font", couleur: tuple, echelle: float = 1.0
+    ) -> None:
+        self.rect = pygame.Rect(rect)
+        self.texte = texte
+        self.position = (int(self.rect.x * echelle), int(self.rect.y * echelle))
+        self.etats = tuple(
+            rendre_bouton(self.rect.size, texte, police, couleur, survol) for survol in (False, True)
+        )
+        if echelle != 1.0:
+            self.etats = tuple(pygame.transform.smoothscale_by(etat, echelle) for etat in self.etats)
+        if pygame.display.get_surface() is not None:
+            self.etats = tuple(etat.convert_alpha() for etat in self.etats)
+
+    def dessiner(self, surface: "pygame.Surface", survol: bool = False) -> "pygame.Rect":
+        """
+        Dessine l'état pré-rendu du bouton.
+        """
+        return surface.blit(self.etats[1 if survol else 0], self.position)
@@ -2,8 +2,6 @@
 # Fonctions utilitaires pour Chasse Express
 # ==========================================
 
-from resources import load_font, load_icon
-
 # ========================================
 # Fonctions utilitaires mathématiques
 # ========================================
@@ -42,6 +40,43 @@ def verifie_defaite(ammo, time_left):
 # Fonctions de gestion du temps et de progression
 # ================================================
 
+class PasDeTempsFixe:
+    """
+    Accumulateur de temps pour une simulation à pas fixe.
+    avancer(dt) ajoute le temps réel écoulé et retourne le nombre de pas de simulation à exécuter ;
+    alpha donne la fraction du pas suivant déjà écoulée, pour interpoler le rendu.
+    """
+
+    def __init__(self, pas, max_pas=5):
+        self.pas = pas
+        self.max_pas = max_pas
+        self.accumulateur = 0.0
+
+    def reinitialiser(self):
+        """Vide l'accumulateur."""
+        self.accumulateur = 0.0
+
+    def avancer(self, dt):
+        """Ajoute dt secondes et retourne le nombre de pas à simuler (au plus max_pas)."""
+        self.accumulateur += dt
+        nombre = int(self.accumulateur // self.pas)
+        if nombre > self.max_pas:
+            # Trop de retard : on abandonne l'excédent plutôt que de ne plus jamais rattraper
+            nombre = self.max_pas
+            self.accumulateur = 0.0
+        else:
+            self.accumulateur -= nombre * self.pas
+        return nombre
+
+    @property
+    def alpha(self):
+        """Fraction (entre 0 et 1) du pas en cours déjà écoulée."""
+        return min(1.0, self.accumulateur / self.pas)
+
+def secondes_simulees(ticks, sim_hz):
+    """Retourne le nombre de secondes entières correspondant à un nombre de pas de simulation."""
+    return ticks // sim_hz
+
 def temps_ecoule(timer_start):
     """Retourne le temps écoulé en secondes depuis le début du round."""
     import pygame